@@ -1,4 +1,7 @@
 from .simulator.quantestpy_circuit import QuantestPyCircuit
 from .simulator.state_vector_circuit import StateVectorCircuit
 from .simulator.pauli_circuit import PauliCircuit
+from .simulator.stabilizer_circuit import StabilizerCircuit
+from .simulator.mps_circuit import MPSCircuit
+from .simulator.decision_diagram_circuit import DecisionDiagramCircuit
 from .assertion.get_ctrl_val import assert_get_ctrl_val
@@ -1,6 +1,7 @@
 import itertools
-import re
-import traceback
+import os
+import shutil
+import tempfile
 import unittest
 from typing import Union
 
@@ -9,88 +10,1017 @@ import numpy as np
 from quantestpy import QuantestPyCircuit, operator
 from quantestpy.converter.all import cvt_all_circuit_to_quantestpy_circuit
 from quantestpy.exceptions import QuantestPyAssertionError, QuantestPyError
-from quantestpy.simulator.state_vector_circuit import \
-    cvt_quantestpy_circuit_to_state_vector_circuit
+from quantestpy.simulator.decision_diagram_circuit import (
+    DecisionDiagram, DecisionDiagramCircuit,
+    cvt_quantestpy_circuit_to_decision_diagram_circuit)
+from quantestpy.simulator.mps_circuit import (
+    MPSCircuit, cvt_quantestpy_circuit_to_mps_circuit)
+from quantestpy.simulator.stabilizer_circuit import (StabilizerCircuit,
+                                                     is_clifford_circuit)
+from quantestpy.simulator.state_vector_circuit import (
+    StateVectorCircuitPlan, StateVectorSnapshots,
+    cvt_quantestpy_circuit_to_state_vector_circuit)
 
 ut_test_case = unittest.TestCase()
 
+# maximum number of elements of a batch of state vectors evolved at once
+_MAX_BATCH_ELEMENTS = 2**22
 
-def assert_equal_to_operator(
-        circuit: Union[QuantestPyCircuit, str],
-        operator_: Union[np.ndarray, np.matrix],
+# default absolute tolerances for the precisions of the simulation
+_DEFAULT_ATOL = {"complex64": 1e-5, "complex128": 1e-8}
+
+# methods of assert_equal and assert_equal_to_operator, where None selects
+# the stabilizer engine for Clifford circuits and the state vector engine
+# otherwise
+_EQUALITY_METHODS = ["state_vector", "decision_diagram", "miter",
+                     "random_states"]
+
+# assertions whose cost can be estimated by estimate_cost
+_ASSERTIONS = ["assert_equal_to_operator", "assert_is_zero",
+               "assert_ancilla_is_zero", "assert_equal"]
+
+
+def _assert_is_valid_precision(precision: Union[str, None]) -> None:
+    if precision is not None and precision not in _DEFAULT_ATOL:
+        raise QuantestPyError(
+            f"precision must be one of {list(_DEFAULT_ATOL)}."
+        )
+
+
+def _cvt_all_circuit_to_state_vector_circuit_plan(
+        circuit,
         from_right_to_left_for_qubit_ids: bool = False,
-        rtol: float = 0.,
-        atol: float = 1e-8,
-        up_to_global_phase: bool = False,
-        matrix_norm_type: Union[str, None] = None,
-        msg=None) -> None:
+        precision: Union[str, None] = None,
+        memmap_dir: Union[str, None] = None,
+        memmap_chunk_size: Union[int, None] = None) \
+        -> StateVectorCircuitPlan:
+    """Returns the compiled plan of the circuit. A plan given by
+    StateVectorCircuit.compile() is returned as it is, so that the
+    conversion and compilation are done only once for a circuit which is
+    tested by many assert methods. Other circuits are compiled in the
+    precision, which is "complex128" if None, and with the state in
+    memory-mapped files in memmap_dir, in chunks of memmap_chunk_size
+    elements, if given.
+    """
+    _assert_is_valid_precision(precision)
+
+    if isinstance(circuit, StateVectorCircuitPlan):
+        if circuit.from_right_to_left_for_qubit_ids != \
+                from_right_to_left_for_qubit_ids:
+            raise QuantestPyError(
+                "from_right_to_left_for_qubit_ids does not match the order "
+                "of qubit ids of the compiled circuit."
+            )
+        if precision is not None and circuit.precision != precision:
+            raise QuantestPyError(
+                "precision does not match the precision of the compiled "
+                "circuit."
+            )
+        if memmap_dir is not None and circuit.memmap_dir != memmap_dir:
+            raise QuantestPyError(
+                "memmap_dir does not match the directory of the compiled "
+                "circuit."
+            )
+        return circuit
 
     quantestpy_circuit = cvt_all_circuit_to_quantestpy_circuit(circuit)
     state_vector_circuit = cvt_quantestpy_circuit_to_state_vector_circuit(
         quantestpy_circuit
     )
-
     state_vector_circuit._from_right_to_left_for_qubit_ids = \
         from_right_to_left_for_qubit_ids
+    if precision is not None:
+        state_vector_circuit._precision = precision
+    state_vector_circuit._memmap_dir = memmap_dir
+    if memmap_chunk_size is not None:
+        state_vector_circuit._memmap_chunk_size = memmap_chunk_size
 
-    operator_from_test_circuit = state_vector_circuit._get_whole_gates()
+    return state_vector_circuit.compile()
 
-    operator.assert_equal(
-        operator_from_test_circuit,
-        operator_,
-        rtol,
-        atol,
-        up_to_global_phase,
-        matrix_norm_type,
-        msg
-    )
 
+def _cvt_all_circuit_to_stabilizer_circuit(
+        circuit,
+        ancilla_qubits: Union[list, None] = None) \
+        -> Union[StabilizerCircuit, None]:
+    """Returns the circuit as a StabilizerCircuit if it consists only of
+    Clifford gates, or None otherwise, including for a compiled plan. If
+    ancilla_qubits is given, each of the other qubits is first maximally
+    entangled with a reference qubit appended after the qubits of the
+    circuit, so that the gates act on all the computational basis states of
+    the system qubits at once.
+    """
+    if isinstance(circuit, StateVectorCircuitPlan):
+        return None
 
-def assert_is_zero(circuit: Union[QuantestPyCircuit, str],
-                   qubits: list = None,
-                   atol: float = 1e-8,
-                   msg=None) -> None:
+    quantestpy_circuit = cvt_all_circuit_to_quantestpy_circuit(circuit)
+    if not is_clifford_circuit(quantestpy_circuit):
+        return None
 
-    if not isinstance(qubits, list) and qubits is not None:
+    num_qubit = quantestpy_circuit.num_qubit
+    system_qubits = []
+    if ancilla_qubits is not None:
+        system_qubits = [qubit for qubit in range(num_qubit)
+                         if qubit not in ancilla_qubits]
+
+    stabilizer_circuit = StabilizerCircuit(num_qubit + len(system_qubits))
+    for reference_qubit, system_qubit in enumerate(system_qubits, num_qubit):
+        stabilizer_circuit.add_gate(
+            {"name": "h", "target_qubit": [reference_qubit],
+             "control_qubit": [], "control_value": [], "parameter": []})
+        stabilizer_circuit.add_gate(
+            {"name": "x", "target_qubit": [system_qubit],
+             "control_qubit": [reference_qubit], "control_value": [1],
+             "parameter": []})
+    for gate in quantestpy_circuit.gates:
+        stabilizer_circuit.add_gate(gate)
+
+    return stabilizer_circuit
+
+
+def _get_stabilizer_circuits(
+        assertion: str,
+        circuit,
+        circuit_b=None,
+        ancilla_qubits: Union[list, None] = None,
+        initial_state_vector: Union[np.ndarray, None] = None,
+        up_to_global_phase: bool = False,
+        matrix_norm_type: Union[str, None] = None,
+        block_size: Union[int, None] = None,
+        atol: Union[float, None] = None,
+        memmap_dir: Union[str, None] = None) -> Union[list, None]:
+    """Returns the circuits of the assertion as StabilizerCircuits if the
+    stabilizer engine is selected, or None otherwise. It is selected if the
+    circuits consist only of Clifford gates, the assertion depends neither
+    on the global phase nor on an initial state vector, and none of the
+    tolerance and the options of the other engines is given.
+    """
+    if any(option is not None
+           for option in [matrix_norm_type, block_size, atol, memmap_dir]):
+        return None
+
+    if assertion == "assert_is_zero" and initial_state_vector is None:
+        stabilizer_circuits = [_cvt_all_circuit_to_stabilizer_circuit(circuit)]
+
+    elif assertion == "assert_ancilla_is_zero":
+        stabilizer_circuits = [_cvt_all_circuit_to_stabilizer_circuit(
+            circuit, ancilla_qubits)]
+
+    elif assertion == "assert_equal" and up_to_global_phase:
+        stabilizer_circuits = [
+            _cvt_all_circuit_to_stabilizer_circuit(circuit),
+            _cvt_all_circuit_to_stabilizer_circuit(circuit_b)]
+
+    else:
+        return None
+
+    if any(stabilizer_circuit is None
+           for stabilizer_circuit in stabilizer_circuits):
+        return None
+
+    # circuits of different sizes are reported by the state vector engine
+    if len(set(stabilizer_circuit.num_qubit
+               for stabilizer_circuit in stabilizer_circuits)) > 1:
+        return None
+
+    return stabilizer_circuits
+
+
+def _get_non_zero_qubits_of_stabilizer_circuit(
+        stabilizer_circuit: StabilizerCircuit,
+        qubits: list,
+        num_qubit: int) -> list:
+    """Returns the qubits which are either non-zero or entangled with
+    other qubits after the gates of the stabilizer circuit, whose first
+    num_qubit qubits are those of the circuit under test.
+    """
+    for qubit in qubits:
+        if qubit > num_qubit-1:
+            raise QuantestPyError(
+                f"qubit {qubit} is out of range for the given circuit."
+            )
+
+    stabilizer_circuit._execute_all_gates()
+
+    return [qubit for qubit in qubits
+            if stabilizer_circuit._get_z_value(qubit) != 0]
+
+
+def _cvt_all_circuit_to_mps_circuit(
+        circuit,
+        max_bond_dimension: int,
+        precision: Union[str, None] = None) -> MPSCircuit:
+    """Returns the circuit as an MPSCircuit whose bond dimension is at most
+    max_bond_dimension, simulated in the precision, which is "complex128"
+    if None.
+    """
+    if isinstance(circuit, StateVectorCircuitPlan):
         raise QuantestPyError(
-            "qubits must be a list of integer(s) as qubit's ID(s)."
+            "max_bond_dimension cannot be used for a StateVectorCircuitPlan."
         )
 
+    if not isinstance(max_bond_dimension, int) or max_bond_dimension < 1:
+        raise QuantestPyError(
+            "max_bond_dimension must be a positive integer."
+        )
+
+    _assert_is_valid_precision(precision)
+
     quantestpy_circuit = cvt_all_circuit_to_quantestpy_circuit(circuit)
-    state_vector_circuit = cvt_quantestpy_circuit_to_state_vector_circuit(
-        quantestpy_circuit
+    mps_circuit = cvt_quantestpy_circuit_to_mps_circuit(quantestpy_circuit)
+    mps_circuit.max_bond_dimension = max_bond_dimension
+    if precision is not None:
+        mps_circuit.precision = precision
+
+    return mps_circuit
+
+
+def _get_non_zero_qubits_of_mps_circuit(
+        mps_circuit: MPSCircuit,
+        qubits: list,
+        atol: float) -> list:
+    """Returns the qubits which are either non-zero or entangled with
+    other qubits after the gates of the MPS circuit, i.e. whose components
+    where they are 1 have the norm larger than atol, or the probability
+    larger than atol**2. Unlike the other engines, which compare each
+    amplitude with atol, the tolerance is on the norm of all of them.
+    Raises QuantestPyError if the squared norm of the parts of the state
+    discarded by the truncations is larger than atol**2, for which the
+    assertion is not reliable.
+    """
+    for qubit in qubits:
+        if qubit > mps_circuit.num_qubit-1:
+            raise QuantestPyError(
+                f"qubit {qubit} is out of range for the given circuit."
+            )
+
+    mps_circuit._execute_all_gates()
+
+    if mps_circuit.truncation_error > atol**2:
+        raise QuantestPyError(
+            "truncation error of the matrix product state "
+            f"{mps_circuit.truncation_error} exceeds atol**2 = {atol**2}. "
+            "max_bond_dimension or atol should be increased."
+        )
+
+    return [qubit for qubit in qubits
+            if mps_circuit.get_probability_of_one(qubit) > atol**2]
+
+
+def _assert_is_valid_method(method: Union[str, None]) -> None:
+    if method is not None and method not in _EQUALITY_METHODS:
+        raise QuantestPyError(
+            f"method must be one of {_EQUALITY_METHODS} or None."
+        )
+
+
+def _cvt_all_circuit_to_decision_diagram_circuit(
+        circuit,
+        from_right_to_left_for_qubit_ids: bool = False) \
+        -> DecisionDiagramCircuit:
+    if isinstance(circuit, StateVectorCircuitPlan):
+        raise QuantestPyError(
+            "method 'decision_diagram' cannot be used for a "
+            "StateVectorCircuitPlan."
+        )
+
+    quantestpy_circuit = cvt_all_circuit_to_quantestpy_circuit(circuit)
+    decision_diagram_circuit = \
+        cvt_quantestpy_circuit_to_decision_diagram_circuit(quantestpy_circuit)
+    decision_diagram_circuit._from_right_to_left_for_qubit_ids = \
+        from_right_to_left_for_qubit_ids
+
+    return decision_diagram_circuit
+
+
+def _assert_decision_diagrams_are_equal(
+        dd: DecisionDiagram,
+        edge_a: tuple,
+        edge_b: tuple,
+        rtol: float,
+        atol: float,
+        up_to_global_phase: bool,
+        matrix_norm_type: Union[str, None],
+        msg) -> None:
+    """Raises QuantestPyAssertionError if the max norm of the difference of
+    the operators in the decision diagram, max(abs(A-B)), is not smaller
+    than atol + rtol*max(abs(B)). The global phases are removed as in
+    operator.assert_equal, at the element of A with the largest absolute
+    value.
+    """
+    if matrix_norm_type not in [None, "max_norm"]:
+        raise QuantestPyError(
+            "matrix_norm_type must be None or 'max_norm' for method "
+            "'decision_diagram'."
+        )
+
+    if up_to_global_phase and dd.get_max_abs(edge_a) > 0:
+        row, column = dd.get_argmax_abs(edge_a)
+        element_a = dd.get_element(edge_a, row, column)
+        element_b = dd.get_element(edge_b, row, column)
+        if element_b != 0:
+            edge_b = (edge_b[0] * (element_a / abs(element_a))
+                      / (element_b / abs(element_b)), edge_b[1])
+
+    difference = dd.add(edge_a, (-edge_b[0], edge_b[1]))
+    max_norm_b = dd.get_max_abs(edge_b) if rtol != 0. else 0.
+
+    operator._assert_matrix_norm_is_small(
+        dd.get_max_abs(difference), max_norm_b, rtol, atol, msg)
+
+
+def _assert_equal_on_random_states(
+        plan_a: StateVectorCircuitPlan,
+        plan_b: StateVectorCircuitPlan,
+        rtol: float,
+        atol: float,
+        up_to_global_phase: bool,
+        matrix_norm_type: Union[str, None],
+        msg,
+        num_states: int,
+        seed: Union[int, None],
+        block_size: Union[int, None]) -> None:
+    """Raises QuantestPyAssertionError if the outputs of the plans for
+    num_states random states, whose amplitudes are independent standard
+    complex normal variables, are not equal element-wise, block_size states
+    at once. With up_to_global_phase, the global phase is removed for each
+    block.
+    """
+    if matrix_norm_type not in [None, "max_norm"]:
+        raise QuantestPyError(
+            "matrix_norm_type must be None or 'max_norm' for method "
+            "'random_states'."
+        )
+
+    if plan_a.num_qubit != plan_b.num_qubit:
+        raise QuantestPyError(
+            "The shapes of the operators must be the same."
+        )
+
+    dim = 2**plan_a.num_qubit
+    if block_size is None:
+        block_size = num_states
+
+    # the states are drawn one after another, so that they do not depend
+    # on block_size
+    rng = np.random.default_rng(seed)
+    for start in range(0, num_states, block_size):
+        num_column = min(block_size, num_states - start)
+        states = (rng.standard_normal((num_column, dim))
+                  + 1j * rng.standard_normal((num_column, dim))).T
+        states /= np.sqrt(2.)
+
+        operator.assert_equal(
+            plan_a.get_state_vector(states),
+            plan_b.get_state_vector(states),
+            rtol,
+            atol,
+            up_to_global_phase,
+            matrix_norm_type,
+            msg
+        )
+
+
+def _get_default_block_size(plan: StateVectorCircuitPlan) -> int:
+    """Returns the number of columns evolved at once, such that they have
+    at most _MAX_BATCH_ELEMENTS elements.
+    """
+    return max(1, _MAX_BATCH_ELEMENTS
+               // (2**plan.num_qubit * (plan.sweep_size or 1)))
+
+
+def _get_num_comparison_block(up_to_global_phase: bool) -> float:
+    """Returns the number of blocks of the temporaries which
+    operator.assert_equal holds at most while comparing two blocks of
+    columns: those of numpy.testing.assert_allclose or of the matrix norm
+    of the difference, and the copies of both blocks without the global
+    phases.
+    """
+    return 4.5 + (2. if up_to_global_phase else 0.)
+
+
+def _get_state_peak_bytes(
+        plan: StateVectorCircuitPlan,
+        num_state: int) -> int:
+    """Returns the estimated peak memory in bytes of evolving num_state
+    state vectors by the plan and finding the non-zero qubits, which holds
+    the absolute values of a chunk of the state besides the state.
+    """
+    num_element = 2**plan.num_qubit * num_state * (plan.sweep_size or 1)
+    itemsize = np.dtype(plan.dtype).itemsize
+    if plan.memmap_dir is None:
+        state_bytes = num_element * itemsize
+    else:
+        num_element = min(num_element, plan._memmap_chunk_size)
+        state_bytes = 0
+
+    return max(plan.estimate_cost(num_state)["peak_bytes"],
+               state_bytes + num_element * itemsize // 2 + plan.nbytes)
+
+
+def _estimate_cost(
+        plans: list,
+        assertion: str,
+        block_size: Union[int, None] = None,
+        num_state: int = 1,
+        num_ancilla_qubit: int = 0,
+        num_random_state: Union[int, None] = None,
+        up_to_global_phase: bool = False) -> dict:
+    """Returns the engine, the estimated peak memory in bytes, the bytes of
+    the memory-mapped files on disk and the approximate flops of the
+    assertion for the plans. block_size is the
+    number of columns of the operators computed at once, where None means
+    the whole operators, or the number of basis states evolved at once for
+    assert_ancilla_is_zero. num_state is the number of initial state
+    vectors for assert_is_zero. If num_random_state is given, assert_equal
+    compares the plans on that many random states, block_size of them at
+    once. up_to_global_phase adds the copies made to remove the global
+    phases in the comparison.
+    """
+    plan = plans[0]
+    dim = 2**plan.num_qubit
+    itemsize = max(np.dtype(plan.dtype).itemsize for plan in plans)
+    num_comparison_block = _get_num_comparison_block(up_to_global_phase)
+
+    if assertion == "assert_is_zero":
+        cost = {"peak_bytes": _get_state_peak_bytes(plan, num_state),
+                "flops": plan.estimate_cost(num_state)["flops"]}
+        if plan.memmap_dir is None:
+            return {"engine": "state_vector", "disk_bytes": 0, **cost}
+
+        disk_bytes = dim * num_state * (plan.sweep_size or 1) * itemsize
+        return {"engine": "memmap", "disk_bytes": disk_bytes, **cost}
+
+    if assertion == "assert_ancilla_is_zero":
+        # the basis states where the system qubits take all the values
+        num_column = 2**(plan.num_qubit - num_ancilla_qubit)
+        if block_size is None:
+            block_size = _get_default_block_size(plan)
+        block_size = min(block_size, num_column)
+
+        # the batch of initial state vectors and the state tensor
+        return {
+            "engine": "state_vector",
+            "peak_bytes": dim * block_size * itemsize
+            + _get_state_peak_bytes(plan, block_size),
+            "disk_bytes": 0,
+            "flops": plan.estimate_cost(num_column)["flops"]}
+
+    if num_random_state is not None:
+        num_column = num_random_state if block_size is None \
+            else min(block_size, num_random_state)
+        sweep_size = max(plan.sweep_size or 1 for plan in plans)
+        block_bytes = dim * num_column * sweep_size * itemsize
+
+        # the random states and the outputs of one plan are held while the
+        # other is computed, and the comparison holds both outputs besides
+        # the random states
+        peak_bytes = max(
+            max(plan.estimate_cost(num_column)["peak_bytes"]
+                for plan in plans) + 2 * block_bytes,
+            int((3 + num_comparison_block) * block_bytes)
+            + sum(plan.nbytes for plan in plans))
+        flops = sum(plan.estimate_cost(num_random_state)["flops"]
+                    for plan in plans) \
+            + 8 * dim * num_random_state * sweep_size
+
+        return {"engine": "random_states", "peak_bytes": peak_bytes,
+                "disk_bytes": 0, "flops": flops}
+
+    engine = "state_vector" if block_size is None else "block_wise"
+    num_column = dim if block_size is None else min(block_size, dim)
+    sweep_size = max(plan.sweep_size or 1 for plan in plans)
+    block_bytes = dim * num_column * sweep_size * itemsize
+
+    # the operators of the other plans are held while one is computed,
+    # and the comparison holds the operators of the plans
+    num_held_block = len(plans) - 1 if block_size is None else 0
+    peak_bytes = max(
+        max(plan.estimate_cost(num_column)["peak_bytes"] for plan in plans)
+        + num_held_block * block_bytes,
+        int((len(plans) + num_comparison_block) * block_bytes)
+        + sum(plan.nbytes for plan in plans))
+    flops = sum(plan.estimate_cost(dim)["flops"] for plan in plans) \
+        + 8 * dim * dim * sweep_size
+
+    # the operators of the plans are written to files block by block
+    disk_bytes = 0
+    if block_size is not None:
+        disk_bytes = len(plans) * dim * dim * sweep_size * itemsize
+
+    return {"engine": engine, "peak_bytes": peak_bytes,
+            "disk_bytes": disk_bytes, "flops": flops}
+
+
+def _estimate_stabilizer_cost(
+        stabilizer_circuits: list,
+        num_measured_qubit: int = 0) -> dict:
+    """Returns the cost of the assertion with the stabilizer engine for the
+    stabilizer circuits, where num_measured_qubit qubits are measured.
+    """
+    costs = [stabilizer_circuit.estimate_cost(num_measured_qubit)
+             for stabilizer_circuit in stabilizer_circuits]
+
+    return {"engine": "stabilizer",
+            "peak_bytes": sum(cost["peak_bytes"] for cost in costs),
+            "disk_bytes": 0,
+            "flops": sum(cost["flops"] for cost in costs)}
+
+
+def _raise_max_memory_error(
+        assertion: str,
+        cost: dict,
+        max_memory: int) -> None:
+    raise QuantestPyError(
+        f"estimated peak memory of {cost['peak_bytes']} bytes for "
+        f"{assertion} exceeds max_memory of {max_memory} bytes, and no "
+        "cheaper engine fits within it."
     )
 
-    state_vec = state_vector_circuit._get_state_vector()
-    num_qubit = state_vector_circuit.num_qubit
-    if qubits is None:
-        qubits = [i for i in range(num_qubit)]
 
-    def _assert_is_zero_for_one_qubit(qubit: int) -> bool:
+def _check_disk_space(
+        assertion: str,
+        cost: dict,
+        directory: Union[str, None] = None) -> None:
+    """Raises QuantestPyError if the memory-mapped files of the fallback
+    engine do not fit in the free space of the directory, which is the
+    temporary directory if None.
+    """
+    if directory is None:
+        directory = tempfile.gettempdir()
+
+    free_bytes = shutil.disk_usage(directory).free
+    if cost["disk_bytes"] > free_bytes:
+        raise QuantestPyError(
+            f"estimated {cost['disk_bytes']} bytes on disk for {assertion} "
+            f"with the {cost['engine']} engine exceed the free space of "
+            f"{free_bytes} bytes in {directory}."
+        )
+
+
+def _get_block_size_within_max_memory(
+        plans: list,
+        assertion: str,
+        max_memory: Union[int, None],
+        block_size: Union[int, None] = None,
+        num_ancilla_qubit: int = 0,
+        num_random_state: Union[int, None] = None,
+        up_to_global_phase: bool = False) -> Union[int, None]:
+    """Returns the block size with which the estimated peak memory of the
+    assertion is within max_memory: block_size itself if it fits, or
+    otherwise the largest power of 2 below it which fits, i.e. the whole
+    operators fall back to the block-wise engine, or fewer random states
+    are evolved at once.
+    """
+    if max_memory is None:
+        return block_size
+
+    if not isinstance(max_memory, int) or max_memory <= 0:
+        raise QuantestPyError(
+            "max_memory must be a positive integer in bytes."
+        )
+
+    cost = _estimate_cost(
+        plans, assertion, block_size, num_ancilla_qubit=num_ancilla_qubit,
+        num_random_state=num_random_state,
+        up_to_global_phase=up_to_global_phase)
+    if cost["peak_bytes"] <= max_memory:
+        return block_size
+
+    if block_size is None:
+        block_size = 2**plans[0].num_qubit
+        if assertion == "assert_ancilla_is_zero":
+            block_size = _get_default_block_size(plans[0])
+        elif num_random_state is not None:
+            block_size = num_random_state
+
+    candidate = 2**((block_size - 1).bit_length() - 1)
+    while candidate >= 1:
+        candidate_cost = _estimate_cost(
+            plans, assertion, candidate, num_ancilla_qubit=num_ancilla_qubit,
+            num_random_state=num_random_state,
+            up_to_global_phase=up_to_global_phase)
+        if candidate_cost["peak_bytes"] <= max_memory:
+            _check_disk_space(assertion, candidate_cost)
+            return candidate
+        candidate //= 2
+
+    _raise_max_memory_error(assertion, cost, max_memory)
+
+
+def _get_plan_within_max_memory(
+        circuit,
+        plan: StateVectorCircuitPlan,
+        max_memory: Union[int, None],
+        num_state: int = 1) -> StateVectorCircuitPlan:
+    """Returns the plan for assert_is_zero whose estimated peak memory is
+    within max_memory: the plan itself if it fits, or otherwise the circuit
+    compiled with the state in a memory-mapped file in the temporary
+    directory, in chunks small enough to fit.
+    """
+    if max_memory is None:
+        return plan
+
+    if not isinstance(max_memory, int) or max_memory <= 0:
+        raise QuantestPyError(
+            "max_memory must be a positive integer in bytes."
+        )
+
+    cost = _estimate_cost([plan], "assert_is_zero", num_state=num_state)
+    if cost["peak_bytes"] <= max_memory:
+        return plan
+
+    if isinstance(circuit, StateVectorCircuitPlan) \
+            or plan.memmap_dir is not None:
+        _raise_max_memory_error("assert_is_zero", cost, max_memory)
+
+    memmap_plan = _cvt_all_circuit_to_state_vector_circuit_plan(
+        circuit, precision=plan.precision,
+        memmap_dir=tempfile.gettempdir())
 
+    # the peak memory grows linearly with the chunk besides the operands
+    # of the operations, which shrink with the merged runs of smaller
+    # chunks
+    num_chunk_element = min(
+        2**plan.num_qubit * num_state * (plan.sweep_size or 1),
+        memmap_plan._memmap_chunk_size)
+    chunk_bytes_per_element = (
+        _get_state_peak_bytes(memmap_plan, num_state) - memmap_plan.nbytes) \
+        / num_chunk_element
+    chunk_size = int(max_memory // chunk_bytes_per_element)
+    while True:
+        if chunk_size < 1:
+            _raise_max_memory_error("assert_is_zero", cost, max_memory)
+        memmap_plan = _cvt_all_circuit_to_state_vector_circuit_plan(
+            circuit, precision=plan.precision,
+            memmap_dir=tempfile.gettempdir(),
+            memmap_chunk_size=2**(chunk_size.bit_length() - 1))
+        memmap_cost = _estimate_cost(
+            [memmap_plan], "assert_is_zero", num_state=num_state)
+        if memmap_cost["peak_bytes"] <= max_memory:
+            break
+        chunk_size = 2**(chunk_size.bit_length() - 1) // 2
+    _check_disk_space("assert_is_zero", memmap_cost)
+
+    return memmap_plan
+
+
+def _get_num_state(
+        initial_state_vector: Union[np.ndarray, None],
+        num_qubit: int) -> int:
+    """Returns the number of initial state vectors in the batch."""
+    if initial_state_vector is None or np.ndim(initial_state_vector) != 2:
+        return 1
+    return np.size(initial_state_vector) // 2**num_qubit
+
+
+def estimate_cost(
+        circuit: Union[QuantestPyCircuit, str, StateVectorCircuitPlan],
+        assertion: str = "assert_equal_to_operator",
+        circuit_b: Union[QuantestPyCircuit, str, StateVectorCircuitPlan,
+                         None] = None,
+        ancilla_qubits: Union[list, None] = None,
+        initial_state_vector: np.ndarray = None,
+        from_right_to_left_for_qubit_ids: bool = False,
+        precision: Union[str, None] = None,
+        memmap_dir: Union[str, None] = None,
+        block_size: Union[int, None] = None,
+        up_to_global_phase: bool = False,
+        max_bond_dimension: Union[int, None] = None,
+        method: Union[str, None] = None,
+        num_states: int = 8) -> dict:
+    """Returns the estimated cost of the assertion for the circuit without
+    running it, as a dictionary of the engine, "state_vector", "memmap",
+    "block_wise", "stabilizer", "mps" or "random_states", the peak memory
+    in bytes,
+    "peak_bytes", the bytes of the memory-mapped files on disk,
+    "disk_bytes", and the approximate number of floating point operations,
+    "flops", which are bit operations for the stabilizer engine. The other
+    arguments are those of the assertion, where circuit_b is the second
+    circuit of assert_equal.
+    """
+    if assertion not in _ASSERTIONS:
+        raise QuantestPyError(
+            f"assertion must be one of {_ASSERTIONS}."
+        )
+
+    if assertion == "assert_equal" and circuit_b is None:
+        raise QuantestPyError(
+            "circuit_b must be given for assert_equal."
+        )
+
+    if assertion == "assert_ancilla_is_zero" \
+            and not isinstance(ancilla_qubits, list):
+        raise QuantestPyError(
+            "ancilla_qubits must be a list of integer(s) as qubit's ID(s)."
+        )
+
+    _assert_is_valid_method(method)
+    if method in ["decision_diagram", "miter"]:
+        raise QuantestPyError(
+            f"The cost of method '{method}' depends on the structure of the "
+            "circuits and cannot be estimated in advance."
+        )
+
+    if method == "random_states" and assertion != "assert_equal":
+        raise QuantestPyError(
+            "method 'random_states' is a method of assert_equal."
+        )
+
+    if assertion == "assert_is_zero" and max_bond_dimension is not None:
+        cost = _cvt_all_circuit_to_mps_circuit(
+            circuit, max_bond_dimension, precision).estimate_cost()
+        return {"engine": "mps", "disk_bytes": 0, **cost}
+
+    stabilizer_circuits = None
+    if method is None:
+        stabilizer_circuits = _get_stabilizer_circuits(
+            assertion, circuit, circuit_b, ancilla_qubits,
+            initial_state_vector, up_to_global_phase, block_size=block_size,
+            memmap_dir=memmap_dir if assertion == "assert_is_zero" else None)
+    if stabilizer_circuits is not None:
+        num_measured_qubit = 0
+        if assertion == "assert_is_zero":
+            num_measured_qubit = stabilizer_circuits[0].num_qubit
+        elif assertion == "assert_ancilla_is_zero":
+            num_measured_qubit = len(set(ancilla_qubits))
+        return _estimate_stabilizer_cost(
+            stabilizer_circuits, num_measured_qubit)
+
+    plans = [_cvt_all_circuit_to_state_vector_circuit_plan(
+        circuit, from_right_to_left_for_qubit_ids, precision,
+        memmap_dir if assertion == "assert_is_zero" else None)]
+    if assertion == "assert_equal":
+        plans.append(_cvt_all_circuit_to_state_vector_circuit_plan(
+            circuit_b, precision=precision))
+
+    num_state = _get_num_state(initial_state_vector, plans[0].num_qubit)
+
+    num_ancilla_qubit = 0
+    if ancilla_qubits is not None:
+        num_ancilla_qubit = len(set(ancilla_qubits))
+
+    return _estimate_cost(
+        plans, assertion, block_size, num_state, num_ancilla_qubit,
+        num_states if method == "random_states" else None,
+        up_to_global_phase)
+
+
+def _get_non_zero_qubits(
+        plan: StateVectorCircuitPlan,
+        state_tensor: np.ndarray,
+        qubits: list,
+        atol: float) -> list:
+    """Returns the qubits which are either non-zero or entangled with
+    other qubits in the state tensor obtained from the plan. For a batch of
+    states, a qubit is an error if it is so in any of the states. A
+    memory-mapped state tensor is read chunk by chunk, each chunk fixing
+    the values of the leading axes.
+    """
+    num_qubit = plan.num_qubit
+    for qubit in qubits:
         if qubit > num_qubit-1:
             raise QuantestPyError(
                 f"qubit {qubit} is out of range for the given circuit."
             )
 
-        dim_reg_front = 2**qubit
-        dim_reg_rear = 2**(num_qubit - qubit - 1)
+    num_chunk_axes = plan._get_num_chunk_axes(state_tensor)
+    chunks = np.reshape(
+        state_tensor,
+        (2**num_chunk_axes,) + state_tensor.shape[num_chunk_axes:])
 
-        for i in range(dim_reg_front):
-            clipped_state_vec = \
-                state_vec[i*dim_reg_rear*2: (i+1)*dim_reg_rear*2]
-            clipped_state_vec = clipped_state_vec[dim_reg_rear:]
-            clipped_state_vec = np.abs(clipped_state_vec)
+    error_qubits = set()
+    for chunk_idx, chunk in enumerate(chunks):
+        chunk = np.abs(chunk)
 
-            if not np.all(clipped_state_vec <= atol):
-                return True  # = assertion error
+        for qubit in qubits:
+            axis = plan._get_axis(qubit)
 
-        return False  # = assertion non-error
+            # elements where the qubit is 1, as a view of the chunk
+            if axis < num_chunk_axes:
+                if (chunk_idx >> (num_chunk_axes - 1 - axis)) & 1 == 0:
+                    continue
+                clipped_chunk = chunk
+            else:
+                clipped_chunk = chunk[
+                    (slice(None),)*(axis-num_chunk_axes) + (1, Ellipsis)]
 
-    error_qubits = []
-    for qubit in qubits:
-        if _assert_is_zero_for_one_qubit(qubit):
-            error_qubits.append(qubit)
+            # NaN is an error as well
+            if not np.max(clipped_chunk) <= atol:
+                error_qubits.add(qubit)
+
+    return [qubit for qubit in qubits if qubit in error_qubits]
+
+
+def _assert_stabilizer_circuits_are_equal(
+        stabilizer_circuit_a: StabilizerCircuit,
+        stabilizer_circuit_b: StabilizerCircuit,
+        msg: Union[str, None] = None) -> None:
+    """Raises QuantestPyAssertionError if the Clifford circuits map the
+    Pauli operators X and Z of any qubit differently.
+    """
+    stabilizer_circuit_a._execute_all_gates()
+    stabilizer_circuit_b._execute_all_gates()
+
+    num_qubit = stabilizer_circuit_a.num_qubit
+    x_a, z_a, r_a = stabilizer_circuit_a.tableau
+    x_b, z_b, r_b = stabilizer_circuit_b.tableau
+    is_row_equal = np.all(x_a == x_b, axis=1) \
+        & np.all(z_a == z_b, axis=1) & (r_a == r_b)
+    error_qubits = [
+        qubit for qubit in range(num_qubit)
+        if not (is_row_equal[qubit] and is_row_equal[num_qubit + qubit])]
+
+    if len(error_qubits) > 0:
+        error_msg = "circuit_a and circuit_b are not equal up to global " \
+            + f"phase: they transform X or Z of qubit(s) {error_qubits} " \
+            + "differently."
+        msg = ut_test_case._formatMessage(msg, error_msg)
+        raise QuantestPyAssertionError(msg)
+
+
+def assert_equal_to_operator(
+        circuit: Union[QuantestPyCircuit, str, StateVectorCircuitPlan],
+        operator_: Union[np.ndarray, np.matrix, str],
+        from_right_to_left_for_qubit_ids: bool = False,
+        rtol: float = 0.,
+        atol: Union[float, None] = None,
+        up_to_global_phase: bool = False,
+        matrix_norm_type: Union[str, None] = None,
+        msg=None,
+        precision: Union[str, None] = None,
+        block_size: Union[int, None] = None,
+        unitary_file: Union[str, None] = None,
+        max_memory: Union[int, None] = None,
+        method: Union[str, None] = None) -> None:
+
+    _assert_is_valid_method(method)
+    if method in ["miter", "random_states"]:
+        raise QuantestPyError(
+            f"method '{method}' compares two circuits. Use assert_equal "
+            "instead."
+        )
+
+    if method == "decision_diagram":
+        decision_diagram_circuit = \
+            _cvt_all_circuit_to_decision_diagram_circuit(
+                circuit, from_right_to_left_for_qubit_ids)
+        num_qubit = decision_diagram_circuit.num_qubit
+
+        if isinstance(operator_, str):
+            operator_ = np.load(operator_, mmap_mode="r")
+        if np.shape(operator_) != (2**num_qubit, 2**num_qubit):
+            raise QuantestPyError(
+                "The shapes of the operators must be the same."
+            )
+
+        dd = DecisionDiagram(num_qubit)
+        _assert_decision_diagrams_are_equal(
+            dd,
+            decision_diagram_circuit._get_whole_gates(dd),
+            dd.get_operator(np.asarray(operator_), list(range(num_qubit))),
+            rtol,
+            _DEFAULT_ATOL["complex128"] if atol is None else atol,
+            up_to_global_phase,
+            matrix_norm_type,
+            msg
+        )
+        return
+
+    plan = _cvt_all_circuit_to_state_vector_circuit_plan(
+        circuit, from_right_to_left_for_qubit_ids, precision)
+
+    block_size = _get_block_size_within_max_memory(
+        [plan], "assert_equal_to_operator", max_memory, block_size,
+        up_to_global_phase=up_to_global_phase)
+
+    if atol is None:
+        atol = _DEFAULT_ATOL[plan.precision]
+
+    # reference operator in a .npy file
+    if isinstance(operator_, str):
+        operator_ = np.load(operator_, mmap_mode="r")
+
+    if block_size is None and unitary_file is None:
+        operator_from_test_circuit = plan.get_whole_gates()
+
+        operator.assert_equal(
+            operator_from_test_circuit,
+            operator_,
+            rtol,
+            atol,
+            up_to_global_phase,
+            matrix_norm_type,
+            msg
+        )
+        return
+
+    # out-of-core: the operator is written to the .npy file block by block
+    # of columns and compared with the reference operator block by block
+    if block_size is None:
+        block_size = _get_default_block_size(plan)
+
+    with tempfile.TemporaryDirectory(dir=plan.memmap_dir) as temp_dir:
+        if unitary_file is None:
+            unitary_file = os.path.join(temp_dir, "unitary.npy")
+
+        operator_from_test_circuit = plan.save_whole_gates(
+            unitary_file, block_size)
+
+        operator.assert_equal(
+            operator_from_test_circuit,
+            operator_,
+            rtol,
+            atol,
+            up_to_global_phase,
+            matrix_norm_type,
+            msg,
+            block_size
+        )
+        del operator_from_test_circuit
+
+
+def assert_is_zero(circuit: Union[QuantestPyCircuit, str,
+                                  StateVectorCircuitPlan],
+                   qubits: list = None,
+                   atol: Union[float, None] = None,
+                   msg=None,
+                   initial_state_vector: np.ndarray = None,
+                   precision: Union[str, None] = None,
+                   memmap_dir: Union[str, None] = None,
+                   max_memory: Union[int, None] = None,
+                   max_bond_dimension: Union[int, None] = None) -> None:
+    """Raises a QuantestPyAssertionError if the qubits of the circuit are
+    either not 0 or entangled with other qubits, i.e. if any amplitude of
+    the final state vector where one of them is 1 exceeds atol in absolute
+    value.
+
+    With max_bond_dimension, the matrix product state compares the norm of
+    the whole component where the qubit is 1 with atol instead, i.e. its
+    probability with atol**2, which is stricter: 2**k amplitudes of atol
+    each have the norm atol * 2**(k/2).
+    """
+    if not isinstance(qubits, list) and qubits is not None:
+        raise QuantestPyError(
+            "qubits must be a list of integer(s) as qubit's ID(s)."
+        )
+
+    # Clifford circuits are simulated exactly by the stabilizer engine,
+    # unless the matrix product state is chosen by max_bond_dimension
+    stabilizer_circuits = None
+    if max_bond_dimension is None:
+        stabilizer_circuits = _get_stabilizer_circuits(
+            "assert_is_zero", circuit,
+            initial_state_vector=initial_state_vector, atol=atol,
+            memmap_dir=memmap_dir)
+
+    if max_bond_dimension is not None:
+        if initial_state_vector is not None:
+            raise QuantestPyError(
+                "initial_state_vector cannot be used with "
+                "max_bond_dimension."
+            )
+
+        mps_circuit = _cvt_all_circuit_to_mps_circuit(
+            circuit, max_bond_dimension, precision)
+        if max_memory is not None:
+            cost = mps_circuit.estimate_cost()
+            if cost["peak_bytes"] > max_memory:
+                _raise_max_memory_error("assert_is_zero", cost, max_memory)
+
+        if atol is None:
+            atol = _DEFAULT_ATOL[mps_circuit.precision]
+
+        if qubits is None:
+            qubits = [i for i in range(mps_circuit.num_qubit)]
+
+        error_qubits = _get_non_zero_qubits_of_mps_circuit(
+            mps_circuit, qubits, atol)
+
+    elif stabilizer_circuits is not None:
+        _assert_is_valid_precision(precision)
+        num_qubit = stabilizer_circuits[0].num_qubit
+        if qubits is None:
+            qubits = [i for i in range(num_qubit)]
+
+        error_qubits = _get_non_zero_qubits_of_stabilizer_circuit(
+            stabilizer_circuits[0], qubits, num_qubit)
+
+    else:
+        plan = _cvt_all_circuit_to_state_vector_circuit_plan(
+            circuit, precision=precision, memmap_dir=memmap_dir)
+        plan = _get_plan_within_max_memory(
+            circuit, plan, max_memory,
+            _get_num_state(initial_state_vector, plan.num_qubit))
+
+        if atol is None:
+            atol = _DEFAULT_ATOL[plan.precision]
+
+        if qubits is None:
+            qubits = [i for i in range(plan.num_qubit)]
+
+        error_qubits = _get_non_zero_qubits(
+            plan, plan._get_state_tensor(initial_state_vector), qubits,
+            atol)
 
     if len(error_qubits) > 0:
         error_msg = f"qubit(s) {error_qubits} are either non-zero or " \
@@ -99,69 +1029,130 @@ def assert_is_zero(circuit: Union[QuantestPyCircuit, str],
         raise QuantestPyAssertionError(msg)
 
 
-def assert_ancilla_is_zero(circuit: Union[QuantestPyCircuit, str],
+def assert_snapshot_is_zero(snapshots: StateVectorSnapshots,
+                            qubits: list = None,
+                            gate_indices: list = None,
+                            atol: Union[float, None] = None,
+                            msg=None) -> None:
+
+    if not isinstance(snapshots, StateVectorSnapshots):
+        raise QuantestPyError(
+            "snapshots must be an instance of StateVectorSnapshots returned "
+            "by StateVectorCircuit.get_snapshots()."
+        )
+
+    if not isinstance(qubits, list) and qubits is not None:
+        raise QuantestPyError(
+            "qubits must be a list of integer(s) as qubit's ID(s)."
+        )
+
+    if atol is None:
+        atol = _DEFAULT_ATOL[snapshots.precision]
+
+    if qubits is None:
+        qubits = [i for i in range(snapshots.num_qubit)]
+
+    if gate_indices is None:
+        gate_indices = snapshots.gate_indices
+
+    # plan without operations, which only locates the qubits in the state
+    plan = StateVectorCircuitPlan(
+        snapshots.num_qubit, [], snapshots.from_right_to_left_for_qubit_ids)
+
+    for gate_index in gate_indices:
+        error_qubits = _get_non_zero_qubits(
+            plan, snapshots._get_state_tensor(gate_index), qubits, atol)
+
+        if len(error_qubits) > 0:
+            error_msg = f"qubit(s) {error_qubits} are either non-zero or " \
+                + "entangled with other qubits in the snapshot at gate " \
+                + f"index {gate_index}."
+            msg = ut_test_case._formatMessage(msg, error_msg)
+            raise QuantestPyAssertionError(msg)
+
+
+def assert_ancilla_is_zero(circuit: Union[QuantestPyCircuit, str,
+                                          StateVectorCircuitPlan],
                            ancilla_qubits: list,
-                           atol: float = 1e-8,
-                           msg=None) -> None:
+                           atol: Union[float, None] = None,
+                           msg=None,
+                           precision: Union[str, None] = None,
+                           max_memory: Union[int, None] = None) -> None:
 
     if not isinstance(ancilla_qubits, list):
         raise QuantestPyError(
             "ancilla_qubits must be a list of integer(s) as qubit's ID(s)."
         )
 
-    quantestpy_circuit = cvt_all_circuit_to_quantestpy_circuit(circuit)
+    # Clifford circuits are simulated exactly by the stabilizer engine,
+    # with the system qubits entangled with reference qubits
+    stabilizer_circuits = _get_stabilizer_circuits(
+        "assert_ancilla_is_zero", circuit, ancilla_qubits=ancilla_qubits,
+        atol=atol)
 
-    num_qubit = quantestpy_circuit.num_qubit
+    if stabilizer_circuits is not None:
+        _assert_is_valid_precision(precision)
+        num_qubit = cvt_all_circuit_to_quantestpy_circuit(circuit).num_qubit
+        error_qubits = _get_non_zero_qubits_of_stabilizer_circuit(
+            stabilizer_circuits[0], sorted(set(ancilla_qubits)), num_qubit)
+
+        if len(error_qubits) == 0:
+            return None  # = assertion non-error
+
+        error_msg = f"qubit(s) {error_qubits} are either non-zero or " \
+            + "entangled with other qubits."
+        msg = ut_test_case._formatMessage(msg, error_msg)
+        raise QuantestPyAssertionError(msg)
+
+    plan = _cvt_all_circuit_to_state_vector_circuit_plan(
+        circuit, precision=precision)
+
+    if atol is None:
+        atol = _DEFAULT_ATOL[plan.precision]
+
+    num_qubit = plan.num_qubit
 
     # system qubits <=> ancilla qubits
     system_qubits = [qubit for qubit in range(num_qubit)
                      if qubit not in ancilla_qubits]
 
-    def _add_x_gate_in_front(gates: list, qubit: int) -> dict:
-        x_gate = {"name": "x",
-                  "target_qubit": [qubit],
-                  "control_qubit": [],
-                  "control_value": [],
-                  "parameter": []}
-        gates.insert(0, x_gate)
-
     all_combinations_of_system_qubits = []
     for size in range(len(system_qubits)+1):
         c = list(itertools.combinations(system_qubits, size))
         all_combinations_of_system_qubits += c
 
-    error_msgs_from_assert_is_zero = []
-    for comb_of_sys_qubits in all_combinations_of_system_qubits:
-
-        # add x gate(s) in test_circuit
-        for system_qubit in comb_of_sys_qubits:
-            _add_x_gate_in_front(quantestpy_circuit._gates, system_qubit)
+    # the computational basis states where the system qubits in each
+    # combination are 1 are evolved as a batch, in chunks which keep the
+    # batch of state vectors within _MAX_BATCH_ELEMENTS elements
+    basis_indices = [
+        sum(2**(num_qubit - 1 - plan._get_axis(system_qubit))
+            for system_qubit in comb_of_sys_qubits)
+        for comb_of_sys_qubits in all_combinations_of_system_qubits]
+    batch_size = _get_block_size_within_max_memory(
+        [plan], "assert_ancilla_is_zero", max_memory,
+        num_ancilla_qubit=len(set(ancilla_qubits)))
+    if batch_size is None:
+        batch_size = _get_default_block_size(plan)
 
-        # assertion using assert_is_zero
-        try:
-            assert_is_zero(circuit=quantestpy_circuit,
-                           qubits=ancilla_qubits,
-                           atol=atol)
+    error_qubits = set()
+    for start in range(0, len(basis_indices), batch_size):
+        indices = basis_indices[start:start+batch_size]
 
-        except QuantestPyAssertionError as e:
-            t = traceback.format_exception_only(type(e), e)[0]
-            error_msgs_from_assert_is_zero.append(t)
+        initial_state_vector = np.zeros(
+            (2**num_qubit, len(indices)), dtype=plan.dtype)
+        initial_state_vector[indices, range(len(indices))] = 1.
 
-        # remove x gate(s) from test_circuit, i.e. reset test_circuit.
-        for _ in comb_of_sys_qubits:
-            del quantestpy_circuit._gates[0]
+        error_qubits.update(_get_non_zero_qubits(
+            plan,
+            plan._get_state_tensor(initial_state_vector),
+            ancilla_qubits,
+            atol
+        ))
 
-    if len(error_msgs_from_assert_is_zero) == 0:
+    if len(error_qubits) == 0:
         return None  # = assertion non-error
 
-    error_qubits = []
-    for err_m_from_assert_is_zero in list(set(error_msgs_from_assert_is_zero)):
-        error_qubits_str_list = re.findall(r'\d+', err_m_from_assert_is_zero)
-
-        for error_qubit_str in error_qubits_str_list:
-            error_qubits.append(int(error_qubit_str))
-
-    error_qubits = list(set(error_qubits))
+    error_qubits = sorted(error_qubits)
 
     error_msg = f"qubit(s) {error_qubits} are either non-zero or " \
         + "entangled with other qubits."
@@ -170,13 +1161,19 @@ def assert_ancilla_is_zero(circuit: Union[QuantestPyCircuit, str],
 
 
 def assert_equal(
-        circuit_a: Union[QuantestPyCircuit, str],
-        circuit_b: Union[QuantestPyCircuit, str],
+        circuit_a: Union[QuantestPyCircuit, str, StateVectorCircuitPlan],
+        circuit_b: Union[QuantestPyCircuit, str, StateVectorCircuitPlan],
         rtol: float = 0.,
-        atol: float = 1e-8,
+        atol: Union[float, None] = None,
         up_to_global_phase: bool = False,
         matrix_norm_type: Union[str, None] = None,
-        msg: Union[str, None] = None):
+        msg: Union[str, None] = None,
+        precision: Union[str, None] = None,
+        block_size: Union[int, None] = None,
+        max_memory: Union[int, None] = None,
+        method: Union[str, None] = None,
+        num_states: int = 8,
+        seed: Union[int, None] = None):
 
     if matrix_norm_type is not None and matrix_norm_type not in \
         ["operator_norm_1", "operator_norm_2",
@@ -188,7 +1185,7 @@ def assert_equal(
             "'Frobenius_norm' and 'max_norm'."
         )
 
-    if not isinstance(atol, float):
+    if atol is not None and not isinstance(atol, float):
         raise QuantestPyError(
             "Type of atol must be float."
         )
@@ -198,26 +1195,119 @@ def assert_equal(
             "Type of rtol must be float."
         )
 
-    quantestpy_circuit_a = cvt_all_circuit_to_quantestpy_circuit(circuit_a)
-    quantestpy_circuit_b = cvt_all_circuit_to_quantestpy_circuit(circuit_b)
+    _assert_is_valid_method(method)
 
-    state_vector_circuit_a = cvt_quantestpy_circuit_to_state_vector_circuit(
-        quantestpy_circuit_a
-    )
-    state_vector_circuit_b = cvt_quantestpy_circuit_to_state_vector_circuit(
-        quantestpy_circuit_b
-    )
+    if method in ["decision_diagram", "miter"]:
+        decision_diagram_circuit_a = \
+            _cvt_all_circuit_to_decision_diagram_circuit(circuit_a)
+        decision_diagram_circuit_b = \
+            _cvt_all_circuit_to_decision_diagram_circuit(circuit_b)
+        num_qubit = decision_diagram_circuit_a.num_qubit
+        if decision_diagram_circuit_b.num_qubit != num_qubit:
+            raise QuantestPyError(
+                "The shapes of the operators must be the same."
+            )
 
-    whole_gates_a = state_vector_circuit_a._get_whole_gates()
-    whole_gates_b = state_vector_circuit_b._get_whole_gates()
-
-    # call operator.assert_equal
-    operator.assert_equal(
-        whole_gates_a,
-        whole_gates_b,
-        rtol,
-        atol,
-        up_to_global_phase,
-        matrix_norm_type,
-        msg
-    )
+        # both operators share the tables of the decision diagram. The
+        # miter compares U_a U_b^dagger with the identity instead of U_a
+        # with U_b, without building either of them
+        dd = DecisionDiagram(num_qubit)
+        if method == "miter":
+            edge_a = decision_diagram_circuit_a._get_miter(
+                dd, decision_diagram_circuit_b)
+            edge_b = dd.get_identity()
+        else:
+            edge_a = decision_diagram_circuit_a._get_whole_gates(dd)
+            edge_b = decision_diagram_circuit_b._get_whole_gates(dd)
+
+        _assert_decision_diagrams_are_equal(
+            dd,
+            edge_a,
+            edge_b,
+            rtol,
+            _DEFAULT_ATOL["complex128"] if atol is None else atol,
+            up_to_global_phase,
+            matrix_norm_type,
+            msg
+        )
+        return
+
+    # Clifford circuits are equal up to global phase if and only if their
+    # stabilizer tableaux, which map the Pauli operators, are equal
+    stabilizer_circuits = None
+    if method is None:
+        stabilizer_circuits = _get_stabilizer_circuits(
+            "assert_equal", circuit_a, circuit_b,
+            up_to_global_phase=up_to_global_phase,
+            matrix_norm_type=matrix_norm_type, block_size=block_size,
+            atol=atol)
+
+    if stabilizer_circuits is not None:
+        _assert_is_valid_precision(precision)
+        _assert_stabilizer_circuits_are_equal(*stabilizer_circuits, msg)
+        return
+
+    plan_a = _cvt_all_circuit_to_state_vector_circuit_plan(
+        circuit_a, precision=precision)
+    plan_b = _cvt_all_circuit_to_state_vector_circuit_plan(
+        circuit_b, precision=precision)
+
+    # the tolerance of the lower precision
+    if atol is None:
+        atol = max(_DEFAULT_ATOL[plan_a.precision],
+                   _DEFAULT_ATOL[plan_b.precision])
+
+    if method == "random_states":
+        if not isinstance(num_states, int) or num_states <= 0:
+            raise QuantestPyError(
+                "num_states must be a positive integer."
+            )
+
+        block_size = _get_block_size_within_max_memory(
+            [plan_a, plan_b], "assert_equal", max_memory, block_size,
+            num_random_state=num_states,
+            up_to_global_phase=up_to_global_phase)
+        _assert_equal_on_random_states(
+            plan_a, plan_b, rtol, atol, up_to_global_phase,
+            matrix_norm_type, msg, num_states, seed, block_size)
+        return
+
+    block_size = _get_block_size_within_max_memory(
+        [plan_a, plan_b], "assert_equal", max_memory, block_size,
+        up_to_global_phase=up_to_global_phase)
+
+    if block_size is None:
+        whole_gates_a = plan_a.get_whole_gates()
+        whole_gates_b = plan_b.get_whole_gates()
+
+        # call operator.assert_equal
+        operator.assert_equal(
+            whole_gates_a,
+            whole_gates_b,
+            rtol,
+            atol,
+            up_to_global_phase,
+            matrix_norm_type,
+            msg
+        )
+        return
+
+    # out-of-core: the operators are written to .npy files block by block
+    # of columns and compared block by block
+    with tempfile.TemporaryDirectory() as temp_dir:
+        whole_gates_a = plan_a.save_whole_gates(
+            os.path.join(temp_dir, "unitary_a.npy"), block_size)
+        whole_gates_b = plan_b.save_whole_gates(
+            os.path.join(temp_dir, "unitary_b.npy"), block_size)
+
+        operator.assert_equal(
+            whole_gates_a,
+            whole_gates_b,
+            rtol,
+            atol,
+            up_to_global_phase,
+            matrix_norm_type,
+            msg,
+            block_size
+        )
+        del whole_gates_a, whole_gates_b
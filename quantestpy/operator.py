@@ -36,14 +36,16 @@ def _get_matrix_norm(
         a: np.ndarray,
         b: np.ndarray,
         matrix_norm_type: str,
-        up_to_global_phase: bool) -> float:
-
+        up_to_global_phase: bool) -> Union[float, np.ndarray]:
+    """Returns the matrix norm of a - b, or the matrix norms of each pair
+    of operators for stacked operators of shape (..., dim, dim).
+    """
     if up_to_global_phase:
         a_shape = a.shape
 
         # cvt. to vector
-        a = np.ravel(a)
-        b = np.ravel(b)
+        a = np.reshape(np.asarray(a), a.shape[:-2] + (-1,))
+        b = np.reshape(np.asarray(b), b.shape[:-2] + (-1,))
 
         # rm. global phase
         a, b = _remove_global_phase_from_two_vectors(a, b)
@@ -55,19 +57,19 @@ def _get_matrix_norm(
     m = a - b
 
     if matrix_norm_type == "operator_norm_1":
-        matrix_norm_value = np.linalg.norm(m, 1)
+        matrix_norm_value = np.linalg.norm(m, 1, axis=(-2, -1))
 
     elif matrix_norm_type == "operator_norm_2":
-        matrix_norm_value = np.linalg.norm(m, 2)
+        matrix_norm_value = np.linalg.norm(m, 2, axis=(-2, -1))
 
     elif matrix_norm_type == "operator_norm_inf":
-        matrix_norm_value = np.linalg.norm(m, np.inf)
+        matrix_norm_value = np.linalg.norm(m, np.inf, axis=(-2, -1))
 
     elif matrix_norm_type == "Frobenius_norm":
-        matrix_norm_value = np.linalg.norm(m, "fro")
+        matrix_norm_value = np.linalg.norm(m, "fro", axis=(-2, -1))
 
     elif matrix_norm_type == "max_norm":
-        matrix_norm_value = np.max(np.abs(m))
+        matrix_norm_value = np.max(np.abs(m), axis=(-2, -1))
 
     else:
         raise
@@ -75,6 +77,176 @@ def _get_matrix_norm(
     return matrix_norm_value
 
 
+def _get_global_phases_block_wise(
+        a: np.ndarray,
+        b: np.ndarray,
+        block_size: int) -> tuple:
+    """Returns the global phases of a and b of shape (..., 1, 1), taken at
+    the element of a with the largest absolute value as in
+    _remove_global_phase_from_two_vectors, while reading a block of
+    block_size columns at a time.
+    """
+    dim_row, dim_col = a.shape[-2:]
+    max_abs = np.full(a.shape[:-2], -1.)
+    max_index = np.zeros(a.shape[:-2], dtype=int)
+
+    for start in range(0, dim_col, block_size):
+        abs_block = np.abs(np.asarray(a[..., start:start+block_size]))
+        block_max_abs = np.max(abs_block, axis=(-2, -1))
+
+        # the first element in C order among those with the largest value
+        rows, cols = np.indices(abs_block.shape[-2:])
+        flat_index = np.where(
+            abs_block == block_max_abs[..., np.newaxis, np.newaxis],
+            rows*dim_col + cols + start, dim_row*dim_col)
+        block_max_index = np.min(flat_index, axis=(-2, -1))
+
+        is_update = (block_max_abs > max_abs) | (
+            (block_max_abs == max_abs) & (block_max_index < max_index))
+        max_abs = np.where(is_update, block_max_abs, max_abs)
+        max_index = np.where(is_update, block_max_index, max_index)
+
+    max_rows, max_cols = np.divmod(max_index, dim_col)
+    stack_index = tuple(np.indices(a.shape[:-2]))
+    a_max = np.asarray(a[stack_index + (max_rows, max_cols)])
+    b_max = np.asarray(b[stack_index + (max_rows, max_cols)])
+
+    a_global_phase = a_max / np.abs(a_max)
+    b_global_phase = b_max / np.abs(b_max)
+
+    return a_global_phase[..., np.newaxis, np.newaxis], \
+        b_global_phase[..., np.newaxis, np.newaxis]
+
+
+def _assert_equal_block_wise(
+        a: np.ndarray,
+        b: np.ndarray,
+        rtol: float,
+        atol: float,
+        up_to_global_phase: bool,
+        matrix_norm_type: Union[str, None],
+        msg,
+        block_size: int) -> None:
+    """Compares the operators a and b, e.g. memory-mapped .npy files, block
+    by block of block_size columns, so that only one block of each is held
+    in memory.
+    """
+    if not isinstance(block_size, int) or block_size < 1:
+        raise QuantestPyError(
+            "block_size must be a positive integer."
+        )
+
+    if matrix_norm_type == "operator_norm_2":
+        raise QuantestPyError(
+            "operator_norm_2 cannot be computed block-wise."
+        )
+
+    if up_to_global_phase:
+        a_global_phase, b_global_phase = _get_global_phases_block_wise(
+            a, b, block_size)
+
+    norm_a_minus_b = np.zeros(a.shape[:-2])
+    norm_b = np.zeros(a.shape[:-2])
+    row_sum_a_minus_b = np.zeros(a.shape[:-1])
+    row_sum_b = np.zeros(a.shape[:-1])
+
+    for start in range(0, a.shape[-1], block_size):
+        a_block = np.asarray(a[..., start:start+block_size])
+        b_block = np.asarray(b[..., start:start+block_size])
+
+        if up_to_global_phase:
+            a_block = a_block * a_global_phase.conj()
+            b_block = b_block * b_global_phase.conj()
+
+        if matrix_norm_type is None:
+            try:
+                np.testing.assert_allclose(
+                    actual=a_block,
+                    desired=b_block,
+                    rtol=rtol,
+                    atol=atol,
+                    err_msg=f"Up to global phase: {up_to_global_phase}\n"
+                    + f"Columns: {start} to "
+                    + f"{start + a_block.shape[-1] - 1}"
+                )
+
+            except AssertionError as e:
+                error_msg = e.args[0]
+                msg = ut_test_case._formatMessage(msg, error_msg)
+                raise QuantestPyAssertionError(msg)
+
+            continue
+
+        abs_a_minus_b = np.abs(a_block - b_block)
+        abs_b = np.abs(b_block)
+
+        if matrix_norm_type == "operator_norm_1":
+            norm_a_minus_b = np.maximum(
+                norm_a_minus_b, np.max(np.sum(abs_a_minus_b, axis=-2), -1))
+            norm_b = np.maximum(norm_b, np.max(np.sum(abs_b, axis=-2), -1))
+
+        elif matrix_norm_type == "operator_norm_inf":
+            row_sum_a_minus_b += np.sum(abs_a_minus_b, axis=-1)
+            row_sum_b += np.sum(abs_b, axis=-1)
+            norm_a_minus_b = np.max(row_sum_a_minus_b, axis=-1)
+            norm_b = np.max(row_sum_b, axis=-1)
+
+        elif matrix_norm_type == "Frobenius_norm":
+            # squared until all the blocks are summed up
+            norm_a_minus_b = norm_a_minus_b \
+                + np.sum(abs_a_minus_b**2, axis=(-2, -1))
+            norm_b = norm_b + np.sum(abs_b**2, axis=(-2, -1))
+
+        elif matrix_norm_type == "max_norm":
+            norm_a_minus_b = np.maximum(
+                norm_a_minus_b, np.max(abs_a_minus_b, axis=(-2, -1)))
+            norm_b = np.maximum(norm_b, np.max(abs_b, axis=(-2, -1)))
+
+        else:
+            raise
+
+    if matrix_norm_type is None:
+        return
+
+    if matrix_norm_type == "Frobenius_norm":
+        norm_a_minus_b = np.sqrt(norm_a_minus_b)
+        norm_b = np.sqrt(norm_b)
+
+    _assert_matrix_norm_is_small(
+        norm_a_minus_b[()], norm_b[()] if rtol != 0. else 0., rtol, atol, msg)
+
+
+def _assert_matrix_norm_is_small(
+        matrix_norm_a_minus_b: Union[float, np.ndarray],
+        matrix_norm_b: Union[float, np.ndarray],
+        rtol: float,
+        atol: float,
+        msg) -> None:
+
+    is_error = matrix_norm_a_minus_b >= atol + rtol * matrix_norm_b
+
+    if np.ndim(is_error) > 0 and np.any(is_error):
+        # stacked operators
+        error_indices = np.argwhere(is_error).tolist()
+        if np.ndim(is_error) == 1:
+            error_indices = [index for index, in error_indices]
+
+        error_msg = "matrix norm ||A-B|| is larger than " \
+            + "(atol + rtol*||B||) for the operator(s) at " \
+            + f"{error_indices}."
+        msg = ut_test_case._formatMessage(msg, error_msg)
+        raise QuantestPyAssertionError(msg)
+
+    elif np.ndim(is_error) == 0 and is_error:
+
+        error_msg = "matrix norm ||A-B|| " \
+            + format(matrix_norm_a_minus_b, ".15g") \
+            + " is larger than (atol + rtol*||B||) " \
+            + format(atol + rtol * matrix_norm_b, ".15g") + "."
+        msg = ut_test_case._formatMessage(msg, error_msg)
+        raise QuantestPyAssertionError(msg)
+
+
 def assert_equal(
         operator_a: Union[np.ndarray, np.matrix],
         operator_b: Union[np.ndarray, np.matrix],
@@ -82,7 +254,8 @@ def assert_equal(
         atol: float = 1e-8,
         up_to_global_phase: bool = False,
         matrix_norm_type: Union[str, None] = None,
-        msg=None) -> None:
+        msg=None,
+        block_size: Union[int, None] = None) -> None:
 
     a = operator_a
     b = operator_b
@@ -100,13 +273,20 @@ def assert_equal(
             "The shapes of the operators must be the same."
         )
 
-    # remove global phase
+    # compare block by block, e.g. memory-mapped operators
+    if block_size is not None:
+        _assert_equal_block_wise(
+            a, b, rtol, atol, up_to_global_phase, matrix_norm_type, msg,
+            block_size)
+        return
+
+    # remove global phase, for each operator if they are stacked
     if up_to_global_phase:
         a_shape = a.shape
 
         # cvt. to vector
-        a = np.ravel(a)
-        b = np.ravel(b)
+        a = np.reshape(np.asarray(a), a.shape[:-2] + (-1,))
+        b = np.reshape(np.asarray(b), b.shape[:-2] + (-1,))
 
         # rm. global phase
         a, b = _remove_global_phase_from_two_vectors(a, b)
@@ -152,11 +332,5 @@ def assert_equal(
         else:
             matrix_norm_b = 0.
 
-        if matrix_norm_a_minus_b >= atol + rtol * matrix_norm_b:
-
-            error_msg = "matrix norm ||A-B|| " \
-                + format(matrix_norm_a_minus_b, ".15g") \
-                + " is larger than (atol + rtol*||B||) " \
-                + format(atol + rtol * matrix_norm_b, ".15g") + "."
-            msg = ut_test_case._formatMessage(msg, error_msg)
-            raise QuantestPyAssertionError(msg)
+        _assert_matrix_norm_is_small(
+            matrix_norm_a_minus_b, matrix_norm_b, rtol, atol, msg)
@@ -0,0 +1,418 @@
+import numpy as np
+
+from quantestpy.simulator.exceptions import DecisionDiagramCircuitError
+from quantestpy.simulator.mps_circuit import _get_controlled_matrix
+from quantestpy.simulator.quantestpy_circuit import QuantestPyCircuit
+from quantestpy.simulator.state_vector_circuit import (_GATE_REGISTRY,
+                                                       _get_gate_matrix)
+
+# edge weights below this fraction of the largest one in a node are zero,
+# and weights are rounded to it as keys of the tables
+_TOLERANCE = 1e-12
+
+
+class _Node:
+    """A node of the decision diagram, whose four edges point to the
+    sub-operators of the quadrants (0, 0), (0, 1), (1, 0) and (1, 1) of the
+    variable var, each edge being a pair of the weight and the node.
+    """
+    __slots__ = ("var", "edges", "is_identity")
+
+    def __init__(self, var: int, edges: tuple, is_identity: bool):
+        self.var = var
+        self.edges = edges
+        self.is_identity = is_identity
+
+
+def _get_key(weight: complex) -> tuple:
+    return (round(weight.real / _TOLERANCE), round(weight.imag / _TOLERANCE))
+
+
+class DecisionDiagram:
+    """
+    Quantum multiple-valued decision diagrams (QMDDs) of the operators on
+    num_qubit qubits. An operator is an edge, a pair of the weight and the
+    node, where the variable 0 of the root node is the most significant bit
+    of the row and column indices. The nodes are shared through the unique
+    table, so that identical sub-operators are represented once, and the
+    results of the multiplications and additions of nodes are memoised in
+    the compute tables.
+    """
+
+    def __init__(self, num_qubit: int):
+        self._num_qubit = num_qubit
+        self._terminal = _Node(num_qubit, (), True)
+        self._zero = (0j, self._terminal)
+        self._unique_table = {}
+        self._multiply_table = {}
+        self._add_table = {}
+        self._max_abs_table = {}
+
+    @property
+    def num_qubit(self,):
+        return self._num_qubit
+
+    @property
+    def num_node(self,):
+        """The number of the nodes in the unique table."""
+        return len(self._unique_table)
+
+    def _make_node(self, var: int, edges: list) -> tuple:
+        """Returns the edge to the node with the edges, normalised such
+        that the largest weight of the node is 1, from the unique table.
+        """
+        magnitudes = [abs(weight) for weight, _ in edges]
+        max_magnitude = max(magnitudes)
+        if max_magnitude == 0:
+            return self._zero
+
+        pivot = next(k for k in range(4)
+                     if magnitudes[k] >= max_magnitude * (1 - _TOLERANCE))
+        pivot_weight = edges[pivot][0]
+        edges = tuple(
+            self._zero if magnitudes[k] < _TOLERANCE * max_magnitude
+            else (weight / pivot_weight, node)
+            for k, (weight, node) in enumerate(edges))
+
+        key = (var,) + tuple((_get_key(weight), id(node))
+                             for weight, node in edges)
+        node = self._unique_table.get(key)
+        if node is None:
+            is_identity = edges[1][0] == 0 and edges[2][0] == 0 \
+                and edges[0][1] is edges[3][1] and edges[0][1].is_identity \
+                and _get_key(edges[0][0]) == _get_key(1.) \
+                and _get_key(edges[3][0]) == _get_key(1.)
+            node = _Node(var, edges, is_identity)
+            self._unique_table[key] = node
+
+        return pivot_weight, node
+
+    def get_operator(self, matrix: np.ndarray, vars_: list) -> tuple:
+        """Returns the operator which applies the matrix to the variables
+        given in ascending order, the first one being the most significant
+        bit of the matrix, and the identity to the others.
+        """
+        matrix = np.asarray(matrix)
+
+        def _build(var: int, block: np.ndarray) -> tuple:
+            if var == self._num_qubit:
+                if block[0, 0] == 0:
+                    return self._zero
+                return complex(block[0, 0]), self._terminal
+
+            if var not in vars_:
+                edge = _build(var + 1, block)
+                return self._make_node(
+                    var, [edge, self._zero, self._zero, edge])
+
+            half = len(block) // 2
+            return self._make_node(
+                var, [_build(var + 1, block[i*half:(i+1)*half,
+                                            j*half:(j+1)*half])
+                      for i in range(2) for j in range(2)])
+
+        return _build(0, matrix)
+
+    def get_identity(self,) -> tuple:
+        return self.get_operator(np.eye(1), [])
+
+    def multiply(self, edge_a: tuple, edge_b: tuple) -> tuple:
+        """Returns the product of the operators, edge_a times edge_b."""
+        weight_a, node_a = edge_a
+        weight_b, node_b = edge_b
+        if weight_a == 0 or weight_b == 0:
+            return self._zero
+
+        if node_a.is_identity:
+            return weight_a * weight_b, node_b
+        if node_b.is_identity:
+            return weight_a * weight_b, node_a
+
+        key = (id(node_a), id(node_b))
+        result = self._multiply_table.get(key)
+        if result is None:
+            edges_a = node_a.edges
+            edges_b = node_b.edges
+            result = self._make_node(
+                node_a.var,
+                [self.add(self.multiply(edges_a[2*i], edges_b[j]),
+                          self.multiply(edges_a[2*i+1], edges_b[2+j]))
+                 for i in range(2) for j in range(2)])
+            self._multiply_table[key] = result
+
+        weight, node = result
+        if weight == 0:
+            return self._zero
+        return weight * weight_a * weight_b, node
+
+    def add(self, edge_a: tuple, edge_b: tuple) -> tuple:
+        """Returns the sum of the operators."""
+        weight_a, node_a = edge_a
+        weight_b, node_b = edge_b
+        if weight_a == 0:
+            return edge_b
+        if weight_b == 0:
+            return edge_a
+
+        if node_a is node_b:
+            weight = weight_a + weight_b
+            if abs(weight) < _TOLERANCE * max(abs(weight_a), abs(weight_b)):
+                return self._zero
+            return weight, node_a
+
+        ratio = weight_b / weight_a
+        key = (id(node_a), id(node_b), _get_key(ratio))
+        result = self._add_table.get(key)
+        if result is None:
+            result = self._make_node(
+                node_a.var,
+                [self.add(edge, (weight * ratio, node))
+                 for edge, (weight, node) in zip(node_a.edges,
+                                                 node_b.edges)])
+            self._add_table[key] = result
+
+        weight, node = result
+        if weight == 0:
+            return self._zero
+        return weight * weight_a, node
+
+    def _get_node_max_abs(self, node: _Node) -> float:
+        if node is self._terminal:
+            return 1.
+
+        max_abs = self._max_abs_table.get(id(node))
+        if max_abs is None:
+            max_abs = max(abs(weight) * self._get_node_max_abs(child)
+                          for weight, child in node.edges)
+            self._max_abs_table[id(node)] = max_abs
+
+        return max_abs
+
+    def get_max_abs(self, edge: tuple) -> float:
+        """Returns the largest absolute value of the elements."""
+        weight, node = edge
+        if weight == 0:
+            return 0.
+        return abs(weight) * self._get_node_max_abs(node)
+
+    def get_argmax_abs(self, edge: tuple) -> tuple:
+        """Returns the row and column of an element of the largest absolute
+        value.
+        """
+        row, column = 0, 0
+        _, node = edge
+        for _ in range(self._num_qubit):
+            k = max(range(4), key=lambda k: abs(node.edges[k][0])
+                    * self._get_node_max_abs(node.edges[k][1]))
+            row = 2 * row + k // 2
+            column = 2 * column + k % 2
+            node = node.edges[k][1]
+
+        return row, column
+
+    def get_element(self, edge: tuple, row: int, column: int) -> complex:
+        value, node = edge
+        for var in range(self._num_qubit):
+            if value == 0:
+                return 0j
+            bit = self._num_qubit - 1 - var
+            weight, node = node.edges[
+                2 * ((row >> bit) & 1) + ((column >> bit) & 1)]
+            value *= weight
+
+        return complex(value)
+
+    def get_matrix(self, edge: tuple) -> np.ndarray:
+        """Returns the operator as a matrix, for small numbers of qubits."""
+        def _get_block(var: int, edge: tuple) -> np.ndarray:
+            weight, node = edge
+            dim = 2**(self._num_qubit - var)
+            if weight == 0:
+                return np.zeros((dim, dim), dtype=complex)
+            if var == self._num_qubit:
+                return np.array([[weight]], dtype=complex)
+
+            blocks = [_get_block(var + 1, child) for child in node.edges]
+            return weight * np.block([blocks[:2], blocks[2:]])
+
+        return _get_block(0, edge)
+
+    def get_num_node(self, edge: tuple) -> int:
+        """Returns the number of the non-terminal nodes of the operator."""
+        visited = set()
+        stack = [edge[1]]
+        while stack:
+            node = stack.pop()
+            if node is self._terminal or id(node) in visited:
+                continue
+            visited.add(id(node))
+            stack.extend(child for _, child in node.edges)
+
+        return len(visited)
+
+
+class DecisionDiagramCircuit(QuantestPyCircuit):
+    """
+    This circuit class computes the operator of the circuit as a decision
+    diagram, whose size grows with the structure of the operator rather
+    than exponentially with the number of qubits, e.g. for reversible
+    circuits such as oracles and arithmetic.
+    """
+
+    def __init__(self, num_qubit: int):
+        super().__init__(num_qubit=num_qubit)
+        self._from_right_to_left_for_qubit_ids = False
+
+    def _diagnostic_gate(self, gate: dict) -> None:
+        """Override"""
+        super()._diagnostic_gate(gate)
+
+        if gate["name"] not in _GATE_REGISTRY:
+            raise DecisionDiagramCircuitError(
+                f'{gate["name"]} is not implemented.'
+                f'Implemented gates: {list(_GATE_REGISTRY)}'
+            )
+
+        if "parameter" not in gate.keys():
+            gate["parameter"] = []
+
+        num_param = _GATE_REGISTRY[gate["name"]]["num_param"]
+        if len(gate["parameter"]) != num_param:
+            raise DecisionDiagramCircuitError(
+                f'{gate["name"]} gate must have a list containing '
+                f"exactly {num_param} elements for 'parameter'."
+            )
+
+        for param in gate["parameter"]:
+            if not isinstance(param, (float, int)):
+                raise DecisionDiagramCircuitError(
+                    f'Parameter(s) in {gate["name"]} gate must be '
+                    'float or integer type.'
+                )
+
+        num_target = _GATE_REGISTRY[gate["name"]]["num_target"]
+        if num_target > 1 and len(gate["target_qubit"]) != num_target:
+            raise DecisionDiagramCircuitError(
+                f'{gate["name"]} gate must have a list containing '
+                f"exactly {num_target} elements for 'target_qubit'."
+            )
+
+    def _get_var(self, qubit: int) -> int:
+        """Returns the variable of the qubit in the decision diagram."""
+        if self._from_right_to_left_for_qubit_ids:
+            return self._num_qubit - 1 - qubit
+        return qubit
+
+    def _get_operator(
+            self,
+            dd: DecisionDiagram,
+            matrix: np.ndarray,
+            qubits: list) -> tuple:
+        """Returns the operator applying the matrix to the qubits, the first
+        one being the most significant bit.
+        """
+        num_qubit = len(qubits)
+        vars_ = [self._get_var(qubit) for qubit in qubits]
+        axes = list(np.argsort(vars_))
+        matrix = np.transpose(
+            np.reshape(matrix, (2,)*2*num_qubit),
+            axes + [num_qubit + axis for axis in axes])
+
+        return dd.get_operator(
+            np.reshape(matrix, (2**num_qubit, 2**num_qubit)), sorted(vars_))
+
+    def _get_i_th_gate_operators(
+            self,
+            dd: DecisionDiagram,
+            i: int,
+            inverse: bool = False) -> list:
+        """Returns the operators of the i-th gate, one for each target of a
+        single qubit gate, which are the conjugate transposes if inverse.
+        """
+        gate = self._gates[i]
+        matrix = _get_controlled_matrix(
+            _get_gate_matrix(gate["name"], gate["parameter"]),
+            gate["control_value"])
+        if inverse:
+            matrix = matrix.conj().T
+
+        if _GATE_REGISTRY[gate["name"]]["num_target"] == 1:
+            return [self._get_operator(
+                dd, matrix, gate["control_qubit"] + [target_qubit])
+                for target_qubit in gate["target_qubit"]]
+
+        return [self._get_operator(
+            dd, matrix, gate["control_qubit"] + gate["target_qubit"])]
+
+    def _get_whole_gates(self, dd: DecisionDiagram) -> tuple:
+        """Returns the operator of the circuit in the decision diagram."""
+        if dd.num_qubit != self._num_qubit:
+            raise DecisionDiagramCircuitError(
+                "The number of qubits of the decision diagram must be that "
+                "of the circuit."
+            )
+
+        whole_gates = dd.get_identity()
+        for i in range(len(self._gates)):
+            for gate_operator in self._get_i_th_gate_operators(dd, i):
+                whole_gates = dd.multiply(gate_operator, whole_gates)
+
+        return whole_gates
+
+    def _get_miter(
+            self,
+            dd: DecisionDiagram,
+            circuit_b: "DecisionDiagramCircuit") -> tuple:
+        """Returns U_a U_b^dagger in the decision diagram, where U_a and U_b
+        are the operators of this circuit and circuit_b, without building
+        either of them. The gates of this circuit, multiplied from the
+        left, are interleaved with the inverted gates of circuit_b,
+        multiplied from the right, in proportion to their numbers, so that
+        the product stays close to the identity for equivalent circuits.
+        """
+        if dd.num_qubit != self._num_qubit \
+                or circuit_b.num_qubit != self._num_qubit:
+            raise DecisionDiagramCircuitError(
+                "The number of qubits of the decision diagram must be that "
+                "of the circuits."
+            )
+
+        num_gate_a = len(self._gates)
+        num_gate_b = len(circuit_b.gates)
+
+        miter = dd.get_identity()
+        j = 0
+        for i in range(num_gate_a):
+            for gate_operator in self._get_i_th_gate_operators(dd, i):
+                miter = dd.multiply(gate_operator, miter)
+
+            # catch up with circuit_b up to the same fraction of gates
+            while j < num_gate_b and j * num_gate_a < (i + 1) * num_gate_b:
+                for gate_operator in circuit_b._get_i_th_gate_operators(
+                        dd, j, inverse=True):
+                    miter = dd.multiply(miter, gate_operator)
+                j += 1
+
+        for j in range(j, num_gate_b):
+            for gate_operator in circuit_b._get_i_th_gate_operators(
+                    dd, j, inverse=True):
+                miter = dd.multiply(miter, gate_operator)
+
+        return miter
+
+
+def cvt_quantestpy_circuit_to_decision_diagram_circuit(
+        qc: QuantestPyCircuit) -> DecisionDiagramCircuit:
+    """Converts an instance of QuantestPyCircuit to that of
+    DecisionDiagramCircuit.
+    """
+    if not isinstance(qc, QuantestPyCircuit):
+        raise DecisionDiagramCircuitError(
+            "Input circuit must be an instance of QuantestPyCircuit."
+        )
+
+    ddc = DecisionDiagramCircuit(num_qubit=qc.num_qubit)
+    for gate in qc.gates:
+        ddc.add_gate(gate)
+
+    return ddc
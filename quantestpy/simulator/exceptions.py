@@ -8,3 +8,15 @@ class StateVectorCircuitError(Exception):
 
 class PauliCircuitError(Exception):
     pass
+
+
+class StabilizerCircuitError(Exception):
+    pass
+
+
+class MPSCircuitError(Exception):
+    pass
+
+
+class DecisionDiagramCircuitError(Exception):
+    pass
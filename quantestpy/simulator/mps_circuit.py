@@ -0,0 +1,374 @@
+from typing import Union
+
+import numpy as np
+
+from quantestpy.simulator.exceptions import MPSCircuitError
+from quantestpy.simulator.quantestpy_circuit import QuantestPyCircuit
+from quantestpy.simulator.state_vector_circuit import (_GATE_REGISTRY,
+                                                       _PRECISIONS,
+                                                       _get_gate_matrix)
+
+# singular values below this fraction of the largest one are discarded
+_SVD_CUTOFF = 1e-12
+
+
+def _get_controlled_matrix(
+        matrix: np.ndarray,
+        control_value: list) -> np.ndarray:
+    """Returns the matrix acting on the control qubits followed by the
+    target qubits, which applies the matrix to the target qubits where the
+    control qubits take control_value.
+    """
+    num_target_qubit = int(np.log2(len(matrix)))
+    dim = 2**(len(control_value) + num_target_qubit)
+    controlled_matrix = np.eye(dim, dtype=complex)
+
+    start = int("".join(str(value) for value in control_value) or "0", 2) \
+        * 2**num_target_qubit
+    stop = start + 2**num_target_qubit
+    controlled_matrix[start:stop, start:stop] = matrix
+
+    return controlled_matrix
+
+
+class MPSCircuit(QuantestPyCircuit):
+    """
+    This circuit class simulates circuits as a matrix product state, whose
+    memory grows with the entanglement of the state rather than
+    exponentially with the number of qubits. Each site holds a tensor with
+    the axes (left bond, qubit, right bond). The qubits are moved to
+    adjacent sites by swaps for gates acting on several qubits, so the site
+    of a qubit may change during the simulation. The state is kept in the
+    mixed canonical form around the orthogonality center, so that the
+    singular values of the bonds of a gate are those of the Schmidt
+    decomposition and the truncation to max_bond_dimension is optimal.
+    """
+
+    def __init__(self, num_qubit: int):
+        super().__init__(num_qubit=num_qubit)
+        self._max_bond_dimension = None
+        self._precision = "complex128"
+        self._reset_state()
+
+    @property
+    def max_bond_dimension(self,):
+        return self._max_bond_dimension
+
+    @max_bond_dimension.setter
+    def max_bond_dimension(self, value):
+        if value is not None and (not isinstance(value, int) or value < 1):
+            raise MPSCircuitError(
+                "max_bond_dimension must be a positive integer or None."
+            )
+        self._max_bond_dimension = value
+
+    @property
+    def precision(self,):
+        return self._precision
+
+    @precision.setter
+    def precision(self, value):
+        if value not in _PRECISIONS:
+            raise MPSCircuitError(
+                f"precision must be one of {list(_PRECISIONS)}."
+            )
+        self._precision = value
+        self._reset_state()
+
+    @property
+    def truncation_error(self,):
+        """The sum of the squared norms of the discarded parts of the
+        state, relative to the norm of the state, over all truncations.
+        """
+        return self._truncation_error
+
+    @property
+    def bond_dimensions(self,):
+        return [tensor.shape[2] for tensor in self._tensors[:-1]]
+
+    def _reset_state(self,) -> None:
+        """Sets the state where all qubits are 0, each qubit on the site of
+        its index.
+        """
+        dtype = _PRECISIONS[self._precision]
+        self._tensors = [np.array([1, 0], dtype=dtype).reshape(1, 2, 1)
+                         for _ in range(self._num_qubit)]
+        self._qubit_at_site = [i for i in range(self._num_qubit)]
+        self._site_of_qubit = [i for i in range(self._num_qubit)]
+        self._center = 0
+        self._truncation_error = 0.
+
+    def _diagnostic_gate(self, gate: dict) -> None:
+        """Override"""
+        super()._diagnostic_gate(gate)
+
+        if gate["name"] not in _GATE_REGISTRY:
+            raise MPSCircuitError(
+                f'{gate["name"]} is not implemented.'
+                f'Implemented gates: {list(_GATE_REGISTRY)}'
+            )
+
+        if "parameter" not in gate.keys():
+            gate["parameter"] = []
+
+        num_param = _GATE_REGISTRY[gate["name"]]["num_param"]
+        if len(gate["parameter"]) != num_param:
+            raise MPSCircuitError(
+                f'{gate["name"]} gate must have a list containing '
+                f"exactly {num_param} elements for 'parameter'."
+            )
+
+        for param in gate["parameter"]:
+            if not isinstance(param, (float, int)):
+                raise MPSCircuitError(
+                    f'Parameter(s) in {gate["name"]} gate must be '
+                    'float or integer type.'
+                )
+
+        num_target = _GATE_REGISTRY[gate["name"]]["num_target"]
+        if num_target > 1 and len(gate["target_qubit"]) != num_target:
+            raise MPSCircuitError(
+                f'{gate["name"]} gate must have a list containing '
+                f"exactly {num_target} elements for 'target_qubit'."
+            )
+
+    def _move_center(self, site: int) -> None:
+        """Moves the orthogonality center to the site by QR decompositions
+        of the tensors in between.
+        """
+        while self._center < site:
+            tensor = self._tensors[self._center]
+            left_dim, _, right_dim = tensor.shape
+            q, r = np.linalg.qr(np.reshape(tensor, (left_dim*2, right_dim)))
+            self._tensors[self._center] = np.reshape(q, (left_dim, 2, -1))
+            self._tensors[self._center+1] = np.tensordot(
+                r, self._tensors[self._center+1], axes=(1, 0))
+            self._center += 1
+
+        while self._center > site:
+            tensor = self._tensors[self._center]
+            left_dim, _, right_dim = tensor.shape
+            q, r = np.linalg.qr(
+                np.reshape(tensor, (left_dim, 2*right_dim)).T)
+            self._tensors[self._center] = np.reshape(
+                q.T, (-1, 2, right_dim))
+            self._tensors[self._center-1] = np.tensordot(
+                self._tensors[self._center-1], r.T, axes=(2, 0))
+            self._center -= 1
+
+    def _truncate(
+            self,
+            u: np.ndarray,
+            s: np.ndarray,
+            vh: np.ndarray) -> tuple:
+        """Discards the singular values below _SVD_CUTOFF relative to the
+        largest one and beyond max_bond_dimension, and rescales the others
+        to keep the norm of the state.
+        """
+        norm2 = np.sum(s**2)
+        num_kept = max(1, int(np.sum(s > _SVD_CUTOFF * s[0])))
+        if self._max_bond_dimension is not None:
+            num_kept = min(num_kept, self._max_bond_dimension)
+
+        discarded_norm2 = np.sum(s[num_kept:]**2)
+        s = s[:num_kept]
+        if discarded_norm2 > 0:
+            self._truncation_error += float(discarded_norm2 / norm2)
+            s = s * np.sqrt(norm2 / (norm2 - discarded_norm2))
+
+        return u[:, :num_kept], s, vh[:num_kept]
+
+    def _apply_matrix_to_sites(
+            self,
+            matrix: np.ndarray,
+            site: int,
+            num_site: int) -> None:
+        """Applies the matrix to the num_site adjacent sites from the site,
+        the first one being the most significant bit, and splits the
+        resulting tensor back into the sites by truncated SVDs.
+        """
+        dtype = _PRECISIONS[self._precision]
+        matrix = np.reshape(np.asarray(matrix, dtype=dtype), (2,)*2*num_site)
+
+        if num_site == 1:
+            self._tensors[site] = np.einsum(
+                "ij,ajb->aib", matrix, self._tensors[site])
+            return
+
+        self._move_center(site)
+
+        # (left bond, qubits of the sites..., right bond)
+        theta = self._tensors[site]
+        for i in range(1, num_site):
+            theta = np.tensordot(theta, self._tensors[site+i], axes=(-1, 0))
+
+        theta = np.tensordot(
+            matrix, theta, axes=(range(num_site, 2*num_site),
+                                 range(1, num_site+1)))
+        theta = np.moveaxis(theta, num_site, 0)
+
+        for i in range(num_site-1):
+            left_dim = theta.shape[0]
+            u, s, vh = np.linalg.svd(
+                np.reshape(theta, (left_dim*2, -1)), full_matrices=False)
+            u, s, vh = self._truncate(u, s, vh)
+            self._tensors[site+i] = np.reshape(u, (left_dim, 2, -1))
+            theta = np.reshape(s[:, None] * vh, (len(s),) + theta.shape[2:])
+
+        self._tensors[site+num_site-1] = theta
+        self._center = site + num_site - 1
+
+    def _swap_sites(self, site: int) -> None:
+        """Swaps the qubits on the site and the next site."""
+        swap = np.eye(4)[[0, 2, 1, 3]]
+        self._apply_matrix_to_sites(swap, site, 2)
+
+        qubit_a = self._qubit_at_site[site]
+        qubit_b = self._qubit_at_site[site+1]
+        self._qubit_at_site[site], self._qubit_at_site[site+1] = \
+            qubit_b, qubit_a
+        self._site_of_qubit[qubit_a] = site + 1
+        self._site_of_qubit[qubit_b] = site
+
+    def _gather_qubits(self, qubits: list) -> int:
+        """Moves the qubits to adjacent sites, keeping their order of sites,
+        and returns the first site.
+        """
+        sites = sorted(self._site_of_qubit[qubit] for qubit in qubits)
+        for i, site in enumerate(sites[1:], 1):
+            while site > sites[0] + i:
+                self._swap_sites(site - 1)
+                site -= 1
+
+        return sites[0]
+
+    def _apply_matrix(self, matrix: np.ndarray, qubits: list) -> None:
+        """Applies the matrix to the qubits, the first one being the most
+        significant bit.
+        """
+        num_qubit = len(qubits)
+        site = self._gather_qubits(qubits)
+
+        # reorder the axes of the matrix into the order of the sites
+        site_qubits = self._qubit_at_site[site:site+num_qubit]
+        axes = [qubits.index(qubit) for qubit in site_qubits]
+        matrix = np.transpose(
+            np.reshape(matrix, (2,)*2*num_qubit),
+            axes + [num_qubit + axis for axis in axes])
+
+        self._apply_matrix_to_sites(
+            np.reshape(matrix, (2**num_qubit, 2**num_qubit)), site,
+            num_qubit)
+
+    def _execute_i_th_gate(self, i: int) -> None:
+        gate = self._gates[i]
+        matrix = _get_controlled_matrix(
+            _get_gate_matrix(gate["name"], gate["parameter"]),
+            gate["control_value"])
+
+        if _GATE_REGISTRY[gate["name"]]["num_target"] == 1:
+            for target_qubit in gate["target_qubit"]:
+                self._apply_matrix(
+                    matrix, gate["control_qubit"] + [target_qubit])
+        else:
+            self._apply_matrix(
+                matrix, gate["control_qubit"] + gate["target_qubit"])
+
+    def _execute_all_gates(self,) -> None:
+        for i in range(len(self._gates)):
+            self._execute_i_th_gate(i)
+
+    def get_probability_of_one(self, qubit: int) -> float:
+        """Returns the probability that the qubit is measured to be 1."""
+        site = self._site_of_qubit[qubit]
+        self._move_center(site)
+
+        return float(np.sum(np.abs(self._tensors[site][:, 1, :])**2))
+
+    def get_amplitude(self, qubit_value: list) -> complex:
+        """Returns the amplitude of the computational basis state where
+        the qubit i takes the value qubit_value[i].
+        """
+        if len(qubit_value) != self._num_qubit:
+            raise MPSCircuitError(
+                "Length of qubit_value must be the number of qubits."
+            )
+
+        amplitude = np.ones(1)
+        for site, tensor in enumerate(self._tensors):
+            value = qubit_value[self._qubit_at_site[site]]
+            amplitude = amplitude @ tensor[:, value, :]
+
+        return complex(amplitude[0])
+
+    def get_state_vector(
+            self,
+            from_right_to_left_for_qubit_ids: bool = False) -> np.ndarray:
+        """Returns the state vector of the matrix product state, which has
+        2**num_qubit elements, for small circuits.
+        """
+        state = np.ones((1, 1))
+        for tensor in self._tensors:
+            state = np.reshape(np.tensordot(state, tensor, axes=(-1, 0)),
+                               (-1, tensor.shape[2]))
+
+        state = np.reshape(state, (2,)*self._num_qubit)
+        axes = [self._site_of_qubit[qubit]
+                for qubit in range(self._num_qubit)]
+        if from_right_to_left_for_qubit_ids:
+            axes = axes[::-1]
+
+        return np.reshape(np.transpose(state, axes), -1)
+
+    def estimate_cost(self, max_bond_dimension: Union[int, None] = None) \
+            -> dict:
+        """Returns upper bounds of the peak memory in bytes and of the
+        number of floating point operations of the simulation, as
+        "peak_bytes" and "flops", for the bond dimension at most
+        max_bond_dimension, which is max_bond_dimension of the circuit if
+        None. Without the maximum, the bond dimension is bounded by that of
+        the state vector.
+        """
+        if max_bond_dimension is None:
+            max_bond_dimension = self._max_bond_dimension
+        if max_bond_dimension is None:
+            max_bond_dimension = 2**(self._num_qubit // 2)
+
+        itemsize = np.dtype(_PRECISIONS[self._precision]).itemsize
+        chi = max_bond_dimension
+        tensor_bytes = 2 * chi**2 * itemsize
+
+        # each gate is applied to the tensor of its qubits, which is split
+        # by SVDs; the swaps to gather the qubits are counted as gates
+        peak_bytes = self._num_qubit * tensor_bytes
+        flops = 0
+        for gate in self._gates:
+            num_gate_qubit = len(gate["control_qubit"]) \
+                + _GATE_REGISTRY[gate["name"]]["num_target"]
+            dim = 2**num_gate_qubit
+            peak_bytes = max(
+                peak_bytes,
+                self._num_qubit * tensor_bytes + 4 * chi**2 * dim * itemsize)
+            num_applied = len(gate["target_qubit"]) \
+                // _GATE_REGISTRY[gate["name"]]["num_target"]
+            num_swap = self._num_qubit * (num_gate_qubit - 1)
+            flops += num_applied * 8 * (
+                chi**2 * dim * dim + (num_gate_qubit - 1) * chi**3 * dim
+                + num_swap * 16 * chi**3)
+
+        return {"peak_bytes": peak_bytes, "flops": flops}
+
+
+def cvt_quantestpy_circuit_to_mps_circuit(
+        qc: QuantestPyCircuit) -> MPSCircuit:
+    """Converts an instance of QuantestPyCircuit to that of MPSCircuit."""
+    if not isinstance(qc, QuantestPyCircuit):
+        raise MPSCircuitError(
+            "Input circuit must be an instance of QuantestPyCircuit."
+        )
+
+    mc = MPSCircuit(num_qubit=qc.num_qubit)
+    for gate in qc.gates:
+        mc.add_gate(gate)
+
+    return mc
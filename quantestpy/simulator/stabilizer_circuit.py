@@ -0,0 +1,250 @@
+import numpy as np
+
+from quantestpy.simulator.exceptions import StabilizerCircuitError
+from quantestpy.simulator.quantestpy_circuit import QuantestPyCircuit
+from quantestpy.simulator.state_vector_circuit import _GATE_REGISTRY
+
+# Clifford gates which remain Clifford with a control qubit
+_CONTROLLABLE_GATES = ["id", "x", "y", "z"]
+
+
+def _is_clifford_gate(gate: dict) -> bool:
+    """Returns True if the gate is a Clifford gate, i.e. a registered
+    Clifford gate without parameters, with at most one control qubit for
+    the Pauli gates and without control qubits for the others.
+    """
+    if gate["name"] not in _GATE_REGISTRY \
+            or not _GATE_REGISTRY[gate["name"]]["is_clifford"] \
+            or len(gate.get("parameter", [])) > 0:
+        return False
+
+    if gate["name"] in _CONTROLLABLE_GATES:
+        return len(gate["control_qubit"]) <= 1
+
+    return len(gate["control_qubit"]) == 0
+
+
+def _get_product_phase(
+        x_1: np.ndarray,
+        z_1: np.ndarray,
+        x_2: np.ndarray,
+        z_2: np.ndarray) -> int:
+    """Returns the exponent of i, modulo 4, in the product of the Pauli
+    operators given by the x and z bits, besides their signs.
+    """
+    x_1, z_1 = x_1.astype(int), z_1.astype(int)
+    x_2, z_2 = x_2.astype(int), z_2.astype(int)
+    exponents = np.where(
+        x_1 & z_1, z_2 - x_2,
+        np.where(x_1, z_2 * (2*x_2 - 1), z_1 * x_2 * (1 - 2*z_2)))
+
+    return int(np.sum(exponents)) % 4
+
+
+class StabilizerCircuit(QuantestPyCircuit):
+    """
+    This circuit class simulates circuits consisting only of Clifford gates
+    in polynomial time with the stabilizer tableau of Aaronson and
+    Gottesman. The rows 0, ..., n-1 of the tableau are the destabilizers
+    and the rows n, ..., 2n-1 the stabilizers, i.e. the images of X_i and
+    Z_i under the gates executed so far, each given by its x bits, z bits
+    and the sign bit r. The global phase is not tracked.
+    """
+
+    def __init__(self, num_qubit: int):
+        super().__init__(num_qubit=num_qubit)
+        self._reset_tableau()
+
+    @property
+    def tableau(self,):
+        return self._x, self._z, self._r
+
+    def _reset_tableau(self,) -> None:
+        """Sets the tableau to that of the state where all qubits are 0,
+        which is also that of the identity operator.
+        """
+        n = self._num_qubit
+        self._x = np.zeros((2*n, n), dtype=bool)
+        self._z = np.zeros((2*n, n), dtype=bool)
+        self._r = np.zeros(2*n, dtype=bool)
+        self._x[range(n), range(n)] = True
+        self._z[range(n, 2*n), range(n)] = True
+
+    def _diagnostic_gate(self, gate: dict) -> None:
+        """Override"""
+        super()._diagnostic_gate(gate)
+
+        if not _is_clifford_gate(gate):
+            raise StabilizerCircuitError(
+                f'{gate["name"]} gate with control_qubit '
+                f'{gate["control_qubit"]} is not a Clifford gate.'
+            )
+
+    def _execute_x_gate(self, target_qubit: list) -> None:
+        self._r ^= np.logical_xor.reduce(self._z[:, target_qubit], axis=1)
+
+    def _execute_y_gate(self, target_qubit: list) -> None:
+        self._r ^= np.logical_xor.reduce(
+            self._x[:, target_qubit] ^ self._z[:, target_qubit], axis=1)
+
+    def _execute_z_gate(self, target_qubit: list) -> None:
+        self._r ^= np.logical_xor.reduce(self._x[:, target_qubit], axis=1)
+
+    def _execute_h_gate(self, target_qubit: list) -> None:
+        x = self._x[:, target_qubit]
+        z = self._z[:, target_qubit]
+        self._r ^= np.logical_xor.reduce(x & z, axis=1)
+        self._x[:, target_qubit] = z
+        self._z[:, target_qubit] = x
+
+    def _execute_s_gate(self, target_qubit: list) -> None:
+        x = self._x[:, target_qubit]
+        z = self._z[:, target_qubit]
+        self._r ^= np.logical_xor.reduce(x & z, axis=1)
+        self._z[:, target_qubit] = z ^ x
+
+    def _execute_sdg_gate(self, target_qubit: list) -> None:
+        x = self._x[:, target_qubit]
+        z = self._z[:, target_qubit]
+        self._r ^= np.logical_xor.reduce(x & ~z, axis=1)
+        self._z[:, target_qubit] = z ^ x
+
+    def _execute_cx_gate(self, control_qubit: int, target_qubit: int) -> None:
+        x_c, z_c = self._x[:, control_qubit], self._z[:, control_qubit]
+        x_t, z_t = self._x[:, target_qubit], self._z[:, target_qubit]
+        self._r ^= x_c & z_t & ~(x_t ^ z_c)
+        self._x[:, target_qubit] = x_t ^ x_c
+        self._z[:, control_qubit] = z_c ^ z_t
+
+    def _execute_swap_gate(self, target_qubit: list) -> None:
+        self._x[:, target_qubit] = self._x[:, target_qubit[::-1]]
+        self._z[:, target_qubit] = self._z[:, target_qubit[::-1]]
+
+    def _execute_iswap_gate(self, target_qubit: list) -> None:
+        # iSWAP = (S x S) (H x I) CX(0, 1) CX(1, 0) (I x H)
+        qubit_0, qubit_1 = target_qubit
+        self._execute_h_gate([qubit_1])
+        self._execute_cx_gate(qubit_1, qubit_0)
+        self._execute_cx_gate(qubit_0, qubit_1)
+        self._execute_h_gate([qubit_0])
+        self._execute_s_gate(target_qubit)
+
+    def _execute_controlled_gate(
+            self,
+            name: str,
+            control_qubit: int,
+            target_qubit: list) -> None:
+        for qubit in target_qubit:
+            if name == "x":
+                self._execute_cx_gate(control_qubit, qubit)
+            elif name == "y":
+                # CY = (I x S) CX (I x Sdg)
+                self._execute_sdg_gate([qubit])
+                self._execute_cx_gate(control_qubit, qubit)
+                self._execute_s_gate([qubit])
+            elif name == "z":
+                # CZ = (I x H) CX (I x H)
+                self._execute_h_gate([qubit])
+                self._execute_cx_gate(control_qubit, qubit)
+                self._execute_h_gate([qubit])
+
+    def _execute_i_th_gate(self, i: int) -> None:
+        gate = self._gates[i]
+
+        if len(gate["control_qubit"]) == 1:
+            # control value 0 is control value 1 between X gates
+            control_qubit = gate["control_qubit"][0]
+            if gate["control_value"][0] == 0:
+                self._execute_x_gate([control_qubit])
+            self._execute_controlled_gate(
+                gate["name"], control_qubit, gate["target_qubit"])
+            if gate["control_value"][0] == 0:
+                self._execute_x_gate([control_qubit])
+
+        elif gate["name"] == "x":
+            self._execute_x_gate(gate["target_qubit"])
+        elif gate["name"] == "y":
+            self._execute_y_gate(gate["target_qubit"])
+        elif gate["name"] == "z":
+            self._execute_z_gate(gate["target_qubit"])
+        elif gate["name"] == "h":
+            self._execute_h_gate(gate["target_qubit"])
+        elif gate["name"] == "s":
+            self._execute_s_gate(gate["target_qubit"])
+        elif gate["name"] == "sdg":
+            self._execute_sdg_gate(gate["target_qubit"])
+        elif gate["name"] == "swap":
+            self._execute_swap_gate(gate["target_qubit"])
+        elif gate["name"] == "iswap":
+            self._execute_iswap_gate(gate["target_qubit"])
+        elif gate["name"] != "id":
+            raise StabilizerCircuitError(
+                "Unexpected error. Please report."
+            )
+
+    def _execute_all_gates(self,) -> None:
+        for i in range(len(self._gates)):
+            self._execute_i_th_gate(i)
+
+    def _get_z_value(self, qubit: int):
+        """Returns the value, 0 or 1, of the qubit if measuring it in the Z
+        basis gives the value with certainty, i.e. the qubit is 0 or 1 and
+        not entangled with other qubits, or None otherwise.
+        """
+        n = self._num_qubit
+        if np.any(self._x[n:, qubit]):
+            return None
+
+        # Z of the qubit is the product of the stabilizers whose
+        # destabilizers anticommute with it, and its sign is the value
+        x = np.zeros(n, dtype=bool)
+        z = np.zeros(n, dtype=bool)
+        exponent = 0
+        for row in np.flatnonzero(self._x[:n, qubit]) + n:
+            exponent += 2 * int(self._r[row]) \
+                + _get_product_phase(self._x[row], self._z[row], x, z)
+            x ^= self._x[row]
+            z ^= self._z[row]
+
+        return exponent % 4 // 2
+
+    def estimate_cost(self, num_measured_qubit: int = 0) -> dict:
+        """Returns the estimated peak memory in bytes of the tableau, and
+        the approximate number of bit operations to execute the gates and
+        to measure num_measured_qubit qubits, as "peak_bytes" and "flops".
+        """
+        n = self._num_qubit
+        peak_bytes = 2 * (2*n * n + 2*n)
+
+        # each gate updates a few columns of the tableau for each target,
+        # and each measurement multiplies up to n rows
+        num_column_op = sum(
+            len(gate["target_qubit"]) * (1 + 4 * len(gate["control_qubit"]))
+            for gate in self._gates)
+        flops = 4 * 2*n * num_column_op + num_measured_qubit * 8 * n * n
+
+        return {"peak_bytes": peak_bytes, "flops": flops}
+
+
+def is_clifford_circuit(qc: QuantestPyCircuit) -> bool:
+    """Returns True if the circuit consists only of Clifford gates, so that
+    it can be simulated by StabilizerCircuit.
+    """
+    return all(_is_clifford_gate(gate) for gate in qc.gates)
+
+
+def cvt_quantestpy_circuit_to_stabilizer_circuit(
+        qc: QuantestPyCircuit) -> StabilizerCircuit:
+    """Converts an instance of QuantestPyCircuit to that of
+    StabilizerCircuit.
+    """
+    if not isinstance(qc, QuantestPyCircuit):
+        raise StabilizerCircuitError(
+            "Input circuit must be an instance of QuantestPyCircuit."
+        )
+
+    sc = StabilizerCircuit(num_qubit=qc.num_qubit)
+    for gate in qc.gates:
+        sc.add_gate(gate)
+
+    return sc
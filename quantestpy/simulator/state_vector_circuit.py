@@ -1,29 +1,69 @@
+import atexit
+import copy
+import functools
 import itertools
+import multiprocessing
+import pickle
+import queue
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
 
 import numpy as np
 
 from quantestpy.simulator.exceptions import StateVectorCircuitError
 from quantestpy.simulator.quantestpy_circuit import QuantestPyCircuit
 
+# precisions of the simulation
+_PRECISIONS = {"complex64": np.complex64, "complex128": np.complex128}
+
+# default maximum number of elements of a chunk of a memory-mapped state
+_MEMMAP_CHUNK_SIZE = 2**22
+
+# minimum number of elements of a chunk applied by a worker thread, below
+# which the overhead of the threads outweighs the parallelism
+_MIN_THREAD_CHUNK_SIZE = 2**14
+
+# execution backends of the worker pool
+_BACKENDS = ["thread", "process"]
+
+# maximum number of plans cached by a worker process, which are sent to the
+# workers once and referred to by their tokens afterwards
+_MAX_WORKER_PLANS = 16
+
+# seconds between the checks of the worker processes while waiting for
+# them to finish
+_WORKER_POLL_INTERVAL = 1.
+
+# tokens of the plans, unique in the process
+_PLAN_TOKENS = itertools.count()
+
+# maximum number of qubits on which a merged run of diagonal or permutation
+# gates acts, so that its local phase or index tensor is small
+_MAX_MERGED_QUBITS = 10
+
 # inside of test unit
 # single qubit gates
-_ID = np.array([[1, 0], [0, 1]])
-_X = np.array([[0, 1], [1, 0]])
-_Y = np.array([[0, -1j], [1j, 0]])
-_Z = np.array([[1, 0], [0, -1]])
-_H = np.array([[1, 1], [1, -1]])/np.sqrt(2.)
-_S = np.array([[1, 0], [0, 1j]])
-_Sdg = np.array([[1, 0], [0, -1j]])
-_T = np.array([[1, 0], [0, np.exp(1j*np.pi/4)]])
-_Tdg = np.array([[1, 0], [0, np.exp(-1j*np.pi/4)]])
+_ID = np.array([[1, 0], [0, 1]], dtype=complex)
+_X = np.array([[0, 1], [1, 0]], dtype=complex)
+_Y = np.array([[0, -1j], [1j, 0]], dtype=complex)
+_Z = np.array([[1, 0], [0, -1]], dtype=complex)
+_H = np.array([[1, 1], [1, -1]], dtype=complex)/np.sqrt(2.)
+_S = np.array([[1, 0], [0, 1j]], dtype=complex)
+_Sdg = np.array([[1, 0], [0, -1j]], dtype=complex)
+_T = np.array([[1, 0], [0, np.exp(1j*np.pi/4)]], dtype=complex)
+_Tdg = np.array([[1, 0], [0, np.exp(-1j*np.pi/4)]], dtype=complex)
 
 
 def _u(parameter: list) -> np.ndarray:
-    theta, phi, lambda_, gamma = parameter
-    return np.array([
+    theta, phi, lambda_, gamma = np.broadcast_arrays(*parameter)
+    matrix = np.array([
         [np.cos(theta/2), -np.exp(1j*lambda_) * np.sin(theta/2)],
         [np.exp(1j*phi)*np.sin(theta/2),
             np.exp(1j*(lambda_ + phi))*np.cos(theta/2)]])*np.exp(1j*gamma)
+    # the matrix axes come last for arrays of parameters
+    return np.moveaxis(matrix, (0, 1), (-2, -1))
 
 
 def _p(parameter: list) -> np.ndarray:
@@ -43,24 +83,393 @@ def _ry(parameter: list) -> np.ndarray:
 
 def _rz(parameter: list) -> np.ndarray:
     phi = parameter[0]
-    return _p(parameter)*np.exp(-1j*phi/2)
+    return _p(parameter)*np.exp(-1j*np.asarray(phi)/2)[..., None, None]
 
 
 def _scalar(parameter: list) -> np.ndarray:
     theta = parameter[0]
-    return _ID * np.exp(1j*theta)
+    return _ID * np.exp(1j*np.asarray(theta))[..., None, None]
+
+
+# two qubit gates
+_SWAP = np.array([[1, 0, 0, 0], [0, 0, 1, 0], [0, 1, 0, 0], [0, 0, 0, 1]],
+                 dtype=complex)
+_ISWAP = np.array([[1, 0, 0, 0], [0, 0, 1j, 0], [0, 1j, 0, 0], [0, 0, 0, 1]],
+                  dtype=complex)
+
+# gate registry
+_GATE_MATRIX_CACHE_SIZE = 4096
+_GATE_REGISTRY = {}
+
+
+def _register_gate(
+        name: str,
+        matrix: np.ndarray = None,
+        builder=None,
+        num_param: int = 0,
+        num_target: int = 1,
+        is_diagonal: bool = False,
+        is_permutation: bool = False,
+        is_clifford: bool = False,
+        is_vectorized: bool = False) -> None:
+    """Registers a gate which StateVectorCircuit accepts.
+
+    Either a constant matrix or a builder, which takes the list of
+    parameters and returns the matrix, must be given. The matrices built by
+    the builder are memoised by their parameters in a bounded LRU cache.
+    For gates with num_target=1, the 2x2 matrix is applied to each target
+    qubit. Otherwise the matrix acts on all the target qubits, the first
+    one being the most significant bit.
+
+    If is_vectorized is True, the builder also takes 1-D arrays of
+    parameters, broadcast with the numbers, and returns the matrices
+    stacked along the first axis, so that the matrices of a parameter
+    sweep are built at once.
+
+    The metadata lets the kernels exploit the structure of the gate:
+    is_diagonal for the phase fast path, is_permutation for the index
+    gather fast path (single qubit permutation gates must be X), and
+    is_clifford for simulators of Clifford circuits.
+    """
+    if (matrix is None) == (builder is None):
+        raise StateVectorCircuitError(
+            "Either matrix or builder must be given."
+        )
+
+    if matrix is not None:
+        matrix = np.array(matrix, dtype=complex)
+        matrix.flags.writeable = False
+
+        def _builder(parameter: tuple) -> np.ndarray:
+            return matrix
+
+    else:
+        @functools.lru_cache(maxsize=_GATE_MATRIX_CACHE_SIZE)
+        def _builder(parameter: tuple) -> np.ndarray:
+            built_matrix = np.array(builder(list(parameter)), dtype=complex)
+            built_matrix.flags.writeable = False
+            return built_matrix
+
+    _GATE_REGISTRY[name] = {
+        "builder": _builder,
+        "raw_builder": builder,
+        "is_vectorized": is_vectorized,
+        "num_param": num_param,
+        "num_target": num_target,
+        "is_diagonal": is_diagonal,
+        "is_permutation": is_permutation,
+        "is_clifford": is_clifford
+    }
+
+
+def _get_gate_matrix(name: str, parameter: list) -> np.ndarray:
+    """Returns the read-only matrix of the registered gate."""
+    return _GATE_REGISTRY[name]["builder"](tuple(parameter))
+
+
+def _get_swept_gate_matrices(
+        name: str,
+        parameter: list,
+        sweep_size: int) -> np.ndarray:
+    """Returns the matrices of the registered gate stacked along the first
+    axis, one for each of the sweep_size values of the parameters given as
+    1-D arrays. The other parameters are the same for all the matrices.
+    The matrices are built directly by the builder, bypassing the LRU
+    cache, at once if the builder is vectorized.
+    """
+    builder = _GATE_REGISTRY[name]["raw_builder"]
+    if _GATE_REGISTRY[name]["is_vectorized"]:
+        matrices = np.asarray(builder(list(parameter)), dtype=complex)
+        return np.broadcast_to(
+            matrices, (sweep_size,) + matrices.shape[-2:])
+
+    return np.array([
+        builder([param[i] if isinstance(param, np.ndarray) else param
+                 for param in parameter])
+        for i in range(sweep_size)], dtype=complex)
+
+
+def _is_parametric_gate(gate: dict) -> bool:
+    """Returns True if the gate has named parameters to be bound later."""
+    return any(isinstance(param, str) for param in gate["parameter"])
+
+
+_register_gate("id", _ID, is_diagonal=True, is_clifford=True)
+_register_gate("x", _X, is_permutation=True, is_clifford=True)
+_register_gate("y", _Y, is_clifford=True)
+_register_gate("z", _Z, is_diagonal=True, is_clifford=True)
+_register_gate("h", _H, is_clifford=True)
+_register_gate("s", _S, is_diagonal=True, is_clifford=True)
+_register_gate("sdg", _Sdg, is_diagonal=True, is_clifford=True)
+_register_gate("t", _T, is_diagonal=True)
+_register_gate("tdg", _Tdg, is_diagonal=True)
+_register_gate("swap", _SWAP, num_target=2, is_permutation=True,
+               is_clifford=True)
+_register_gate("iswap", _ISWAP, num_target=2, is_clifford=True)
+_register_gate("rx", builder=_rx, num_param=1, is_vectorized=True)
+_register_gate("ry", builder=_ry, num_param=1, is_vectorized=True)
+_register_gate("rz", builder=_rz, num_param=1, is_diagonal=True,
+               is_vectorized=True)
+_register_gate("p", builder=_p, num_param=1, is_diagonal=True,
+               is_vectorized=True)
+_register_gate("scalar", builder=_scalar, num_param=1, is_diagonal=True,
+               is_vectorized=True)
+_register_gate("u", builder=_u, num_param=4, is_vectorized=True)
+
+
+def _get_control_index(
+        num_axes: int,
+        control_axes: list,
+        control_value: list) -> tuple:
+    """Returns the index which selects, as a view, the slice of the state
+    tensor where the control qubits take control_value.
+    """
+    index = [slice(None)] * num_axes
+    for axis, value in zip(control_axes, control_value):
+        index[axis] = value
+
+    return tuple(index)
+
+
+def _get_axes_in_slice(axes: list, control_axes: list) -> list:
+    """Returns the axes after the control axes are removed by slicing."""
+    return [axis - len([c for c in control_axes if c < axis])
+            for axis in axes]
+
+
+def _apply_matrix_to_axes(
+        state_tensor: np.ndarray,
+        matrix: np.ndarray,
+        axes: list) -> np.ndarray:
+    """Contracts the matrix acting on len(axes) qubits with the given axes
+    of the state tensor. The other axes are left untouched.
+    """
+    num_axes = len(axes)
+    matrix = np.reshape(matrix, (2,)*(2*num_axes))
+    state_tensor = np.tensordot(
+        matrix, state_tensor, axes=(list(range(num_axes, 2*num_axes)), axes))
+
+    return np.moveaxis(state_tensor, list(range(num_axes)), axes)
+
+
+def _apply_single_qubit_matrix_to_axis(
+        state_tensor: np.ndarray,
+        matrix: np.ndarray,
+        axis: int) -> np.ndarray:
+    """Applies the 2x2 matrix to the given axis of the state tensor in
+    place, updating the two halves of the tensor along the axis. Stacked
+    matrices of shape (sweep_size, 2, 2) are applied along the last axis
+    of the state tensor, which is the sweep axis.
+    """
+    amp_0 = state_tensor[(slice(None),)*axis + (0, Ellipsis)]
+    amp_1 = state_tensor[(slice(None),)*axis + (1, Ellipsis)]
+    # at most two temporary halves are held at a time
+    new_amp_0 = amp_0 * matrix[..., 0, 0]
+    new_amp_0 += matrix[..., 0, 1]*amp_1
+    amp_1 *= matrix[..., 1, 1]
+    amp_1 += matrix[..., 1, 0]*amp_0
+    amp_0[...] = new_amp_0
+
+    return state_tensor
+
+
+def _apply_swept_matrices_to_axes(
+        state_tensor: np.ndarray,
+        matrices: np.ndarray,
+        axes: list) -> np.ndarray:
+    """Contracts the stacked matrices of shape (sweep_size, 2**k, 2**k)
+    with the given k axes of the state tensor, the i-th matrix being
+    applied to the i-th element along the last axis of the state tensor,
+    which is the sweep axis.
+    """
+    num_axes = len(axes)
+    ndim = state_tensor.ndim
+    state_labels = list(range(ndim))
+    output_labels = list(range(ndim, ndim + num_axes))
+    result_labels = list(state_labels)
+    for axis, label in zip(axes, output_labels):
+        result_labels[axis] = label
+
+    return np.einsum(
+        np.reshape(matrices, (len(matrices),) + (2,)*(2*num_axes)),
+        [ndim - 1] + output_labels + [state_labels[axis] for axis in axes],
+        state_tensor,
+        state_labels,
+        result_labels
+    )
+
+
+def _get_local_value_index(
+        num_axes: int,
+        axes: tuple,
+        value: int) -> tuple:
+    """Returns the index which selects, as a view, the slice of the state
+    tensor where the axes take the bits of the local value, the first axis
+    being the most significant bit.
+    """
+    return _get_control_index(
+        num_axes,
+        list(axes),
+        [(value >> (len(axes) - 1 - i)) & 1 for i in range(len(axes))]
+    )
+
+
+def _get_permutation_cycles(index_tensor: np.ndarray) -> tuple:
+    """Returns the cycles of the permutation of the local values given by
+    the index tensor, where the new slice of local value j is the old slice
+    of local value index_tensor[j]. A cycle [j_0, j_1, ..., j_m] means that
+    the slice j_i is replaced by the slice j_(i+1), and j_m by j_0. Fixed
+    points are left out.
+    """
+    flat_index = np.ravel(index_tensor)
+    is_visited = np.zeros(len(flat_index), dtype=bool)
+    cycles = []
+    for start in range(len(flat_index)):
+        if is_visited[start] or flat_index[start] == start:
+            continue
+
+        cycle = [start]
+        is_visited[start] = True
+        value = int(flat_index[start])
+        while value != start:
+            cycle.append(value)
+            is_visited[value] = True
+            value = int(flat_index[value])
+        cycles.append(_get_read_only_array(cycle))
+
+    return tuple(cycles)
+
+
+def _multiply_phase_to_axes(
+        state_tensor: np.ndarray,
+        phase_tensor: np.ndarray,
+        axes: tuple) -> np.ndarray:
+    """Multiplies the local phase tensor of shape (2,)*len(axes) to the
+    given ascending axes of the state tensor in place, broadcasting it
+    over the other axes.
+    """
+    shape = [1] * state_tensor.ndim
+    for axis in axes:
+        shape[axis] = 2
+    state_tensor *= np.reshape(phase_tensor, shape)
 
+    return state_tensor
 
-# gates lists
-_IMPLEMENTED_GATES_WITHOUT_PARAM = [
-    "id", "x", "y", "z", "h", "s", "sdg", "t", "tdg", "swap", "iswap"]
-_IMPLEMENTED_GATES_WITH_ONE_PARAM = [
-    "rx", "ry", "rz", "p", "scalar"]
-_IMPLEMENTED_GATES_WITH_FOUR_PARAM = ["u"]
-_IMPLEMENTED_GATES_WITH_PARAM = _IMPLEMENTED_GATES_WITH_ONE_PARAM \
-    + _IMPLEMENTED_GATES_WITH_FOUR_PARAM
-_IMPLEMENTED_GATES = _IMPLEMENTED_GATES_WITHOUT_PARAM \
-    + _IMPLEMENTED_GATES_WITH_PARAM
+
+def _permute_slices_of_axes(
+        state_tensor: np.ndarray,
+        cycles: tuple,
+        axes: tuple) -> np.ndarray:
+    """Permutes the slices of the state tensor where the given axes take
+    their local values along the cycles in place. Only the slices which are
+    moved are copied, and only one of them is held as a temporary copy at
+    a time.
+    """
+    def get_index(value: int) -> tuple:
+        return _get_local_value_index(state_tensor.ndim, axes, value)
+
+    for cycle in cycles:
+        first_slice = np.array(state_tensor[get_index(cycle[0])])
+        for value, next_value in zip(cycle[:-1], cycle[1:]):
+            state_tensor[get_index(value)] = \
+                state_tensor[get_index(next_value)]
+        state_tensor[get_index(cycle[-1])] = first_slice
+
+    return state_tensor
+
+
+def _swap_axes_in_slice(
+        state_tensor: np.ndarray,
+        control_index: tuple,
+        axis_0: int,
+        axis_1: int,
+        is_iswap: bool = False) -> np.ndarray:
+    """Exchanges the two axes of the slice of the state tensor selected by
+    control_index, in place. For iswap, the amplitudes where the two axes
+    differ are multiplied by 1j.
+    """
+    sliced_state_tensor = np.swapaxes(
+        state_tensor[control_index], axis_0, axis_1).copy()
+    if is_iswap:
+        for value_0, value_1 in ((0, 1), (1, 0)):
+            index = _get_control_index(
+                sliced_state_tensor.ndim,
+                [axis_0, axis_1],
+                [value_0, value_1]
+            )
+            sliced_state_tensor[index] *= 1j
+    state_tensor[control_index] = sliced_state_tensor
+
+    return state_tensor
+
+
+def _diagnostic_initial_state_vector(
+        initial_state_vector: np.ndarray,
+        num_qubit: int) -> None:
+    """Checks that the initial state vector is either a single vector of
+    shape (2**num_qubit,) or a batch of B vectors of shape (2**num_qubit, B)
+    or (B, 2**num_qubit).
+    """
+    if not isinstance(initial_state_vector, np.ndarray):
+        raise StateVectorCircuitError(
+            'type of initial state vector must be numpy.ndarray.'
+        )
+
+    dim = 2**num_qubit
+    if initial_state_vector.shape != (dim,) \
+            and not (initial_state_vector.ndim == 2
+                     and dim in initial_state_vector.shape):
+        raise StateVectorCircuitError(
+            "shape of initial state vector is invalid. It must be "
+            "(2**num_qubit,), (2**num_qubit, B) or (B, 2**num_qubit)."
+        )
+
+
+def _is_row_batch(initial_state_vector: np.ndarray, num_qubit: int) -> bool:
+    """Returns True if the batch of initial state vectors is given as rows,
+    i.e. of shape (B, 2**num_qubit). A square batch is taken as columns.
+    """
+    return initial_state_vector.ndim == 2 \
+        and initial_state_vector.shape[0] != 2**num_qubit
+
+
+def _get_read_only_array(
+        array: np.ndarray,
+        dtype: type = None) -> np.ndarray:
+    """Returns a read-only view of the array, which is cast to dtype if
+    given.
+    """
+    array = np.asarray(array, dtype=dtype).view()
+    array.setflags(write=False)
+
+    return array
+
+
+def _get_dtype(precision: str) -> type:
+    """Returns the complex dtype of the precision."""
+    if precision not in _PRECISIONS:
+        raise StateVectorCircuitError(
+            f"precision must be one of {list(_PRECISIONS)}."
+        )
+
+    return _PRECISIONS[precision]
+
+
+def _get_fingerprint(value):
+    """Returns a hashable snapshot of a gate or of its values, which differs
+    whenever the value is modified in place.
+    """
+    if isinstance(value, dict):
+        return tuple((key, _get_fingerprint(item))
+                     for key, item in sorted(value.items()))
+
+    if isinstance(value, (list, tuple)):
+        return tuple(_get_fingerprint(item) for item in value)
+
+    if isinstance(value, np.ndarray):
+        return (value.dtype.str, value.shape, value.tobytes())
+
+    return value
 
 
 class StateVectorCircuit(QuantestPyCircuit):
@@ -75,6 +484,16 @@ class StateVectorCircuit(QuantestPyCircuit):
         self._from_right_to_left_for_qubit_ids = False
         self._binary_to_vector = None
         self._initial_state_vector = None
+        self._fuse_single_qubit_gates = True
+        self._max_block_fusion_qubits = None
+        self._fusion_report = None
+        self._precision = "complex128"
+        self._memmap_dir = None
+        self._memmap_chunk_size = _MEMMAP_CHUNK_SIZE
+        self._num_workers = 1
+        self._backend = "thread"
+        self._state_vector_cache = None
+        self._whole_gates_cache = None
 
     def _diagnostic_gate(self, gate: dict) -> None:
         """Override"""
@@ -85,41 +504,47 @@ class StateVectorCircuit(QuantestPyCircuit):
                 "gate must contain 'parameter' as a key."
             )
 
-        if gate["name"] not in _IMPLEMENTED_GATES:
+        if gate["name"] not in _GATE_REGISTRY:
             raise StateVectorCircuitError(
                 f'{gate["name"]} is not implemented.'
-                f'Implemented gates: {_IMPLEMENTED_GATES}'
+                f'Implemented gates: {list(_GATE_REGISTRY)}'
             )
 
-        if gate["name"] in _IMPLEMENTED_GATES_WITHOUT_PARAM and \
-                len(gate["parameter"]) != 0:
+        num_param = _GATE_REGISTRY[gate["name"]]["num_param"]
+        if num_param == 0 and len(gate["parameter"]) != 0:
             raise StateVectorCircuitError(
                 f'{gate["name"]} gate must have an empty list for '
                 "'parameter'."
             )
 
-        if gate["name"] in _IMPLEMENTED_GATES_WITH_ONE_PARAM and \
-                len(gate["parameter"]) != 1:
+        if num_param == 1 and len(gate["parameter"]) != 1:
             raise StateVectorCircuitError(
                 f'{gate["name"]} gate must have a list containing '
                 "exactly 1 element for 'parameter'."
             )
 
-        if gate["name"] in _IMPLEMENTED_GATES_WITH_FOUR_PARAM and \
-                len(gate["parameter"]) != 4:
+        if num_param > 1 and len(gate["parameter"]) != num_param:
             raise StateVectorCircuitError(
                 f'{gate["name"]} gate must have a list containing '
-                "exactly 4 elements for 'parameter'."
+                f"exactly {num_param} elements for 'parameter'."
             )
 
-        if gate["name"] in _IMPLEMENTED_GATES_WITH_PARAM:
+        if num_param > 0:
             for param in gate["parameter"]:
-                if not isinstance(param, float) and not isinstance(param, int):
+                if not isinstance(param, (float, int, str)):
                     raise StateVectorCircuitError(
                         f'Parameter(s) in {gate["name"]} gate must be '
-                        'float or integer type.'
+                        'float or integer type, or str as the name of the '
+                        'parameter.'
                     )
 
+        num_target = _GATE_REGISTRY[gate["name"]]["num_target"]
+        if num_target > 1 and len(gate["target_qubit"]) != num_target:
+            raise StateVectorCircuitError(
+                f'{gate["name"]} gate must have a list containing '
+                f"exactly {num_target} elements for 'target_qubit'."
+            )
+
     def _create_all_qubit_gate_from_original_qubit_gate(
             self,
             gate: np.ndarray,
@@ -127,171 +552,1690 @@ class StateVectorCircuit(QuantestPyCircuit):
             target_qubit: list,
             control_value: list) -> np.ndarray:
 
-        all_qubit_gate = np.zeros((2**self._num_qubit, 2**self._num_qubit))
-        bit_patterns_for_control_qubit = list(
-            itertools.product([0, 1], repeat=len(control_qubit)))
-        for bit_pattern in bit_patterns_for_control_qubit:
-            term = 1
-            for i in range(self._num_qubit):
-                if i in control_qubit:
-                    if bit_pattern[control_qubit.index(i)] == 0:
-                        # |0><0|
-                        if self._from_right_to_left_for_qubit_ids:
-                            term = np.kron(np.array([[1, 0], [0, 0]]), term)
-                        else:
-                            term = np.kron(term, np.array([[1, 0], [0, 0]]))
-                    else:
-                        # |1><1|
-                        if self._from_right_to_left_for_qubit_ids:
-                            term = np.kron(np.array([[0, 0], [0, 1]]), term)
-                        else:
-                            term = np.kron(term, np.array([[0, 0], [0, 1]]))
-                elif i in target_qubit:
-                    if list(bit_pattern) == control_value:
-                        if self._from_right_to_left_for_qubit_ids:
-                            term = np.kron(gate, term)
-                        else:
-                            term = np.kron(term, gate)
-                    else:
-                        if self._from_right_to_left_for_qubit_ids:
-                            term = np.kron(_ID, term)
-                        else:
-                            term = np.kron(term, _ID)
-                else:
-                    if self._from_right_to_left_for_qubit_ids:
-                        term = np.kron(_ID, term)
-                    else:
-                        term = np.kron(term, _ID)
-            all_qubit_gate = all_qubit_gate + term
+        # operator as a tensor with (2,)*num_qubit row axes followed by
+        # (2,)*num_qubit column axes
+        all_qubit_gate = np.eye(2**self._num_qubit, dtype=complex)
+        all_qubit_tensor = np.reshape(
+            all_qubit_gate, (2,)*(2*self._num_qubit))
+
+        # only the block where the control qubits take control_value in
+        # both rows and columns differs from identity
+        control_axes = [self._get_axis(qubit) for qubit in control_qubit]
+        control_index = _get_control_index(
+            2*self._num_qubit,
+            control_axes + [self._num_qubit + axis for axis in control_axes],
+            control_value + control_value
+        )
+        block = all_qubit_tensor[control_index]
+        for axis in _get_axes_in_slice(
+                [self._get_axis(qubit) for qubit in target_qubit],
+                control_axes):
+            block = _apply_matrix_to_axes(block, gate, [axis])
+        all_qubit_tensor[control_index] = block
 
         return all_qubit_gate
 
+    def _get_axis(self, qubit: int) -> int:
+        """Returns the axis of the state tensor which corresponds to the
+        qubit, taking the order of qubit ids into account.
+        """
+        if self._from_right_to_left_for_qubit_ids:
+            return self._num_qubit - 1 - qubit
+        else:
+            return qubit
+
+    def _apply_swap_gate_to_state_tensor(
+            self,
+            state_tensor: np.ndarray,
+            control_qubit: list,
+            target_qubit: list,
+            control_value: list,
+            is_iswap: bool = False) -> np.ndarray:
+        """Applies a (controlled) swap or iswap gate to the state tensor by
+        exchanging the axes of the two target qubits in the slice where the
+        control qubits take control_value. For iswap, the amplitudes where
+        the two target qubits differ are multiplied by 1j.
+        """
+        control_axes = [self._get_axis(qubit) for qubit in control_qubit]
+        control_index = _get_control_index(
+            state_tensor.ndim, control_axes, control_value)
+        axis_0, axis_1 = _get_axes_in_slice(
+            [self._get_axis(qubit) for qubit in target_qubit], control_axes)
+
+        return _swap_axes_in_slice(
+            state_tensor, control_index, axis_0, axis_1, is_iswap)
+
+    def _apply_diagonal_gate_to_state_tensor(
+            self,
+            state_tensor: np.ndarray,
+            gate: dict) -> np.ndarray:
+        """Multiplies the diagonal elements of the (controlled) diagonal
+        gate to the slice of the state tensor where the control qubits take
+        control_value, in place.
+        """
+        diagonal = np.diagonal(self._get_original_qubit_gate(gate))
+        control_axes = [self._get_axis(qubit)
+                        for qubit in gate["control_qubit"]]
+        control_index = _get_control_index(
+            state_tensor.ndim, control_axes, gate["control_value"])
+        sliced_state_tensor = state_tensor[control_index]
+        target_axes = _get_axes_in_slice(
+            [self._get_axis(qubit) for qubit in gate["target_qubit"]],
+            control_axes)
+        if len(diagonal) == 2:
+            # applied to each target qubit
+            axes_groups = [[axis] for axis in target_axes]
+        else:
+            axes_groups = [target_axes]
+
+        for axes in axes_groups:
+            # order the diagonal in the same way as the axes
+            diagonal_tensor = np.transpose(
+                np.reshape(diagonal, (2,)*len(axes)), np.argsort(axes))
+            shape = [1] * sliced_state_tensor.ndim
+            for axis in axes:
+                shape[axis] = 2
+            sliced_state_tensor *= np.reshape(diagonal_tensor, shape)
+
+        return state_tensor
+
+    def _apply_permutation_gate_to_state_tensor(
+            self,
+            state_tensor: np.ndarray,
+            gate: dict) -> np.ndarray:
+        """Applies the (controlled) permutation gate to the state tensor as
+        a pure permutation of its elements, i.e. by flipping (x) or
+        exchanging (swap) the target axes in the slice where the control
+        qubits take control_value.
+        """
+        if gate["name"] == "swap":
+            return self._apply_swap_gate_to_state_tensor(
+                state_tensor,
+                gate["control_qubit"],
+                gate["target_qubit"],
+                gate["control_value"]
+            )
+
+        control_axes = [self._get_axis(qubit)
+                        for qubit in gate["control_qubit"]]
+        control_index = _get_control_index(
+            state_tensor.ndim, control_axes, gate["control_value"])
+        target_axes = _get_axes_in_slice(
+            [self._get_axis(qubit) for qubit in gate["target_qubit"]],
+            control_axes)
+        matrix = self._get_original_qubit_gate(gate)
+        if len(matrix) == 2:
+            state_tensor[control_index] = np.flip(
+                state_tensor[control_index], axis=tuple(target_axes)).copy()
+        else:
+            # the real 0/1 matrix keeps the dtype of index tensors
+            state_tensor[control_index] = _apply_matrix_to_axes(
+                state_tensor[control_index],
+                np.real(matrix).astype(state_tensor.dtype),
+                target_axes
+            )
+
+        return state_tensor
+
+    def _get_gate_kind(self, gate: dict) -> str:
+        """Returns "phase" for diagonal gates, "permutation" for
+        permutation gates and "gate" otherwise. The kind of a fused gate is
+        determined from its matrix. Gates with named parameters are "gate",
+        as their matrices are not known until the parameters are bound.
+        """
+        if gate["name"] == "fused":
+            matrix = gate["matrix"]
+            if matrix[0, 1] == 0 and matrix[1, 0] == 0:
+                return "phase"
+            elif np.array_equal(matrix, _X):
+                return "permutation"
+            return "gate"
+
+        elif gate["name"] == "block" or _is_parametric_gate(gate):
+            return "gate"
+
+        if _GATE_REGISTRY[gate["name"]]["is_diagonal"]:
+            return "phase"
+        elif _GATE_REGISTRY[gate["name"]]["is_permutation"]:
+            return "permutation"
+        return "gate"
+
+    def _is_single_qubit_gate(self, gate: dict) -> bool:
+        """Returns True if the gate applies a 2x2 matrix to each target."""
+        return gate["name"] == "fused" or (
+            gate["name"] in _GATE_REGISTRY
+            and _GATE_REGISTRY[gate["name"]]["num_target"] == 1)
+
+    def _fuse_gates_on_single_qubit(self, gates: list) -> list:
+        """Multiplies consecutive single qubit gates acting on the same
+        target qubit with the same control qubits and control values into
+        one 2x2 matrix, given as a gate of name "fused" with the key
+        "matrix". A gate is fused into an earlier one only if no gate in
+        between acts on any of their qubits. Gates with named parameters are
+        not fused.
+        """
+        fused_gates = []
+        last_gate_idx_on_qubit = {}
+        for gate in gates:
+            if not self._is_single_qubit_gate(gate):
+                split_gates = [gate]
+            else:
+                # a single qubit gate with several targets is the product
+                # of the gates on each target
+                split_gates = [dict(gate, target_qubit=[qubit])
+                               for qubit in gate["target_qubit"]]
+
+            for split_gate in split_gates:
+                qubits = split_gate["control_qubit"] \
+                    + split_gate["target_qubit"]
+                last_gate_idxs = set(
+                    last_gate_idx_on_qubit.get(qubit) for qubit in qubits)
+
+                if self._is_single_qubit_gate(split_gate) \
+                        and not _is_parametric_gate(split_gate) \
+                        and len(last_gate_idxs) == 1:
+                    idx = last_gate_idxs.pop()
+                    last_gate = None if idx is None else fused_gates[idx]
+                    if last_gate is not None \
+                            and self._is_single_qubit_gate(last_gate) \
+                            and not _is_parametric_gate(last_gate) \
+                            and last_gate["target_qubit"] \
+                            == split_gate["target_qubit"] \
+                            and sorted(zip(last_gate["control_qubit"],
+                                           last_gate["control_value"])) \
+                            == sorted(zip(split_gate["control_qubit"],
+                                          split_gate["control_value"])):
+                        fused_gates[idx] = dict(
+                            last_gate,
+                            name="fused",
+                            parameter=[],
+                            matrix=np.matmul(
+                                self._get_original_qubit_gate(split_gate),
+                                self._get_original_qubit_gate(last_gate))
+                        )
+                        continue
+
+                fused_gates.append(split_gate)
+                for qubit in qubits:
+                    last_gate_idx_on_qubit[qubit] = len(fused_gates) - 1
+
+        return fused_gates
+
+    def _get_block_matrix(self, qubits: list, gates: list) -> np.ndarray:
+        """Returns the 2**len(qubits) x 2**len(qubits) matrix of the gates,
+        which act only on the qubits. The first qubit in qubits corresponds
+        to the most significant bit of the matrix indices.
+        """
+        local_qubit = {qubit: idx for idx, qubit in enumerate(qubits)}
+        local_circuit = StateVectorCircuit(len(qubits))
+        local_circuit._fuse_single_qubit_gates = False
+        for gate in gates:
+            local_circuit._gates.append(dict(
+                gate,
+                target_qubit=[local_qubit[q] for q in gate["target_qubit"]],
+                control_qubit=[local_qubit[q] for q in gate["control_qubit"]]
+            ))
+
+        return local_circuit._get_whole_gates()
+
+    def _fuse_gates_into_blocks(
+            self,
+            gates: list,
+            max_block_qubits: int) -> list:
+        """Greedily groups neighbouring gates which act on at most
+        max_block_qubits qubits in total into one dense block, given as a
+        gate of name "block" with the key "matrix". Gates acting on more
+        qubits and gates with named parameters are left as they are.
+        """
+        def _get_block_gate(block: dict) -> dict:
+            if len(block["gates"]) == 1:
+                return block["gates"][0]
+
+            qubits = sorted(block["qubits"])
+            return {"name": "block",
+                    "target_qubit": qubits,
+                    "control_qubit": [],
+                    "control_value": [],
+                    "parameter": [],
+                    "matrix": self._get_block_matrix(qubits, block["gates"])}
+
+        fused_gates = []
+        open_blocks = []
+        for gate in gates:
+            qubits = set(gate["control_qubit"] + gate["target_qubit"])
+            intersecting_blocks = [block for block in open_blocks
+                                   if block["qubits"] & qubits]
+            if len(qubits) > max_block_qubits or _is_parametric_gate(gate):
+                for block in intersecting_blocks:
+                    fused_gates.append(_get_block_gate(block))
+                    open_blocks.remove(block)
+                fused_gates.append(gate)
+                continue
+
+            # the open blocks act on disjoint qubits and commute with each
+            # other. The smaller intersecting blocks are merged with the
+            # gate as long as it fits, and the others are closed.
+            merged_qubits = qubits
+            merged_gates = []
+            for block in sorted(intersecting_blocks,
+                                key=lambda block: len(block["qubits"])):
+                open_blocks.remove(block)
+                if len(merged_qubits | block["qubits"]) <= max_block_qubits:
+                    merged_qubits = merged_qubits | block["qubits"]
+                    merged_gates += block["gates"]
+                else:
+                    fused_gates.append(_get_block_gate(block))
+            open_blocks.append({"qubits": merged_qubits,
+                                "gates": merged_gates + [gate]})
+
+        for block in open_blocks:
+            fused_gates.append(_get_block_gate(block))
+
+        return fused_gates
+
+    def _optimize_gates(self,) -> list:
+        """Returns the gates to be simulated. If _fuse_single_qubit_gates is
+        True, single qubit gates are fused. If _max_block_fusion_qubits is
+        given, neighbouring gates acting on at most that number of qubits
+        are further fused into dense blocks, unless the state is kept in a
+        memory-mapped file by _memmap_dir, where a block would be
+        contracted with whole chunks in memory. The numbers of gates before
+        and after the fusion are stored in _fusion_report.
+        """
+        gates = self._gates
+        if self._fuse_single_qubit_gates:
+            gates = self._fuse_gates_on_single_qubit(gates)
+
+        if self._max_block_fusion_qubits is not None \
+                and self._memmap_dir is None:
+            gates = self._fuse_gates_into_blocks(
+                gates, self._max_block_fusion_qubits)
+
+        self._fusion_report = {
+            "num_gates_before": len(self._gates),
+            "num_gates_after": len(gates)
+        }
+
+        return gates
+
+    def _merge_gates(
+            self,
+            gates: list,
+            max_merged_qubits: int = _MAX_MERGED_QUBITS):
+        """Yields the gates in order as pairs of (kind, operand).
+
+        Each run of consecutive diagonal gates acting on at most
+        max_merged_qubits qubits in total is merged into a single local
+        phase tensor of shape (2,)*k over the k axes of those qubits, which
+        is the product of their diagonals, and is yielded as
+        ("phase", (phase_tensor, axes)).
+
+        Each run of consecutive permutation gates acting on at most
+        max_merged_qubits qubits in total is merged into a single local
+        index tensor of shape (2,)*k, where the gates have been applied to
+        the indices of the 2**k local values of the axes, and is yielded as
+        ("permutation", (index_tensor, axes)).
+
+        The axes are in ascending order. A single qubit gate with several
+        targets is merged target by target. A run of a single controlled
+        diagonal gate is not merged, so that its phases are multiplied only
+        to the slice where the control qubits take the control values. The
+        other gates, including diagonal and permutation gates acting on
+        more than max_merged_qubits qubits, are yielded as ("gate", gate).
+        """
+        def _get_merged_operand(run: dict) -> tuple:
+            if run["kind"] == "phase" and len(run["gates"]) == 1 \
+                    and len(run["gates"][0]["control_qubit"]) > 0:
+                return "gate", run["gates"][0]
+
+            axes = sorted(self._get_axis(qubit) for qubit in run["qubits"])
+            local_circuit = StateVectorCircuit(len(axes))
+            local_qubit = {qubit: axes.index(self._get_axis(qubit))
+                           for qubit in run["qubits"]}
+            if run["kind"] == "phase":
+                merged_tensor = np.ones((2,)*len(axes), dtype=complex)
+            else:
+                merged_tensor = np.reshape(
+                    np.arange(2**len(axes)), (2,)*len(axes))
+
+            for gate in run["gates"]:
+                local_gate = dict(
+                    gate,
+                    target_qubit=[local_qubit[q]
+                                  for q in gate["target_qubit"]],
+                    control_qubit=[local_qubit[q]
+                                   for q in gate["control_qubit"]])
+                if run["kind"] == "phase":
+                    local_circuit._apply_diagonal_gate_to_state_tensor(
+                        merged_tensor, local_gate)
+                else:
+                    merged_tensor = local_circuit \
+                        ._apply_permutation_gate_to_state_tensor(
+                            merged_tensor, local_gate)
+
+            return run["kind"], (merged_tensor, tuple(axes))
+
+        run = None
+        for gate in gates:
+            kind = self._get_gate_kind(gate)
+            if kind == "gate":
+                split_gates = [gate]
+            elif self._is_single_qubit_gate(gate):
+                split_gates = [dict(gate, target_qubit=[qubit])
+                               for qubit in gate["target_qubit"]]
+            else:
+                split_gates = [gate]
+
+            for split_gate in split_gates:
+                qubits = set(split_gate["control_qubit"]
+                             + split_gate["target_qubit"])
+                if run is not None and (
+                        run["kind"] != kind
+                        or len(run["qubits"] | qubits) > max_merged_qubits):
+                    yield _get_merged_operand(run)
+                    run = None
+
+                if kind == "gate" or len(qubits) > max_merged_qubits:
+                    yield "gate", split_gate
+                    continue
+
+                if run is None:
+                    run = {"kind": kind, "qubits": set(), "gates": []}
+                run["qubits"] |= qubits
+                run["gates"].append(split_gate)
+
+        if run is not None:
+            yield _get_merged_operand(run)
+
+    def _compile_operation(self, kind: str, operand) -> tuple:
+        """Resolves one of the pairs yielded by _merge_gates into an
+        operation of StateVectorCircuitPlan, i.e. a tuple whose first
+        element is the kernel kind and whose other elements are the
+        read-only matrix or tensor and the precomputed index and axes:
+
+        ("phase", phase_tensor, control_index, axes)
+        ("permutation", cycles, axes)
+        ("single", matrix, control_index, target_axes)
+        ("swap", control_index, axis_0, axis_1, is_iswap)
+        ("matrix", matrix, control_index, target_axes)
+        ("parametric", name, parameter, control_index, target_axes)
+
+        The parametric operations hold the gates with named parameters and
+        are resolved into single or matrix operations by
+        StateVectorCircuitPlan.bind_parameters.
+
+        The phase and permutation operations act on the local values of
+        the ascending axes, where the cycles are those of
+        _get_permutation_cycles. The control index selects the slice of the
+        leading (2,)*num_qubit axes and keeps any trailing axes. It is None
+        for blocks and merged runs of diagonal gates, which have no control
+        qubits. The matrices and tensors are cast to the dtype of
+        _precision.
+        """
+        dtype = _get_dtype(self._precision)
+        if kind == "phase":
+            phase_tensor, axes = operand
+            return ("phase", _get_read_only_array(phase_tensor, dtype), None,
+                    axes)
+
+        elif kind == "permutation":
+            index_tensor, axes = operand
+            return ("permutation", _get_permutation_cycles(index_tensor), axes)
+
+        gate = operand
+        if gate["name"] == "block":
+            return (
+                "matrix",
+                _get_read_only_array(gate["matrix"], dtype),
+                None,
+                tuple(self._get_axis(qubit) for qubit in gate["target_qubit"])
+            )
+
+        control_axes = [self._get_axis(qubit)
+                        for qubit in gate["control_qubit"]]
+        control_index = _get_control_index(
+            self._num_qubit, control_axes, gate["control_value"]) \
+            + (Ellipsis,)
+        target_axes = tuple(_get_axes_in_slice(
+            [self._get_axis(qubit) for qubit in gate["target_qubit"]],
+            control_axes))
+
+        if gate["name"] in ("swap", "iswap"):
+            return ("swap", control_index) + target_axes \
+                + (gate["name"] == "iswap",)
+
+        if _is_parametric_gate(gate):
+            return ("parametric", gate["name"], tuple(gate["parameter"]),
+                    control_index, target_axes)
+
+        if self._get_gate_kind(gate) == "phase":
+            # the diagonal over the ascending target axes of the slice
+            axes = sorted(target_axes)
+            local_circuit = StateVectorCircuit(len(axes))
+            phase_tensor = np.ones((2,)*len(axes), dtype=complex)
+            local_circuit._apply_diagonal_gate_to_state_tensor(
+                phase_tensor,
+                dict(gate,
+                     target_qubit=[axes.index(axis) for axis in target_axes],
+                     control_qubit=[],
+                     control_value=[]))
+            return ("phase", _get_read_only_array(phase_tensor, dtype),
+                    control_index, tuple(axes))
+
+        matrix = _get_read_only_array(
+            self._get_original_qubit_gate(gate), dtype)
+        if self._is_single_qubit_gate(gate):
+            return ("single", matrix, control_index, target_axes)
+
+        return ("matrix", matrix, control_index, target_axes)
+
+    def compile(self,) -> "StateVectorCircuitPlan":
+        """Returns an immutable execution plan of the circuit. The gates are
+        optimized and merged, their matrices are resolved and the axes and
+        indices to which they apply are precomputed once, so that the plan
+        can be executed many times against different initial states. The
+        plan simulates in the precision given by _precision, either
+        "complex64" or "complex128".
+
+        If _memmap_dir is given, the plan keeps the state in a memory-mapped
+        file in that directory and streams through it in chunks of at most
+        _memmap_chunk_size elements. The gates are then not fused into
+        blocks, and the merged runs of diagonal or permutation gates act on
+        no more qubits than a chunk has.
+
+        If _num_workers is larger than 1, the plan applies each operation
+        to disjoint chunks of the state in a pool of that many workers,
+        which are threads or processes sharing the state in shared memory
+        as given by _backend.
+        """
+        max_merged_qubits = _MAX_MERGED_QUBITS
+        if self._memmap_dir is not None:
+            max_merged_qubits = min(
+                max_merged_qubits,
+                max(1, self._memmap_chunk_size.bit_length() - 1))
+
+        operations = [
+            self._compile_operation(kind, operand)
+            for kind, operand
+            in self._merge_gates(self._optimize_gates(), max_merged_qubits)]
+
+        return StateVectorCircuitPlan(
+            self._num_qubit,
+            operations,
+            self._from_right_to_left_for_qubit_ids,
+            precision=self._precision,
+            memmap_dir=self._memmap_dir,
+            memmap_chunk_size=self._memmap_chunk_size,
+            num_workers=self._num_workers,
+            backend=self._backend
+        )
+
     def set_initial_state_vector(self, initial_state_vector: np.ndarray) \
             -> None:
+        """Sets the initial state vector of shape (2**num_qubit,), or a
+        batch of B initial state vectors of shape (2**num_qubit, B) or
+        (B, 2**num_qubit), which are evolved at once.
+        """
+        _diagnostic_initial_state_vector(initial_state_vector, self._num_qubit)
 
-        if not isinstance(initial_state_vector, np.ndarray):
-            raise StateVectorCircuitError(
-                'type of initial state vector must be numpy.ndarray.'
-            )
+        self._initial_state_vector = initial_state_vector
+
+    def _get_cache_settings(self,) -> tuple:
+        """Returns the settings on which the simulated state vector and
+        operator depend besides the gates and the initial state vector.
+        """
+        return (self._from_right_to_left_for_qubit_ids,
+                self._fuse_single_qubit_gates,
+                self._max_block_fusion_qubits,
+                self._precision,
+                self._num_workers,
+                self._backend)
+
+    def _get_num_cached_gates(
+            self,
+            cache: dict,
+            fingerprints: list,
+            initial_state_vector: np.ndarray = None) -> int:
+        """Returns the number of leading gates covered by the cache, or None
+        if the cache is invalid, i.e. the settings or the initial state
+        vector have changed, or the fingerprint of any of the cached gates
+        has changed or been removed.
+        """
+        if cache is None or cache["settings"] != self._get_cache_settings():
+            return None
+
+        if initial_state_vector is not None and not np.array_equal(
+                cache["initial_state_vector"], initial_state_vector):
+            return None
+
+        num_gates = len(cache["fingerprints"])
+        if cache["fingerprints"] != fingerprints[:num_gates]:
+            return None
+
+        return num_gates
+
+    def _get_cache(
+            self,
+            result: np.ndarray,
+            fingerprints: list,
+            initial_state_vector: np.ndarray = None) -> dict:
+        """Returns the cache of the result of all the gates, holding the
+        fingerprints of the gates and a copy of the initial state vector to
+        detect changes.
+        """
+        return {"settings": self._get_cache_settings(),
+                "fingerprints": fingerprints,
+                "initial_state_vector": None if initial_state_vector is None
+                else np.array(initial_state_vector),
+                "result": np.array(result)}
 
-        if initial_state_vector.shape != (2**self._num_qubit,):
+    def _compile_gates_from(
+            self,
+            start: int,
+            stop: int = None) -> "StateVectorCircuitPlan":
+        """Returns the plan of the gates from the start-th one on, up to
+        but not including the stop-th one if given.
+        """
+        circuit = copy.copy(self)
+        circuit._gates = self._gates[start:stop]
+
+        return circuit.compile()
+
+    def get_snapshots(
+            self,
+            gate_indices: list,
+            storage_precision: str = None,
+            threshold: float = None) -> "StateVectorSnapshots":
+        """Returns the snapshots of the state vector after the first i gates
+        for each i in gate_indices, recorded in a single pass from the
+        initial state vector. The gates between two snapshots are compiled
+        together, so that no gates are fused across a snapshot.
+
+        The snapshots are stored in storage_precision, "complex64" or
+        "complex128", which is the precision of the circuit if None. If
+        threshold is given, only the amplitudes whose absolute values are
+        larger than threshold are stored.
+        """
+        if not isinstance(gate_indices, list) or not all(
+                isinstance(index, int)
+                and 0 <= index <= len(self._gates)
+                for index in gate_indices):
             raise StateVectorCircuitError(
-                "shape of initial state vector is invalid. It must be "
-                "(2**num_qubit,)."
+                "gate_indices must be a list of integers from 0 to the "
+                "number of gates."
             )
 
-        self._initial_state_vector = initial_state_vector
+        if storage_precision is None:
+            storage_precision = self._precision
+        storage_dtype = _get_dtype(storage_precision)
 
-    def _get_state_vector(self,) -> np.ndarray:
+        initial_state_vector = self._initial_state_vector
+        if initial_state_vector is None:
+            initial_state_vector = np.zeros(2**self._num_qubit)
+            initial_state_vector[0] = 1.
+        _diagnostic_initial_state_vector(initial_state_vector, self._num_qubit)
+
+        is_row_batch = _is_row_batch(initial_state_vector, self._num_qubit)
+        if is_row_batch:
+            initial_state_vector = initial_state_vector.T
+        batch_shape = initial_state_vector.shape[1:]
+
+        state_tensor = np.reshape(
+            np.array(initial_state_vector, dtype=_get_dtype(self._precision),
+                     order="C"),
+            (2,)*self._num_qubit + batch_shape)
+
+        snapshots = {}
+        start = 0
+        for stop in sorted(set(gate_indices)):
+            state_tensor = self._compile_gates_from(start, stop) \
+                ._evolve_state_tensor(state_tensor)
+            state_vec = np.reshape(
+                state_tensor, (2**self._num_qubit,) + batch_shape)
+
+            if threshold is None:
+                snapshots[stop] = np.array(state_vec, dtype=storage_dtype)
+            else:
+                # flat indices and values of the large amplitudes
+                flat_indices = np.flatnonzero(np.abs(state_vec) > threshold)
+                snapshots[stop] = (
+                    flat_indices,
+                    np.array(np.ravel(state_vec)[flat_indices],
+                             dtype=storage_dtype))
+            start = stop
 
+        return StateVectorSnapshots(
+            self._num_qubit,
+            snapshots,
+            self._from_right_to_left_for_qubit_ids,
+            batch_shape,
+            is_row_batch,
+            storage_precision
+        )
+
+    def _get_state_vector(self,) -> np.ndarray:
+        """Returns the state vector obtained by applying the gates to the
+        initial state vector. The result is cached together with the gates
+        it covers, so that only the gates appended since the last call are
+        applied to the cached state vector. Any change of the cached gates,
+        the initial state vector or the settings invalidates the cache. The
+        cache is not used with _memmap_dir, which keeps the state out of
+        memory.
+        """
         # initialize state vector if not given
         if self._initial_state_vector is None:
-            state_vec = [1.+0j, 0.+0j]
-            state_vec += [0 for _ in range(2**self._num_qubit-2)]
-            self._initial_state_vector = np.array(state_vec)
+            state_vec = np.zeros(
+                2**self._num_qubit, dtype=_get_dtype(self._precision))
+            state_vec[0] = 1.
+            self._initial_state_vector = state_vec
+
+        if self._memmap_dir is not None:
+            return self.compile().get_state_vector(self._initial_state_vector)
 
-        whole_gates = self._get_whole_gates()
-        state_vec = np.matmul(whole_gates, self._initial_state_vector)
+        fingerprints = [_get_fingerprint(gate) for gate in self._gates]
+        num_cached_gates = self._get_num_cached_gates(
+            self._state_vector_cache, fingerprints,
+            self._initial_state_vector)
+        if num_cached_gates is None:
+            state_vec = self.compile().get_state_vector(
+                self._initial_state_vector)
+        else:
+            state_vec = self._compile_gates_from(num_cached_gates) \
+                .get_state_vector(self._state_vector_cache["result"])
+
+        self._state_vector_cache = self._get_cache(
+            state_vec, fingerprints, self._initial_state_vector)
 
         return state_vec
 
+    def _get_original_qubit_gate(self, gate: dict) -> np.ndarray:
+        """Returns the matrix of the gate, which is applied to each target
+        qubit for single qubit gates.
+        """
+        if gate["name"] in ("fused", "block"):
+            return gate["matrix"]
+
+        return _get_gate_matrix(gate["name"], gate["parameter"])
+
     def _get_whole_gates(self,) -> np.ndarray:
+        """Returns the operator of the circuit. As for the state vector, the
+        operator is cached, and the gates appended since the last call are
+        applied to the columns of the cached operator. An operator of more
+        elements than a memory-mapped chunk, _MEMMAP_CHUNK_SIZE, is not
+        cached, so that its copy is not held in memory.
+        """
+        if self._memmap_dir is not None:
+            return self.compile().get_whole_gates()
 
-        # initialize circuit operator
-        whole_gates = np.eye(2**self._num_qubit)
-
-        # apply each gate to state vector
-        for gate in self._gates:
-            if gate["name"] == "swap":
-                all_qubit_gate1 = \
-                    self._create_all_qubit_gate_from_original_qubit_gate(
-                        _X,
-                        gate["target_qubit"][1:],
-                        gate["target_qubit"][:1],
-                        [1]
-                    )
-                all_qubit_gate2 = \
-                    self._create_all_qubit_gate_from_original_qubit_gate(
-                        _X,
-                        gate["control_qubit"] + gate["target_qubit"][:1],
-                        gate["target_qubit"][1:],
-                        gate["control_value"] + [1]
-                    )
-                whole_gates = np.matmul(all_qubit_gate1, whole_gates)
-                whole_gates = np.matmul(all_qubit_gate2, whole_gates)
-                whole_gates = np.matmul(all_qubit_gate1, whole_gates)
-            elif gate["name"] == "iswap":
-                all_qubit_gate1 = \
-                    self._create_all_qubit_gate_from_original_qubit_gate(
-                        _S,
-                        gate["control_qubit"],
-                        gate["target_qubit"][:1],
-                        gate["control_value"]
-                    )
-                all_qubit_gate2 = \
-                    self._create_all_qubit_gate_from_original_qubit_gate(
-                        _S,
-                        gate["control_qubit"],
-                        gate["target_qubit"][1:],
-                        gate["control_value"]
-                    )
-                all_qubit_gate3 = \
-                    self._create_all_qubit_gate_from_original_qubit_gate(
-                        _H,
-                        gate["control_qubit"],
-                        gate["target_qubit"][:1],
-                        gate["control_value"]
-                    )
-                all_qubit_gate4 = \
-                    self._create_all_qubit_gate_from_original_qubit_gate(
-                        _X,
-                        gate["control_qubit"] + gate["target_qubit"][:1],
-                        gate["target_qubit"][1:],
-                        gate["control_value"] + [1]
-                    )
-                all_qubit_gate5 = \
-                    self._create_all_qubit_gate_from_original_qubit_gate(
-                        _X,
-                        gate["control_qubit"] + gate["target_qubit"][1:],
-                        gate["target_qubit"][:1],
-                        gate["control_value"] + [1]
-                    )
-                all_qubit_gate6 = \
-                    self._create_all_qubit_gate_from_original_qubit_gate(
-                        _H,
-                        gate["control_qubit"],
-                        gate["target_qubit"][1:],
-                        gate["control_value"]
-                    )
-                whole_gates = np.matmul(all_qubit_gate1, whole_gates)
-                whole_gates = np.matmul(all_qubit_gate2, whole_gates)
-                whole_gates = np.matmul(all_qubit_gate3, whole_gates)
-                whole_gates = np.matmul(all_qubit_gate4, whole_gates)
-                whole_gates = np.matmul(all_qubit_gate5, whole_gates)
-                whole_gates = np.matmul(all_qubit_gate6, whole_gates)
-            else:
-                if gate["name"] in ("id", "x", "y", "z", "h", "s", "t"):
-                    original_qubit_gate = eval("_" + gate["name"].upper())
-                elif gate["name"] in ("sdg", "tdg"):
-                    original_qubit_gate = eval("_" + gate["name"].capitalize())
-                elif gate["name"] in ("rx", "ry", "rz", "u", "p", "scalar"):
-                    original_qubit_gate = eval("_" + gate["name"]
-                                               + '(gate["parameter"])')
-                else:
+        fingerprints = [_get_fingerprint(gate) for gate in self._gates]
+        num_cached_gates = self._get_num_cached_gates(
+            self._whole_gates_cache, fingerprints)
+        if num_cached_gates is None:
+            whole_gates = self.compile().get_whole_gates()
+        else:
+            whole_gates = self._compile_gates_from(num_cached_gates) \
+                .get_state_vector(self._whole_gates_cache["result"])
+
+        if 4**self._num_qubit > _MEMMAP_CHUNK_SIZE:
+            self._whole_gates_cache = None
+        else:
+            self._whole_gates_cache = self._get_cache(
+                whole_gates, fingerprints)
+
+        return whole_gates
+
+
+class StateVectorCircuitPlan:
+    """
+    Immutable execution plan of a StateVectorCircuit, returned by
+    StateVectorCircuit.compile(). It holds the sequence of operations with
+    resolved matrices and precomputed axes, and can be executed many times
+    against different initial states, e.g. by the assert methods.
+
+    Named parameters of the gates are bound by bind_parameters, which
+    returns a new plan. When they are bound to 1-D arrays of sweep_size
+    values, the plan is executed for all the values at once along a
+    trailing sweep axis of the state tensor.
+
+    The state vectors and operators are of the dtype of the precision,
+    either "complex64" or "complex128".
+
+    If memmap_dir is given, the state vectors are kept in temporary
+    memory-mapped files in that directory, which are removed when the
+    returned arrays are released, and every operation streams through the
+    file in chunks of at most memmap_chunk_size elements.
+
+    If num_workers is larger than 1, every operation is applied to
+    disjoint chunks of the state tensor concurrently in a pool of
+    num_workers workers. With the "thread" backend, they are threads, as
+    the NumPy kernels release the GIL. With the "process" backend, they
+    are persistent processes which share the state tensor in
+    multiprocessing.shared_memory and synchronize at a barrier after every
+    operation, so that no amplitudes are pickled between processes.
+    """
+
+    def __init__(
+            self,
+            num_qubit: int,
+            operations: list,
+            from_right_to_left_for_qubit_ids: bool = False,
+            sweep_size: int = None,
+            precision: str = "complex128",
+            memmap_dir: str = None,
+            memmap_chunk_size: int = _MEMMAP_CHUNK_SIZE,
+            num_workers: int = 1,
+            backend: str = "thread"):
+        if not isinstance(num_workers, int) or num_workers < 1:
+            raise StateVectorCircuitError(
+                "num_workers must be a positive integer."
+            )
+
+        if backend not in _BACKENDS:
+            raise StateVectorCircuitError(
+                f"backend must be one of {_BACKENDS}."
+            )
+
+        if backend == "process" and memmap_dir is not None:
+            raise StateVectorCircuitError(
+                "process backend cannot keep the state in a memory-mapped "
+                "file."
+            )
+
+        self._num_qubit = num_qubit
+        self._operations = tuple(operations)
+        self._from_right_to_left_for_qubit_ids = \
+            from_right_to_left_for_qubit_ids
+        self._sweep_size = sweep_size
+        self._precision = precision
+        self._dtype = _get_dtype(precision)
+        self._memmap_dir = memmap_dir
+        self._memmap_chunk_size = memmap_chunk_size
+        self._num_workers = num_workers
+        self._backend = backend
+        self._token = next(_PLAN_TOKENS)
+
+    @property
+    def num_qubit(self) -> int:
+        return self._num_qubit
+
+    @property
+    def operations(self) -> tuple:
+        return self._operations
+
+    @property
+    def from_right_to_left_for_qubit_ids(self) -> bool:
+        return self._from_right_to_left_for_qubit_ids
+
+    @property
+    def sweep_size(self) -> int:
+        return self._sweep_size
+
+    @property
+    def precision(self) -> str:
+        return self._precision
+
+    @property
+    def dtype(self) -> type:
+        return self._dtype
+
+    @property
+    def memmap_dir(self) -> str:
+        return self._memmap_dir
+
+    @property
+    def num_workers(self) -> int:
+        return self._num_workers
+
+    @property
+    def backend(self) -> str:
+        return self._backend
+
+    @property
+    def parameter_names(self) -> list:
+        """The names of the parameters which are not bound yet."""
+        return sorted(set(
+            param
+            for operation in self._operations if operation[0] == "parametric"
+            for param in operation[2] if isinstance(param, str)))
+
+    def bind_parameters(
+            self,
+            parameter_values: dict) -> "StateVectorCircuitPlan":
+        """Returns a new plan where the named parameters are bound to the
+        given values. A value is either a number, or a 1-D array of
+        sweep_size values to be simulated at once. All the arrays, including
+        those bound before, must have the same length.
+        """
+        if not isinstance(parameter_values, dict):
+            raise StateVectorCircuitError(
+                "parameter_values must be a dictionary from the names of "
+                "the parameters to their values."
+            )
+
+        unknown_names = sorted(
+            set(parameter_values) - set(self.parameter_names))
+        if len(unknown_names) > 0:
+            raise StateVectorCircuitError(
+                f"parameter(s) {unknown_names} are not in the circuit."
+            )
+
+        sweep_size = self._sweep_size
+        values = {}
+        for name, value in parameter_values.items():
+            if isinstance(value, (list, tuple, np.ndarray)):
+                value = np.array(value, dtype=float)
+                if value.ndim == 0:
+                    value = value.item()
+
+            if isinstance(value, np.ndarray):
+                if value.ndim != 1:
                     raise StateVectorCircuitError(
-                        "Unexpected error. Please report."
+                        f"values of parameter {name} must be a number or a "
+                        "1-D array."
                     )
-                all_qubit_gate = \
-                    self._create_all_qubit_gate_from_original_qubit_gate(
-                        original_qubit_gate,
-                        gate["control_qubit"],
-                        gate["target_qubit"],
-                        gate["control_value"]
+                if sweep_size is not None and len(value) != sweep_size:
+                    raise StateVectorCircuitError(
+                        "arrays of parameter values must have the same "
+                        "length."
                     )
-                whole_gates = np.matmul(all_qubit_gate, whole_gates)
+                sweep_size = len(value)
+                value = _get_read_only_array(value)
+
+            elif not isinstance(value, (float, int)):
+                raise StateVectorCircuitError(
+                    f"values of parameter {name} must be a number or a "
+                    "1-D array."
+                )
+
+            values[name] = value
+
+        operations = []
+        for operation in self._operations:
+            if operation[0] != "parametric":
+                operations.append(operation)
+                continue
+
+            _, name, parameter, control_index, target_axes = operation
+            parameter = tuple(values.get(param, param)
+                              if isinstance(param, str) else param
+                              for param in parameter)
+            if any(isinstance(param, str) for param in parameter):
+                operations.append(("parametric", name, parameter,
+                                   control_index, target_axes))
+                continue
+
+            if any(isinstance(param, np.ndarray) for param in parameter):
+                matrix = _get_read_only_array(
+                    _get_swept_gate_matrices(
+                        name, list(parameter), sweep_size),
+                    self._dtype)
+            else:
+                matrix = _get_read_only_array(
+                    _get_gate_matrix(name, list(parameter)), self._dtype)
+
+            if _GATE_REGISTRY[name]["num_target"] == 1:
+                operations.append(
+                    ("single", matrix, control_index, target_axes))
+            else:
+                operations.append(
+                    ("matrix", matrix, control_index, target_axes))
+
+        return StateVectorCircuitPlan(
+            self._num_qubit,
+            operations,
+            self._from_right_to_left_for_qubit_ids,
+            sweep_size,
+            self._precision,
+            self._memmap_dir,
+            self._memmap_chunk_size,
+            self._num_workers,
+            self._backend
+        )
+
+    def _get_axis(self, qubit: int) -> int:
+        """Returns the axis of the state tensor which corresponds to the
+        qubit, taking the order of qubit ids into account.
+        """
+        if self._from_right_to_left_for_qubit_ids:
+            return self._num_qubit - 1 - qubit
+        else:
+            return qubit
+
+    def _apply_operation_to_state_tensor(
+            self,
+            state_tensor: np.ndarray,
+            operation: tuple) -> np.ndarray:
+        """Applies the operation to the state tensor whose leading axes are
+        (2,)*num_qubit. Trailing axes, if any, are left untouched, so that
+        the columns of an operator can be evolved at once.
+        """
+        kind = operation[0]
+        if kind == "phase":
+            _, phase_tensor, control_index, axes = operation
+            if control_index is None:
+                # merged runs multiply the whole state tensor once
+                return _multiply_phase_to_axes(
+                    state_tensor, phase_tensor, axes)
+
+            _multiply_phase_to_axes(
+                state_tensor[control_index], phase_tensor, axes)
+            return state_tensor
+
+        elif kind == "permutation":
+            return _permute_slices_of_axes(state_tensor, *operation[1:])
+
+        elif kind == "single":
+            _, matrix, control_index, target_axes = operation
+            sliced_state_tensor = state_tensor[control_index]
+            for axis in target_axes:
+                _apply_single_qubit_matrix_to_axis(
+                    sliced_state_tensor, matrix, axis)
+            return state_tensor
+
+        elif kind == "swap":
+            return _swap_axes_in_slice(state_tensor, *operation[1:])
+
+        _, matrix, control_index, target_axes = operation
+        if control_index is None:
+            # one sweep over the state tensor for the whole block, written
+            # back so that the state tensor stays the same contiguous array
+            state_tensor[...] = _apply_matrix_to_axes(
+                state_tensor, matrix, target_axes)
+            return state_tensor
+
+        if matrix.ndim == 3:
+            state_tensor[control_index] = _apply_swept_matrices_to_axes(
+                state_tensor[control_index], matrix, target_axes)
+        else:
+            state_tensor[control_index] = _apply_matrix_to_axes(
+                state_tensor[control_index], matrix, target_axes)
+        return state_tensor
+
+    def _get_num_chunk_axes(self, state_tensor: np.ndarray) -> int:
+        """Returns the number of leading axes of the state tensor to be
+        fixed, so that a chunk of a memory-mapped state tensor has at most
+        memmap_chunk_size elements, and that there are about four chunks of
+        at least _MIN_THREAD_CHUNK_SIZE elements per worker thread. It is 0
+        for a state tensor in memory simulated by a single thread.
+        """
+        num_chunk_axes = 0
+        if isinstance(state_tensor, np.memmap):
+            chunk_size = self._memmap_chunk_size \
+                // int(np.prod(state_tensor.shape[self._num_qubit:]))
+            num_chunk_qubits = max(0, chunk_size.bit_length() - 1)
+            num_chunk_axes = max(0, self._num_qubit - num_chunk_qubits)
+
+        if self._num_workers > 1:
+            num_thread_chunk_axes = min(
+                (4*self._num_workers - 1).bit_length(),
+                (state_tensor.size // _MIN_THREAD_CHUNK_SIZE).bit_length()
+                - 1,
+                self._num_qubit)
+            num_chunk_axes = max(num_chunk_axes, num_thread_chunk_axes)
+
+        return num_chunk_axes
+
+    def _apply_operation_to_chunks(
+            self,
+            state_tensor: np.ndarray,
+            operation: tuple,
+            num_chunk_axes: int,
+            executor: ThreadPoolExecutor = None) -> np.ndarray:
+        """Applies the operation to the state tensor chunk by chunk. A chunk
+        fixes the values of the leading axes on which the operation does not
+        act, up to num_chunk_axes axes including the control axes. Chunks
+        where a control qubit does not take its control value are skipped.
+
+        The chunks are disjoint, so that they are applied concurrently by
+        the executor if given. A chunk of a memory-mapped state tensor is
+        read, updated in memory and written back, so that the file is
+        streamed through in order. A chunk of a state tensor in memory is
+        updated in place.
+        """
+        kind = operation[0]
+        if kind == "permutation":
+            control_index = None
+            axes_in_slice = operation[2]
+        elif kind == "swap":
+            control_index = operation[1]
+            axes_in_slice = operation[2:4]
+        elif kind in ("phase", "single", "matrix"):
+            _, matrix, control_index, axes_in_slice = operation
+        else:
+            raise StateVectorCircuitError(
+                f"{kind} operation cannot be applied in chunks."
+            )
+
+        if control_index is None:
+            control_index = (slice(None),)*self._num_qubit + (Ellipsis,)
+
+        # axes of the whole state tensor
+        sliced_axes = [axis for axis in range(self._num_qubit)
+                       if isinstance(control_index[axis], slice)]
+        target_axes = [sliced_axes[axis] for axis in axes_in_slice]
+        free_axes = [axis for axis in sliced_axes if axis not in target_axes]
+
+        num_fixed_axes = min(
+            len(free_axes),
+            max(0, num_chunk_axes - (self._num_qubit - len(sliced_axes))))
+        fixed_axes = free_axes[:num_fixed_axes]
+        chunk_axes = [axis for axis in sliced_axes if axis not in fixed_axes]
+        target_axes_in_chunk = [chunk_axes.index(axis)
+                                for axis in target_axes]
+        is_memmap = isinstance(state_tensor, np.memmap)
+
+        def apply_to_chunk(values: tuple) -> None:
+            index = list(control_index[:self._num_qubit])
+            for axis, value in zip(fixed_axes, values):
+                index[axis] = value
+            view = state_tensor[tuple(index) + (Ellipsis,)]
+
+            chunk = np.array(view) if is_memmap else view
+            if kind == "phase":
+                _multiply_phase_to_axes(chunk, matrix, target_axes_in_chunk)
+            elif kind == "permutation":
+                _permute_slices_of_axes(
+                    chunk, operation[1], target_axes_in_chunk)
+            elif kind == "single":
+                for axis in target_axes_in_chunk:
+                    _apply_single_qubit_matrix_to_axis(chunk, matrix, axis)
+            elif kind == "swap":
+                _swap_axes_in_slice(
+                    chunk, (Ellipsis,), *target_axes_in_chunk, operation[4])
+            elif matrix.ndim == 3:
+                chunk = _apply_swept_matrices_to_axes(
+                    chunk, matrix, target_axes_in_chunk)
+            else:
+                chunk = _apply_matrix_to_axes(
+                    chunk, matrix, target_axes_in_chunk)
+
+            if chunk is not view:
+                view[...] = chunk
+
+        chunk_values = itertools.product((0, 1), repeat=num_fixed_axes)
+        if executor is None:
+            for values in chunk_values:
+                apply_to_chunk(values)
+        else:
+            list(executor.map(apply_to_chunk, chunk_values))
+
+        return state_tensor
+
+    def _evolve_state_tensor(self, state_tensor: np.ndarray) -> np.ndarray:
+        """Applies all the operations to the state tensor, whose leading
+        axes are (2,)*num_qubit. For a sweep, the last axis of the state
+        tensor is the sweep axis. A memory-mapped state tensor is updated
+        in place chunk by chunk, and the chunks are applied by a pool of
+        num_workers threads if num_workers is larger than 1.
+        """
+        if len(self.parameter_names) > 0:
+            raise StateVectorCircuitError(
+                f"parameter(s) {self.parameter_names} must be bound by "
+                "bind_parameters."
+            )
+
+        num_chunk_axes = self._get_num_chunk_axes(state_tensor)
+        if num_chunk_axes == 0 and not isinstance(state_tensor, np.memmap):
+            for operation in self._operations:
+                state_tensor = self._apply_operation_to_state_tensor(
+                    state_tensor, operation)
+            return state_tensor
+
+        if self._backend == "process" \
+                and not isinstance(state_tensor, np.memmap):
+            return _get_process_pool(self._num_workers).evolve(
+                self, state_tensor, num_chunk_axes)
+
+        executor = None
+        if self._num_workers > 1:
+            executor = ThreadPoolExecutor(max_workers=self._num_workers)
+
+        try:
+            for operation in self._operations:
+                state_tensor = self._apply_operation_to_chunks(
+                    state_tensor, operation, num_chunk_axes, executor)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        return state_tensor
+
+    def _add_sweep_axis(self, state_tensor: np.ndarray) -> np.ndarray:
+        """Returns the state tensor repeated along a new last axis for a
+        sweep.
+        """
+        if self._sweep_size is None:
+            return state_tensor
+
+        return np.repeat(
+            state_tensor[..., np.newaxis], self._sweep_size, axis=-1)
+
+    def _get_memmap_state_tensor(
+            self,
+            initial_state_vector: np.ndarray,
+            shape: tuple = None) -> np.memmap:
+        """Returns a state tensor in a temporary memory-mapped file, where
+        the initial state vector of shape (2**num_qubit,) + batch_shape is
+        copied chunk by chunk. The file is removed when the returned array
+        is released. If shape is given, only the leading rows which the
+        initial state vector has are copied and the others are zero.
+        """
+        if shape is None:
+            shape = initial_state_vector.shape
+        if self._sweep_size is not None:
+            shape = shape + (self._sweep_size,)
+
+        with tempfile.TemporaryFile(dir=self._memmap_dir) as file:
+            state_vec = np.memmap(
+                file, dtype=self._dtype, mode="w+", shape=shape)
+
+        num_rows = max(
+            1, self._memmap_chunk_size // int(np.prod(shape[1:])))
+        for start in range(0, len(initial_state_vector), num_rows):
+            rows = initial_state_vector[start:start+num_rows]
+            if self._sweep_size is not None:
+                rows = rows[..., np.newaxis]
+            state_vec[start:start+num_rows] = rows
+
+        return np.reshape(state_vec, (2,)*self._num_qubit + shape[1:])
+
+    def _get_state_tensor(
+            self,
+            initial_state_vector: np.ndarray = None) -> np.ndarray:
+        """Returns the state tensor obtained by applying the plan to the
+        initial state vector, which is |0...0> if not given. The state
+        tensor has the shape (2,)*num_qubit, followed by the batch axis for
+        a batch of initial state vectors and by the sweep axis for a sweep.
+        """
+        if initial_state_vector is None and self._memmap_dir is not None:
+            # the file is filled with zeros when created
+            state_tensor = self._get_memmap_state_tensor(
+                np.zeros((0,), dtype=self._dtype),
+                shape=(2**self._num_qubit,))
+            state_tensor[(0,)*self._num_qubit] = 1.
+            return self._evolve_state_tensor(state_tensor)
+
+        if initial_state_vector is None:
+            state_tensor = np.zeros((2,)*self._num_qubit, dtype=self._dtype)
+            state_tensor[(0,)*self._num_qubit] = 1.
+            state_tensor = self._add_sweep_axis(state_tensor)
+            return self._evolve_state_tensor(state_tensor)
+
+        _diagnostic_initial_state_vector(initial_state_vector, self._num_qubit)
+
+        if _is_row_batch(initial_state_vector, self._num_qubit):
+            initial_state_vector = initial_state_vector.T
+
+        if self._memmap_dir is not None:
+            return self._evolve_state_tensor(
+                self._get_memmap_state_tensor(initial_state_vector))
+
+        # copied, so that the initial state vector is not changed. Only the
+        # state tensor with the sweep axis is kept during the evolution
+        state_tensor = np.reshape(
+            np.array(initial_state_vector, dtype=self._dtype, order="C"),
+            (2,)*self._num_qubit + initial_state_vector.shape[1:])
+        state_tensor = self._add_sweep_axis(state_tensor)
+
+        return self._evolve_state_tensor(state_tensor)
+
+    def get_state_vector(
+            self,
+            initial_state_vector: np.ndarray = None) -> np.ndarray:
+        """Returns the state vector obtained by applying the plan to the
+        initial state vector, which is |0...0> if not given. A batch of
+        initial state vectors of shape (2**num_qubit, B) or
+        (B, 2**num_qubit) is evolved at once and the batch of state vectors
+        is returned in the same shape. For a sweep, the state vectors are
+        stacked along the first axis, e.g. of shape
+        (sweep_size, 2**num_qubit) for a single initial state vector. The
+        initial state vector is not changed.
+        """
+        state_tensor = self._get_state_tensor(initial_state_vector)
+        state_vec = np.reshape(
+            state_tensor,
+            (2**self._num_qubit,) + state_tensor.shape[self._num_qubit:])
+
+        if self._sweep_size is not None:
+            state_vec = np.moveaxis(state_vec, -1, 0)
+
+        if initial_state_vector is not None \
+                and _is_row_batch(initial_state_vector, self._num_qubit):
+            return np.swapaxes(state_vec, -1, -2)
+
+        return state_vec
+
+    def _get_whole_gates_columns(self, start: int, stop: int) -> np.ndarray:
+        """Returns the columns from start to stop of the operator of the
+        plan, of shape (2**num_qubit, stop - start), or stacked along the
+        first axis for a sweep. The operations are applied to the columns
+        of the identity at once by the same local kernels as the state
+        vector, i.e. the columns are a state tensor with a trailing column
+        axis.
+        """
+        dim = 2**self._num_qubit
+        whole_tensor = np.zeros((dim, stop - start), dtype=self._dtype)
+        whole_tensor[np.arange(start, stop), np.arange(stop - start)] = 1.
+        whole_tensor = self._add_sweep_axis(
+            np.reshape(whole_tensor, (2,)*self._num_qubit + (stop - start,)))
+        whole_tensor = self._evolve_state_tensor(whole_tensor)
+
+        if self._sweep_size is not None:
+            return np.moveaxis(
+                np.reshape(
+                    whole_tensor, (dim, stop - start, self._sweep_size)),
+                -1, 0)
+
+        return np.reshape(whole_tensor, (dim, stop - start))
+
+    def get_whole_gates(self,) -> np.ndarray:
+        """Returns the operator of the plan. For a sweep, the operators are
+        stacked along the first axis.
+        """
+        return self._get_whole_gates_columns(0, 2**self._num_qubit)
+
+    def save_whole_gates(
+            self,
+            file: str,
+            block_size: int = None) -> np.memmap:
+        """Writes the operator of the plan to the .npy file and returns it
+        as a memory-mapped array. The operator is computed block by block
+        of block_size columns, so that only one block is held in memory.
+        If block_size is None, a block has at most memmap_chunk_size
+        elements. The file is in Fortran order, where a block of columns
+        is contiguous.
+        """
+        dim = 2**self._num_qubit
+        shape = (dim, dim)
+        if self._sweep_size is not None:
+            shape = (self._sweep_size,) + shape
+
+        if block_size is None:
+            block_size = max(
+                1, self._memmap_chunk_size // (dim * (self._sweep_size or 1)))
+        if not isinstance(block_size, int) or block_size < 1:
+            raise StateVectorCircuitError(
+                "block_size must be a positive integer."
+            )
+
+        whole_gates = np.lib.format.open_memmap(
+            file, mode="w+", dtype=self._dtype, shape=shape,
+            fortran_order=True)
+        for start in range(0, dim, block_size):
+            stop = min(start + block_size, dim)
+            whole_gates[..., start:stop] = \
+                self._get_whole_gates_columns(start, stop)
+        whole_gates.flush()
 
         return whole_gates
 
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes of the matrices and tensors held by the
+        operations.
+        """
+        num_bytes = 0
+        for operation in self._operations:
+            # the cycles of a permutation are arrays
+            elements = operation[1] if operation[0] == "permutation" \
+                else operation[1:]
+            num_bytes += sum(element.nbytes for element in elements
+                             if isinstance(element, np.ndarray))
+
+        return num_bytes
+
+    def estimate_cost(self, num_column: int = 1) -> dict:
+        """Returns the estimated peak memory in bytes, "peak_bytes", and the
+        approximate number of real floating point operations, "flops", to
+        evolve num_column state vectors at once, e.g. 2**num_qubit for the
+        operator. A complex multiply-add is counted as 8 flops.
+
+        The peak memory is that of the state tensor, of the temporaries of
+        the most expensive kernel and of the buffers of the ufuncs, and of
+        the operands held by the plan, nbytes. A dense matrix holds a copy
+        of the contracted slice and the result, a single qubit matrix and a
+        swap hold one copy of the slice,
+        a permutation holds one of the moved slices and a phase holds none.
+        For a memory-mapped state tensor, only a chunk and the temporaries
+        of its kernel are held in memory by each of the workers. The
+        process backend holds the state tensor in shared memory and the
+        result copied back besides the state tensor.
+        """
+        itemsize = np.dtype(self._dtype).itemsize
+        num_element = 2**self._num_qubit * num_column \
+            * (self._sweep_size or 1)
+
+        flops = 0
+        # the temporaries of the kernels relative to the state tensor
+        temporary_ratio = 0.
+        for operation in self._operations:
+            kind = operation[0]
+            if kind == "permutation":
+                temporary_ratio = max(
+                    temporary_ratio, 2.**-len(operation[2]))
+                continue
+
+            control_index = operation[1] if kind == "swap" \
+                else operation[-2]
+            num_control = 0 if control_index is None else len(
+                [index for index in control_index[:self._num_qubit]
+                 if not isinstance(index, slice)])
+            num_sliced_element = num_element // 2**num_control
+
+            if kind == "swap":
+                temporary_ratio = max(temporary_ratio, 2.**-num_control)
+            elif kind == "phase":
+                flops += 6 * num_sliced_element
+            elif kind == "matrix":
+                flops += 8 * operation[1].shape[-1] * num_sliced_element
+                temporary_ratio = max(
+                    temporary_ratio, 2. * 2.**-num_control)
+            else:
+                # single qubit matrices applied to each of the targets
+                flops += 16 * len(operation[-1]) * num_sliced_element
+                temporary_ratio = max(temporary_ratio, 2.**-num_control)
+
+        # the buffers of the ufuncs iterating over strided slices
+        if self._memmap_dir is not None:
+            num_chunk_element = min(num_element, self._memmap_chunk_size)
+            state_bytes = self._num_workers * num_chunk_element * itemsize \
+                * (1. + temporary_ratio)
+            buffer_bytes = self._num_workers * 4 \
+                * min(np.getbufsize(), num_chunk_element) * itemsize
+        else:
+            state_bytes = num_element * itemsize * (1. + temporary_ratio)
+            if self._backend == "process" and self._num_workers > 1:
+                state_bytes += 2 * num_element * itemsize
+            buffer_bytes = 4 * min(np.getbufsize(), num_element) * itemsize
+
+        return {"peak_bytes": int(state_bytes) + buffer_bytes
+                + self.nbytes,
+                "flops": flops}
+
+
+class StateVectorSnapshots:
+    """
+    Snapshots of the state vector of a StateVectorCircuit at gate indices,
+    returned by StateVectorCircuit.get_snapshots(). The snapshot at gate
+    index i is the state vector after the first i gates, and is obtained
+    by snapshots[i] in the shape of the initial state vector.
+
+    A snapshot is stored either as a dense state vector, or as the flat
+    indices and the values of the amplitudes above a threshold, where the
+    other amplitudes are zero.
+    """
+
+    def __init__(
+            self,
+            num_qubit: int,
+            snapshots: dict,
+            from_right_to_left_for_qubit_ids: bool = False,
+            batch_shape: tuple = (),
+            is_row_batch: bool = False,
+            precision: str = "complex128"):
+        self._num_qubit = num_qubit
+        self._snapshots = dict(snapshots)
+        self._from_right_to_left_for_qubit_ids = \
+            from_right_to_left_for_qubit_ids
+        self._batch_shape = tuple(batch_shape)
+        self._is_row_batch = is_row_batch
+        self._precision = precision
+
+    @property
+    def num_qubit(self) -> int:
+        return self._num_qubit
+
+    @property
+    def from_right_to_left_for_qubit_ids(self) -> bool:
+        return self._from_right_to_left_for_qubit_ids
+
+    @property
+    def precision(self) -> str:
+        return self._precision
+
+    @property
+    def gate_indices(self) -> list:
+        return sorted(self._snapshots)
+
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes of the stored snapshots."""
+        return sum(snapshot.nbytes if isinstance(snapshot, np.ndarray)
+                   else snapshot[0].nbytes + snapshot[1].nbytes
+                   for snapshot in self._snapshots.values())
+
+    def _get_state_tensor(self, gate_index: int) -> np.ndarray:
+        """Returns the snapshot at the gate index as a state tensor of shape
+        (2,)*num_qubit followed by the batch axis for a batch.
+        """
+        if gate_index not in self._snapshots:
+            raise StateVectorCircuitError(
+                f"no snapshot is recorded at gate index {gate_index}."
+            )
+
+        snapshot = self._snapshots[gate_index]
+        if not isinstance(snapshot, np.ndarray):
+            flat_indices, values = snapshot
+            state_vec = np.zeros(
+                (2**self._num_qubit,) + self._batch_shape,
+                dtype=values.dtype)
+            np.ravel(state_vec)[flat_indices] = values
+            snapshot = state_vec
+
+        return np.reshape(
+            snapshot, (2,)*self._num_qubit + self._batch_shape)
+
+    def __getitem__(self, gate_index: int) -> np.ndarray:
+        state_vec = np.reshape(
+            np.array(self._get_state_tensor(gate_index)),
+            (2**self._num_qubit,) + self._batch_shape)
+
+        if self._is_row_batch:
+            return state_vec.T
+
+        return state_vec
+
+
+class _RankExecutor:
+    """Executor of a worker process of _ProcessPool, which applies a
+    function to its share of the chunks, every num_workers-th chunk from
+    the rank-th one.
+    """
+
+    def __init__(self, rank: int, num_workers: int):
+        self._rank = rank
+        self._num_workers = num_workers
+
+    def map(self, fn, iterable) -> list:
+        return [fn(item) for i, item in enumerate(iterable)
+                if i % self._num_workers == self._rank]
+
+
+def _run_process_worker(
+        rank: int,
+        num_workers: int,
+        task_queue: multiprocessing.Queue,
+        done_queue: multiprocessing.Queue,
+        barrier: multiprocessing.Barrier) -> None:
+    """Main loop of a worker process of _ProcessPool. For each task, the
+    worker attaches to the shared memory buffer of the state tensor,
+    applies the operations of the plan to its share of the chunks and
+    waits at the barrier for the other workers after every operation.
+
+    A plan is sent with the first task of its token only, and is cached
+    first in first out as the pool tracks it.
+    """
+    executor = _RankExecutor(rank, num_workers)
+    plans = {}
+    while True:
+        task = task_queue.get()
+        if task is None:
+            return
+
+        token, plan, name, shape, dtype, num_chunk_axes = task
+        if plan is not None:
+            plans[token] = pickle.loads(plan)
+            if len(plans) > _MAX_WORKER_PLANS:
+                del plans[next(iter(plans))]
+        plan = plans[token]
+
+        buffer = shared_memory.SharedMemory(name=name)
+        try:
+            state_tensor = np.ndarray(shape, dtype=dtype, buffer=buffer.buf)
+            for operation in plan.operations:
+                plan._apply_operation_to_chunks(
+                    state_tensor, operation, num_chunk_axes, executor)
+                barrier.wait()
+            del state_tensor
+            done_queue.put(None)
+
+        except Exception as e:
+            barrier.abort()
+            done_queue.put(e)
+
+        finally:
+            buffer.close()
+
+
+class _ProcessPool:
+    """Persistent pool of num_workers processes, which evolve a state
+    tensor held in shared memory.
+    """
+
+    def __init__(self, num_workers: int):
+        # the workers share the resource tracker of the main process, which
+        # unlinks the shared memory
+        resource_tracker.ensure_running()
+
+        self._num_workers = num_workers
+        self._task_queues = [multiprocessing.Queue()
+                             for _ in range(num_workers)]
+        self._done_queue = multiprocessing.Queue()
+        self._barrier = multiprocessing.Barrier(num_workers)
+        # tokens of the plans cached by the workers, oldest first
+        self._tokens = []
+        self._processes = [
+            multiprocessing.Process(
+                target=_run_process_worker,
+                args=(rank, num_workers, self._task_queues[rank],
+                      self._done_queue, self._barrier),
+                daemon=True)
+            for rank in range(num_workers)]
+        for process in self._processes:
+            process.start()
+
+    def evolve(
+            self,
+            plan: StateVectorCircuitPlan,
+            state_tensor: np.ndarray,
+            num_chunk_axes: int) -> np.ndarray:
+        """Returns the state tensor evolved by the plan in the workers.
+        The state tensor is copied into shared memory once, and the result
+        is copied back once. The plan is pickled to the workers only if
+        they do not cache it yet.
+
+        If a worker exits while the others are evolving the state tensor,
+        the pool is terminated and a StateVectorCircuitError is raised;
+        the next call starts a new pool.
+        """
+        buffer = shared_memory.SharedMemory(
+            create=True, size=max(1, state_tensor.nbytes))
+        try:
+            shared_state_tensor = np.ndarray(
+                state_tensor.shape, dtype=state_tensor.dtype,
+                buffer=buffer.buf)
+            shared_state_tensor[...] = state_tensor
+
+            if plan._token in self._tokens:
+                sent_plan = None
+            else:
+                # pickled once for all the workers
+                sent_plan = pickle.dumps(plan)
+                self._tokens.append(plan._token)
+                if len(self._tokens) > _MAX_WORKER_PLANS:
+                    del self._tokens[0]
+
+            task = (plan._token, sent_plan, buffer.name, state_tensor.shape,
+                    state_tensor.dtype, num_chunk_axes)
+            for task_queue in self._task_queues:
+                task_queue.put(task)
+            errors = self._get_errors()
+            self._barrier.reset()
+
+            for error in errors:
+                if isinstance(error, Exception) and not isinstance(
+                        error, threading.BrokenBarrierError):
+                    raise error
+
+            result = np.array(shared_state_tensor)
+            del shared_state_tensor
+
+        finally:
+            buffer.close()
+            buffer.unlink()
+
+        return result
+
+    def _get_errors(self,) -> list:
+        """Waits for all the workers to finish the task and returns what
+        they put in the done queue, None or an exception. Raises a
+        StateVectorCircuitError if a worker has exited.
+        """
+        errors = []
+        while len(errors) < self._num_workers:
+            try:
+                errors.append(
+                    self._done_queue.get(timeout=_WORKER_POLL_INTERVAL))
+            except queue.Empty:
+                if all(process.is_alive() for process in self._processes):
+                    continue
+                exit_codes = [process.exitcode for process in self._processes
+                              if not process.is_alive()]
+                self.terminate()
+                raise StateVectorCircuitError(
+                    f"a worker process of the process backend exited with "
+                    f"code {exit_codes[0]}."
+                )
+
+        return errors
+
+    def terminate(self,) -> None:
+        """Kills the workers and removes the pool from the persistent
+        pools.
+        """
+        for process in self._processes:
+            process.terminate()
+        for process in self._processes:
+            process.join()
+        if _PROCESS_POOLS.get(self._num_workers) is self:
+            del _PROCESS_POOLS[self._num_workers]
+
+    def close(self,) -> None:
+        for task_queue in self._task_queues:
+            task_queue.put(None)
+        for process in self._processes:
+            process.join()
+
+
+# persistent process pools by the number of workers
+_PROCESS_POOLS = {}
+
+
+def _get_process_pool(num_workers: int) -> _ProcessPool:
+    """Returns the persistent pool of num_workers processes, which is
+    started at the first call.
+    """
+    if num_workers not in _PROCESS_POOLS:
+        _PROCESS_POOLS[num_workers] = _ProcessPool(num_workers)
+    return _PROCESS_POOLS[num_workers]
+
+
+@atexit.register
+def _close_process_pools() -> None:
+    for pool in _PROCESS_POOLS.values():
+        pool.close()
+    _PROCESS_POOLS.clear()
+
 
 def cvt_quantestpy_circuit_to_state_vector_circuit(
         qc: QuantestPyCircuit) -> StateVectorCircuit:
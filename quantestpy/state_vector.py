@@ -38,16 +38,27 @@ def assert_is_normalized(
         raise QuantestPyAssertionError(msg)
 
 
-def _remove_global_phase_from_two_vectors(a: np.ndarray, b: np.ndarray):
-
+def _remove_global_phase_from_two_vectors(
+        a: np.ndarray,
+        b: np.ndarray,
+        axis: int = -1):
+    """Removes the global phases from the vectors, such that the element
+    of a with the largest absolute value and the corresponding element of b
+    become real and positive. Stacked vectors are treated one by one, the
+    elements of each vector lying along the given axis, e.g. the last axis
+    for vectors of shape (..., dim) and axis 0 for columns of shape
+    (dim, B).
+    """
     abs_a = np.abs(a)
-    max_value_abs_a = np.max(abs_a)
-    max_index_abs_a = np.argmax(abs_a)
-    a_global_phase = a[max_index_abs_a] / max_value_abs_a
+    max_index_abs_a = np.expand_dims(np.argmax(abs_a, axis=axis), axis)
+    max_value_abs_a = np.take_along_axis(abs_a, max_index_abs_a, axis=axis)
+    a_global_phase = np.take_along_axis(a, max_index_abs_a, axis=axis) \
+        / max_value_abs_a
 
     a = a * a_global_phase.conj()
 
-    b_global_phase = b[max_index_abs_a] / abs(b[max_index_abs_a])
+    b_max = np.take_along_axis(b, max_index_abs_a, axis=axis)
+    b_global_phase = b_max / np.abs(b_max)
 
     b = b * b_global_phase.conj()
 
@@ -60,7 +71,8 @@ def assert_equal(
         rtol: float = 0.,
         atol: float = 1e-8,
         up_to_global_phase: bool = False,
-        msg=None):
+        msg=None,
+        vector_axis: int = -1):
 
     a = state_vector_a
     b = state_vector_b
@@ -89,9 +101,14 @@ def assert_equal(
             "The shapes of the state_vectors must be the same."
         )
 
+    if vector_axis not in [-1, 0]:
+        raise QuantestPyError(
+            "vector_axis must be either -1 or 0."
+        )
+
     # remove global phase
     if up_to_global_phase:
-        a, b = _remove_global_phase_from_two_vectors(a, b)
+        a, b = _remove_global_phase_from_two_vectors(a, b, vector_axis)
 
     # assert equal
     try:
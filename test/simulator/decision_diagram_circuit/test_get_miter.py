@@ -0,0 +1,75 @@
+import unittest
+
+import numpy as np
+
+from quantestpy import DecisionDiagramCircuit, StateVectorCircuit
+from quantestpy.simulator.decision_diagram_circuit import DecisionDiagram
+
+
+class TestGetMiter(unittest.TestCase):
+    """
+    How to execute this test:
+    $ pwd
+    {Your directory where you git-cloned quantestpy}/quantestpy
+    $ python -m unittest \\
+        test.simulator.decision_diagram_circuit.test_get_miter
+    ..
+    ----------------------------------------------------------------------
+    Ran 2 tests in 0.100s
+
+    OK
+    $
+    """
+
+    def _add_qft(self, circuit, num_qubit: int) -> None:
+        for i in range(num_qubit):
+            circuit.add_gate(
+                {"name": "h", "target_qubit": [i], "control_qubit": [],
+                 "control_value": [], "parameter": []})
+            for j in range(i + 1, num_qubit):
+                circuit.add_gate(
+                    {"name": "p", "target_qubit": [i], "control_qubit": [j],
+                     "control_value": [1],
+                     "parameter": [np.pi / 2**(j - i)]})
+
+    def test_miter(self,):
+        num_qubit = 3
+        svc_a = StateVectorCircuit(num_qubit)
+        ddc_a = DecisionDiagramCircuit(num_qubit)
+        for circuit in [svc_a, ddc_a]:
+            self._add_qft(circuit, num_qubit)
+
+        svc_b = StateVectorCircuit(num_qubit)
+        ddc_b = DecisionDiagramCircuit(num_qubit)
+        for circuit in [svc_b, ddc_b]:
+            circuit.add_gate(
+                {"name": "rx", "target_qubit": [0, 2], "control_qubit": [1],
+                 "control_value": [0], "parameter": [0.3]})
+            circuit.add_gate(
+                {"name": "swap", "target_qubit": [1, 2], "control_qubit": [],
+                 "control_value": [], "parameter": []})
+
+        dd = DecisionDiagram(num_qubit)
+        np.testing.assert_allclose(
+            dd.get_matrix(ddc_a._get_miter(dd, ddc_b)),
+            svc_a._get_whole_gates() @ svc_b._get_whole_gates().conj().T,
+            atol=1e-10)
+
+    def test_miter_stays_small(self,):
+        # the operator of the QFT has no structure for the decision diagram
+        # to share, while the miter of two QFTs stays the identity
+        num_qubit = 10
+        ddc_a = DecisionDiagramCircuit(num_qubit)
+        ddc_b = DecisionDiagramCircuit(num_qubit)
+        self._add_qft(ddc_a, num_qubit)
+        self._add_qft(ddc_b, num_qubit)
+
+        dd = DecisionDiagram(num_qubit)
+        miter = ddc_a._get_miter(dd, ddc_b)
+        self.assertEqual(dd.get_num_node(miter), num_qubit)
+        self.assertAlmostEqual(dd.get_max_abs(miter), 1.)
+        num_node_of_miter = dd.num_node
+
+        dd = DecisionDiagram(num_qubit)
+        ddc_a._get_whole_gates(dd)
+        self.assertGreater(dd.num_node, 2 * num_node_of_miter)
@@ -0,0 +1,119 @@
+import random
+import unittest
+
+import numpy as np
+
+from quantestpy import DecisionDiagramCircuit, StateVectorCircuit
+from quantestpy.simulator.decision_diagram_circuit import DecisionDiagram
+from quantestpy.simulator.exceptions import DecisionDiagramCircuitError
+from quantestpy.simulator.state_vector_circuit import _GATE_REGISTRY
+
+
+class TestGetWholeGates(unittest.TestCase):
+    """
+    How to execute this test:
+    $ pwd
+    {Your directory where you git-cloned quantestpy}/quantestpy
+    $ python -m unittest \\
+        test.simulator.decision_diagram_circuit.test_get_whole_gates
+    ....
+    ----------------------------------------------------------------------
+    Ran 4 tests in 0.300s
+
+    OK
+    $
+    """
+
+    def _get_random_gates(self, num_qubit: int, num_gate: int) -> list:
+        gates = []
+        names = [name for name in _GATE_REGISTRY
+                 if _GATE_REGISTRY[name]["num_target"] <= num_qubit]
+        for _ in range(num_gate):
+            name = random.choice(names)
+            num_target = _GATE_REGISTRY[name]["num_target"]
+            qubits = random.sample(range(num_qubit), num_qubit)
+            if num_target == 1:
+                num_target = random.randint(1, num_qubit)
+            target_qubit = qubits[:num_target]
+            control_qubit = qubits[num_target:][:random.randint(0, 2)]
+            gates.append(
+                {"name": name, "target_qubit": target_qubit,
+                 "control_qubit": control_qubit,
+                 "control_value": [random.randint(0, 1)
+                                   for _ in control_qubit],
+                 "parameter": [random.uniform(-np.pi, np.pi) for _ in
+                               range(_GATE_REGISTRY[name]["num_param"])]})
+        return gates
+
+    def test_operator(self,):
+        random.seed(0)
+        for _ in range(20):
+            num_qubit = random.randint(1, 5)
+            gates = self._get_random_gates(num_qubit, 12)
+            from_right_to_left = random.random() < 0.5
+
+            svc = StateVectorCircuit(num_qubit)
+            ddc = DecisionDiagramCircuit(num_qubit)
+            for gate in gates:
+                svc.add_gate(dict(gate))
+                ddc.add_gate(dict(gate))
+            svc._from_right_to_left_for_qubit_ids = from_right_to_left
+            ddc._from_right_to_left_for_qubit_ids = from_right_to_left
+
+            dd = DecisionDiagram(num_qubit)
+            edge = ddc._get_whole_gates(dd)
+            operator = svc._get_whole_gates()
+
+            np.testing.assert_allclose(
+                dd.get_matrix(edge), operator, atol=1e-10)
+            self.assertAlmostEqual(
+                dd.get_max_abs(edge), np.max(np.abs(operator)))
+
+    def test_get_operator_and_add(self,):
+        random.seed(1)
+        num_qubit = 4
+        svc = StateVectorCircuit(num_qubit)
+        ddc = DecisionDiagramCircuit(num_qubit)
+        for gate in self._get_random_gates(num_qubit, 10):
+            svc.add_gate(dict(gate))
+            ddc.add_gate(dict(gate))
+        operator = svc._get_whole_gates()
+
+        dd = DecisionDiagram(num_qubit)
+        edge_a = ddc._get_whole_gates(dd)
+        edge_b = dd.get_operator(operator, list(range(num_qubit)))
+        difference = dd.add(edge_a, (-edge_b[0], edge_b[1]))
+
+        self.assertLess(dd.get_max_abs(difference), 1e-10)
+        row, column = dd.get_argmax_abs(edge_b)
+        self.assertAlmostEqual(
+            abs(dd.get_element(edge_b, row, column)),
+            np.max(np.abs(operator)))
+
+    def test_adder_is_compact(self,):
+        # a ripple-carry adder of 2 x 20 bits is a permutation of 2**42
+        # basis states but has a decision diagram of linear size
+        num_bit = 20
+        num_qubit = 2 * num_bit + 2
+        ddc = DecisionDiagramCircuit(num_qubit)
+        for i in range(num_bit):
+            carry, a, b = 2 * i, 2 * i + 1, 2 * i + 2
+            ddc.add_gate({"name": "x", "target_qubit": [b],
+                          "control_qubit": [a], "control_value": [1]})
+            ddc.add_gate({"name": "x", "target_qubit": [carry],
+                          "control_qubit": [a], "control_value": [1]})
+            ddc.add_gate({"name": "x", "target_qubit": [a],
+                          "control_qubit": [carry, b],
+                          "control_value": [1, 1]})
+
+        dd = DecisionDiagram(num_qubit)
+        edge = ddc._get_whole_gates(dd)
+
+        self.assertLess(dd.get_num_node(edge), 10 * num_qubit)
+        self.assertAlmostEqual(dd.get_max_abs(edge), 1.)
+
+    def test_invalid_gate(self,):
+        ddc = DecisionDiagramCircuit(2)
+        with self.assertRaises(DecisionDiagramCircuitError):
+            ddc.add_gate({"name": "xyz", "target_qubit": [0],
+                          "control_qubit": [], "control_value": []})
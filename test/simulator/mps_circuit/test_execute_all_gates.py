@@ -0,0 +1,138 @@
+import random
+import unittest
+
+import numpy as np
+
+from quantestpy import MPSCircuit, StateVectorCircuit
+from quantestpy.simulator.exceptions import MPSCircuitError
+from quantestpy.simulator.state_vector_circuit import _GATE_REGISTRY
+
+
+class TestExecuteAllGates(unittest.TestCase):
+    """
+    How to execute this test:
+    $ pwd
+    {Your directory where you git-cloned quantestpy}/quantestpy
+    $ python -m unittest test.simulator.mps_circuit.test_execute_all_gates
+    .....
+    ----------------------------------------------------------------------
+    Ran 5 tests in 0.400s
+
+    OK
+    $
+    """
+
+    def _get_random_gates(self, num_qubit: int, num_gate: int) -> list:
+        gates = []
+        names = [name for name in _GATE_REGISTRY
+                 if _GATE_REGISTRY[name]["num_target"] <= num_qubit]
+        for _ in range(num_gate):
+            name = random.choice(names)
+            num_target = _GATE_REGISTRY[name]["num_target"]
+            qubits = random.sample(range(num_qubit), num_qubit)
+            if num_target == 1:
+                num_target = random.randint(1, num_qubit)
+            target_qubit = qubits[:num_target]
+            control_qubit = qubits[num_target:][:random.randint(0, 2)]
+            gates.append(
+                {"name": name, "target_qubit": target_qubit,
+                 "control_qubit": control_qubit,
+                 "control_value": [random.randint(0, 1)
+                                   for _ in control_qubit],
+                 "parameter": [random.uniform(-np.pi, np.pi) for _ in
+                               range(_GATE_REGISTRY[name]["num_param"])]})
+        return gates
+
+    def test_state_vector(self,):
+        random.seed(0)
+        for _ in range(20):
+            num_qubit = random.randint(1, 6)
+            gates = self._get_random_gates(num_qubit, 12)
+
+            svc = StateVectorCircuit(num_qubit)
+            mc = MPSCircuit(num_qubit)
+            for gate in gates:
+                svc.add_gate(dict(gate))
+                mc.add_gate(dict(gate))
+            mc._execute_all_gates()
+
+            np.testing.assert_allclose(
+                mc.get_state_vector(), svc._get_state_vector(), atol=1e-10)
+            self.assertLess(mc.truncation_error, 1e-20)
+
+    def test_queries(self,):
+        mc = MPSCircuit(3)
+        mc.add_gate({"name": "ry", "target_qubit": [0], "control_qubit": [],
+                     "control_value": [], "parameter": [np.pi/3]})
+        mc.add_gate({"name": "x", "target_qubit": [2], "control_qubit": [0],
+                     "control_value": [1], "parameter": []})
+        mc._execute_all_gates()
+
+        self.assertAlmostEqual(mc.get_probability_of_one(0), 0.25)
+        self.assertAlmostEqual(mc.get_probability_of_one(1), 0.)
+        self.assertAlmostEqual(mc.get_probability_of_one(2), 0.25)
+        self.assertAlmostEqual(mc.get_amplitude([0, 0, 0]), np.sqrt(0.75))
+        self.assertAlmostEqual(mc.get_amplitude([1, 0, 1]), 0.5)
+        self.assertAlmostEqual(mc.get_amplitude([1, 0, 0]), 0.)
+
+    def test_wide_shallow_circuit(self,):
+        """GHZ state of 300 qubits has the bond dimension 2."""
+        num_qubit = 300
+        mc = MPSCircuit(num_qubit)
+        mc.add_gate({"name": "h", "target_qubit": [0], "control_qubit": [],
+                     "control_value": [], "parameter": []})
+        for qubit in range(1, num_qubit):
+            mc.add_gate(
+                {"name": "x", "target_qubit": [qubit],
+                 "control_qubit": [qubit - 1], "control_value": [1],
+                 "parameter": []})
+        mc._execute_all_gates()
+
+        self.assertEqual(max(mc.bond_dimensions), 2)
+        self.assertAlmostEqual(mc.get_amplitude([1] * num_qubit),
+                               np.sqrt(0.5))
+        self.assertAlmostEqual(mc.get_probability_of_one(150), 0.5)
+
+    def test_truncation_error(self,):
+        random.seed(1)
+        num_qubit = 10
+        gates = []
+        for layer in range(6):
+            for qubit in range(num_qubit):
+                gates.append(
+                    {"name": "ry", "target_qubit": [qubit],
+                     "control_qubit": [], "control_value": [],
+                     "parameter": [random.uniform(0, np.pi)]})
+            for qubit in range(layer % 2, num_qubit - 1, 2):
+                gates.append(
+                    {"name": "x", "target_qubit": [qubit + 1],
+                     "control_qubit": [qubit], "control_value": [1],
+                     "parameter": []})
+
+        svc = StateVectorCircuit(num_qubit)
+        mc = MPSCircuit(num_qubit)
+        mc.max_bond_dimension = 2
+        for gate in gates:
+            svc.add_gate(dict(gate))
+            mc.add_gate(dict(gate))
+        mc._execute_all_gates()
+
+        self.assertEqual(max(mc.bond_dimensions), 2)
+        self.assertGreater(mc.truncation_error, 1e-4)
+        self.assertAlmostEqual(np.linalg.norm(mc.get_state_vector()), 1.)
+
+        # the truncation error bounds the infidelity to first order
+        fidelity = np.abs(np.vdot(svc._get_state_vector(),
+                                  mc.get_state_vector()))**2
+        self.assertLess(1 - fidelity, 2 * mc.truncation_error)
+
+    def test_invalid_input(self,):
+        mc = MPSCircuit(2)
+        with self.assertRaises(MPSCircuitError):
+            mc.max_bond_dimension = 0
+        with self.assertRaises(MPSCircuitError):
+            mc.precision = "float64"
+        with self.assertRaises(MPSCircuitError):
+            mc.add_gate({"name": "rx", "target_qubit": [0],
+                         "control_qubit": [], "control_value": [],
+                         "parameter": ["theta"]})
@@ -0,0 +1,61 @@
+import unittest
+
+from quantestpy import QuantestPyCircuit, StabilizerCircuit
+from quantestpy.simulator.exceptions import StabilizerCircuitError
+from quantestpy.simulator.stabilizer_circuit import is_clifford_circuit
+
+
+class TestAddGate(unittest.TestCase):
+    """
+    How to execute this test:
+    $ pwd
+    {Your directory where you git-cloned quantestpy}/quantestpy
+    $ python -m unittest test.simulator.stabilizer_circuit.test_add_gate
+    ...
+    ----------------------------------------------------------------------
+    Ran 3 tests in 0.001s
+
+    OK
+    $
+    """
+
+    def test_regular(self,):
+        circ = StabilizerCircuit(3)
+        gates = [
+            {"name": "h", "target_qubit": [0, 1], "control_qubit": [],
+             "control_value": [], "parameter": []},
+            {"name": "z", "target_qubit": [2], "control_qubit": [0],
+             "control_value": [0], "parameter": []},
+            {"name": "iswap", "target_qubit": [0, 2], "control_qubit": [],
+             "control_value": [], "parameter": []}
+        ]
+        for gate in gates:
+            circ.add_gate(gate)
+
+        self.assertEqual(circ.gates, gates)
+
+    def test_non_clifford_gates(self,):
+        circ = StabilizerCircuit(3)
+
+        for gate in [
+            {"name": "t", "target_qubit": [0], "control_qubit": [],
+             "control_value": [], "parameter": []},
+            {"name": "rx", "target_qubit": [0], "control_qubit": [],
+             "control_value": [], "parameter": [0.5]},
+            {"name": "h", "target_qubit": [0], "control_qubit": [1],
+             "control_value": [1], "parameter": []},
+            {"name": "x", "target_qubit": [0], "control_qubit": [1, 2],
+             "control_value": [1, 1], "parameter": []}
+        ]:
+            with self.assertRaises(StabilizerCircuitError):
+                circ.add_gate(gate)
+
+    def test_is_clifford_circuit(self,):
+        qc = QuantestPyCircuit(2)
+        qc.add_gate({"name": "x", "target_qubit": [1], "control_qubit": [0],
+                     "control_value": [1], "parameter": []})
+        self.assertTrue(is_clifford_circuit(qc))
+
+        qc.add_gate({"name": "t", "target_qubit": [1], "control_qubit": [],
+                     "control_value": [], "parameter": []})
+        self.assertFalse(is_clifford_circuit(qc))
@@ -0,0 +1,115 @@
+import itertools
+import unittest
+
+import numpy as np
+
+from quantestpy import StabilizerCircuit, StateVectorCircuit
+from quantestpy.simulator.stabilizer_circuit import _CONTROLLABLE_GATES
+
+
+class TestExecuteAllGates(unittest.TestCase):
+    """
+    How to execute this test:
+    $ pwd
+    {Your directory where you git-cloned quantestpy}/quantestpy
+    $ python -m unittest \
+        test.simulator.stabilizer_circuit.test_execute_all_gates
+    ...
+    ----------------------------------------------------------------------
+    Ran 3 tests in 0.120s
+
+    OK
+    $
+    """
+
+    def _get_matrix(self, num_qubit: int, gates: list) -> np.ndarray:
+        circ = StateVectorCircuit(num_qubit)
+        for gate in gates:
+            circ.add_gate(dict(gate))
+        return circ._get_whole_gates()
+
+    def _get_pauli(self, num_qubit: int, x: list, z: list) -> np.ndarray:
+        gates = []
+        for qubit in range(num_qubit):
+            name = {(1, 0): "x", (0, 1): "z", (1, 1): "y"}.get(
+                (int(x[qubit]), int(z[qubit])))
+            if name is not None:
+                gates.append(
+                    {"name": name, "target_qubit": [qubit],
+                     "control_qubit": [], "control_value": [],
+                     "parameter": []})
+        return self._get_matrix(num_qubit, gates)
+
+    def test_tableau_conjugates_pauli_operators(self,):
+        """Each row of the tableau is U P U^dagger for P = X_i, Z_i."""
+        gates = []
+        for name in ["x", "y", "z", "h", "s", "sdg"]:
+            gates.append(
+                {"name": name, "target_qubit": [0], "control_qubit": [],
+                 "control_value": [], "parameter": []})
+        for name, control_value in itertools.product(
+                _CONTROLLABLE_GATES, [0, 1]):
+            gates.append(
+                {"name": name, "target_qubit": [1], "control_qubit": [0],
+                 "control_value": [control_value], "parameter": []})
+        for name in ["swap", "iswap"]:
+            gates.append(
+                {"name": name, "target_qubit": [0, 1], "control_qubit": [],
+                 "control_value": [], "parameter": []})
+
+        for gate in gates:
+            circ = StabilizerCircuit(2)
+            circ.add_gate(dict(gate))
+            circ._execute_all_gates()
+            x, z, r = circ.tableau
+
+            unitary = self._get_matrix(2, [gate])
+            for row in range(4):
+                pauli = self._get_pauli(
+                    2, np.eye(2)[row] if row < 2 else [0, 0],
+                    np.eye(2)[row - 2] if row >= 2 else [0, 0])
+                expected = unitary @ pauli @ unitary.conj().T
+                actual = (-1)**r[row] * self._get_pauli(2, x[row], z[row])
+                np.testing.assert_allclose(actual, expected, atol=1e-12)
+
+    def test_z_value(self,):
+        circ = StabilizerCircuit(4)
+        # |1>, Bell pair and |-> measured in Z basis
+        circ.add_gate({"name": "y", "target_qubit": [0], "control_qubit": [],
+                       "control_value": [], "parameter": []})
+        circ.add_gate({"name": "h", "target_qubit": [1, 3],
+                       "control_qubit": [], "control_value": [],
+                       "parameter": []})
+        circ.add_gate({"name": "x", "target_qubit": [2], "control_qubit": [1],
+                       "control_value": [1], "parameter": []})
+        circ._execute_all_gates()
+
+        self.assertEqual(circ._get_z_value(0), 1)
+        self.assertIsNone(circ._get_z_value(1))
+        self.assertIsNone(circ._get_z_value(2))
+        self.assertIsNone(circ._get_z_value(3))
+
+    def test_z_value_after_uncomputation(self,):
+        num_qubit = 200
+        circ = StabilizerCircuit(num_qubit)
+        # GHZ state and its uncomputation leave all qubits 0 but the first
+        circ.add_gate({"name": "x", "target_qubit": [0], "control_qubit": [],
+                       "control_value": [], "parameter": []})
+        circ.add_gate({"name": "h", "target_qubit": [0], "control_qubit": [],
+                       "control_value": [], "parameter": []})
+        for qubit in range(1, num_qubit):
+            circ.add_gate(
+                {"name": "x", "target_qubit": [qubit],
+                 "control_qubit": [qubit - 1], "control_value": [1],
+                 "parameter": []})
+        for qubit in reversed(range(1, num_qubit)):
+            circ.add_gate(
+                {"name": "x", "target_qubit": [qubit],
+                 "control_qubit": [qubit - 1], "control_value": [1],
+                 "parameter": []})
+        circ._execute_all_gates()
+
+        self.assertIsNone(circ._get_z_value(0))
+        self.assertEqual(
+            [circ._get_z_value(qubit) for qubit in range(1, num_qubit)],
+            [0] * (num_qubit - 1))
@@ -101,14 +101,15 @@ class TestStateVectorCircuitAddGate(unittest.TestCase):
                      "target_qubit": [0],
                      "control_qubit": [],
                      "control_value": [],
-                     "parameter": ["a"]}
+                     "parameter": [None]}
                 )
             )
 
         except StateVectorCircuitError as e:
             expected_error_msg = \
                 "quantestpy.simulator.exceptions.StateVectorCircuitError: " \
-                + "Parameter(s) in p gate must be float or integer type.\n"
+                + "Parameter(s) in p gate must be float or integer type, " \
+                + "or str as the name of the parameter.\n"
 
             actual_error_msg = traceback.format_exception_only(type(e), e)[0]
 
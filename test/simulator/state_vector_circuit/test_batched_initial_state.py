@@ -0,0 +1,92 @@
+import unittest
+
+import numpy as np
+
+from quantestpy import StateVectorCircuit
+from quantestpy.simulator.exceptions import StateVectorCircuitError
+
+
+class TestBatchedInitialState(unittest.TestCase):
+    """
+    How to execute this test:
+    $ pwd
+    {Your directory where you git-cloned quantestpy}/quantestpy
+    $ python -m unittest \
+        test.simulator.state_vector_circuit.test_batched_initial_state
+    .....
+    ----------------------------------------------------------------------
+    Ran 5 tests in 0.005s
+
+    OK
+    """
+
+    def setUp(self) -> None:
+        self.circ = StateVectorCircuit(3)
+        self.circ.add_gate(
+            {"name": "h", "target_qubit": [0], "control_qubit": [],
+             "control_value": [], "parameter": []})
+        self.circ.add_gate(
+            {"name": "x", "target_qubit": [2], "control_qubit": [0],
+             "control_value": [1], "parameter": []})
+        self.circ.add_gate(
+            {"name": "rz", "target_qubit": [1], "control_qubit": [],
+             "control_value": [], "parameter": [0.7]})
+        self.circ.add_gate(
+            {"name": "swap", "target_qubit": [1, 2], "control_qubit": [],
+             "control_value": [], "parameter": []})
+
+        rng = np.random.default_rng(1)
+        self.batch = rng.normal(size=(8, 5)) + 1j*rng.normal(size=(8, 5))
+
+    def _get_state_vectors_one_by_one(self, batch: np.ndarray) -> list:
+        state_vecs = []
+        for i in range(batch.shape[1]):
+            self.circ.set_initial_state_vector(batch[:, i])
+            state_vecs.append(self.circ._get_state_vector())
+        return state_vecs
+
+    def test_batch_of_columns(self,):
+        expected_state_vecs = self._get_state_vectors_one_by_one(self.batch)
+
+        self.circ.set_initial_state_vector(self.batch)
+        actual_state_vecs = self.circ._get_state_vector()
+
+        self.assertEqual(actual_state_vecs.shape, (8, 5))
+        for i in range(5):
+            np.testing.assert_allclose(
+                actual_state_vecs[:, i], expected_state_vecs[i], atol=1e-12)
+
+    def test_batch_of_rows(self,):
+        expected_state_vecs = self._get_state_vectors_one_by_one(self.batch)
+
+        self.circ.set_initial_state_vector(self.batch.T)
+        actual_state_vecs = self.circ._get_state_vector()
+
+        self.assertEqual(actual_state_vecs.shape, (5, 8))
+        for i in range(5):
+            np.testing.assert_allclose(
+                actual_state_vecs[i], expected_state_vecs[i], atol=1e-12)
+
+    def test_square_batch_is_taken_as_columns(self,):
+        identity = np.eye(8)
+
+        self.circ.set_initial_state_vector(identity)
+        actual_state_vecs = self.circ._get_state_vector()
+
+        np.testing.assert_allclose(
+            actual_state_vecs, self.circ._get_whole_gates(), atol=1e-12)
+
+    def test_initial_state_is_not_changed(self,):
+        batch = self.batch.copy()
+
+        self.circ.compile().get_state_vector(self.batch)
+        self.circ.compile().get_state_vector(self.batch.T)
+
+        np.testing.assert_array_equal(self.batch, batch)
+
+    def test_invalid_shape(self,):
+        with self.assertRaises(StateVectorCircuitError):
+            self.circ.set_initial_state_vector(np.zeros((4, 5)))
+
+        with self.assertRaises(StateVectorCircuitError):
+            self.circ.set_initial_state_vector(np.zeros((8, 5, 2)))
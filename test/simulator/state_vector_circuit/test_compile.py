@@ -0,0 +1,110 @@
+import unittest
+
+import numpy as np
+
+from quantestpy import StateVectorCircuit
+from quantestpy.simulator.exceptions import StateVectorCircuitError
+from quantestpy.simulator.state_vector_circuit import StateVectorCircuitPlan
+
+
+class TestStateVectorCircuitCompile(unittest.TestCase):
+    """
+    How to execute this test:
+    $ pwd
+    {Your directory where you git-cloned quantestpy}/quantestpy
+    $ python -m unittest \
+        test.simulator.state_vector_circuit.test_compile
+    ......
+    ----------------------------------------------------------------------
+    Ran 6 tests in 0.005s
+
+    OK
+    """
+
+    def setUp(self) -> None:
+        self.circ = StateVectorCircuit(3)
+        self.circ.add_gate(
+            {"name": "h", "target_qubit": [0], "control_qubit": [],
+             "control_value": [], "parameter": []})
+        self.circ.add_gate(
+            {"name": "t", "target_qubit": [1], "control_qubit": [],
+             "control_value": [], "parameter": []})
+        self.circ.add_gate(
+            {"name": "x", "target_qubit": [2], "control_qubit": [0],
+             "control_value": [1], "parameter": []})
+        self.circ.add_gate(
+            {"name": "swap", "target_qubit": [0, 1], "control_qubit": [2],
+             "control_value": [0], "parameter": []})
+        self.circ.add_gate(
+            {"name": "ry", "target_qubit": [1], "control_qubit": [0],
+             "control_value": [1], "parameter": [0.3]})
+
+    def test_kind_of_operations(self,):
+        plan = self.circ.compile()
+
+        self.assertIsInstance(plan, StateVectorCircuitPlan)
+        self.assertEqual(plan.num_qubit, 3)
+        self.assertEqual(
+            [operation[0] for operation in plan.operations],
+            ["single", "phase", "permutation", "single"]
+        )
+
+    def test_operations_are_read_only(self,):
+        plan = self.circ.compile()
+
+        self.assertIsInstance(plan.operations, tuple)
+        for operation in plan.operations:
+            self.assertIsInstance(operation, tuple)
+            for element in operation:
+                if isinstance(element, np.ndarray):
+                    self.assertFalse(element.flags.writeable)
+
+    def test_execute_against_many_initial_states(self,):
+        plan = self.circ.compile()
+
+        rng = np.random.default_rng(0)
+        for _ in range(5):
+            initial_state_vector = rng.normal(size=8) + 1j*rng.normal(size=8)
+            initial_state_vector /= np.linalg.norm(initial_state_vector)
+            copied_initial_state_vector = initial_state_vector.copy()
+
+            self.circ.set_initial_state_vector(initial_state_vector)
+            expected_state_vector = self.circ._get_state_vector()
+            actual_state_vector = plan.get_state_vector(initial_state_vector)
+
+            np.testing.assert_allclose(
+                actual_state_vector, expected_state_vector, atol=1e-12)
+            # the initial state is not changed by the plan
+            np.testing.assert_array_equal(
+                initial_state_vector, copied_initial_state_vector)
+
+    def test_whole_gates(self,):
+        plan = self.circ.compile()
+
+        np.testing.assert_allclose(
+            plan.get_whole_gates(), self.circ._get_whole_gates(),
+            atol=1e-12)
+        # the plan gives the same result when executed again
+        np.testing.assert_allclose(
+            plan.get_whole_gates(), self.circ._get_whole_gates(),
+            atol=1e-12)
+
+    def test_plan_is_independent_of_later_gates(self,):
+        plan = self.circ.compile()
+        expected_state_vector = plan.get_state_vector()
+
+        self.circ.add_gate(
+            {"name": "x", "target_qubit": [0], "control_qubit": [],
+             "control_value": [], "parameter": []})
+
+        np.testing.assert_allclose(
+            plan.get_state_vector(), expected_state_vector, atol=1e-12)
+
+    def test_invalid_initial_state_vector(self,):
+        plan = self.circ.compile()
+
+        with self.assertRaises(StateVectorCircuitError):
+            plan.get_state_vector([1, 0, 0, 0, 0, 0, 0, 0])
+
+        with self.assertRaises(StateVectorCircuitError):
+            plan.get_state_vector(np.array([1, 0]))
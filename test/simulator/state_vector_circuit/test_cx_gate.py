@@ -14,7 +14,7 @@ class TestStateVectorCircuitCXGate(unittest.TestCase):
     $ python -m unittest test.simulator.state_vector_circuit.test_cx_gate
     ........
     ----------------------------------------------------------------------
-    Ran 8 tests in 0.009s
+    Ran 10 tests in 0.009s
 
     OK
     $
@@ -154,3 +154,35 @@ class TestStateVectorCircuitCXGate(unittest.TestCase):
 
         self.assertIsNone(
             np.testing.assert_allclose(gate_0, np.matmul(gate_1_0, gate_1_1)))
+
+    def test_multi_controlled_x(self,):
+        circ = StateVectorCircuit(7)
+        actual_gate = circ._create_all_qubit_gate_from_original_qubit_gate(
+            _X,
+            control_qubit=[0, 1, 2, 3, 4, 5],
+            target_qubit=[6],
+            control_value=[1, 0, 1, 1, 0, 1])
+
+        # flips qubit 6 only for |101101>
+        expected_gate = np.eye(2**7)
+        expected_gate[[90, 91]] = expected_gate[[91, 90]]
+
+        self.assertIsNone(
+            np.testing.assert_allclose(actual_gate, expected_gate))
+
+    def test_multi_controlled_x_state_vector(self,):
+        circ = StateVectorCircuit(7)
+        init_vec = np.zeros(2**7)
+        init_vec[90] = 1.
+        circ.set_initial_state_vector(init_vec)
+        circ.add_gate(
+            {"name": "x", "control_qubit": [0, 1, 2, 3, 4, 5],
+             "target_qubit": [6], "control_value": [1, 0, 1, 1, 0, 1],
+             "parameter": []})
+        actual_vec = circ._get_state_vector()
+
+        expected_vec = np.zeros(2**7)
+        expected_vec[91] = 1.
+
+        self.assertIsNone(
+            np.testing.assert_allclose(actual_vec, expected_vec))
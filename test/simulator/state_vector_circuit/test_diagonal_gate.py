@@ -0,0 +1,135 @@
+import unittest
+
+import numpy as np
+
+from quantestpy import StateVectorCircuit
+
+
+class TestStateVectorCircuitDiagonalGate(unittest.TestCase):
+    """
+    How to execute this test:
+    $ pwd
+    {Your directory where you git-cloned quantestpy}/quantestpy
+    $ python -m unittest test.simulator.state_vector_circuit.test_diagonal_gate
+    ......
+    ----------------------------------------------------------------------
+    Ran 6 tests in 0.003s
+
+    OK
+    $
+    """
+
+    def test_merge_consecutive_diagonal_gates(self,):
+        circ = StateVectorCircuit(2)
+        circ.add_gate({"name": "s", "target_qubit": [0], "control_qubit": [],
+                       "control_value": [], "parameter": []})
+        circ.add_gate(
+            {"name": "p", "target_qubit": [1], "control_qubit": [0],
+             "control_value": [1], "parameter": [np.pi/2]})
+        circ.add_gate({"name": "h", "target_qubit": [0], "control_qubit": [],
+                       "control_value": [], "parameter": []})
+        circ.add_gate({"name": "z", "target_qubit": [1], "control_qubit": [],
+                       "control_value": [], "parameter": []})
+
+        merged_gates = list(circ._merge_gates(circ.gates))
+
+        self.assertEqual([kind for kind, _ in merged_gates],
+                         ["phase", "gate", "phase"])
+        phase_tensor, axes = merged_gates[0][1]
+        self.assertEqual(axes, (0, 1))
+        self.assertIsNone(
+            np.testing.assert_allclose(
+                np.ravel(phase_tensor), np.array([1, 1, 1j, -1])))
+        self.assertEqual(merged_gates[1][1]["name"], "h")
+        phase_tensor, axes = merged_gates[2][1]
+        self.assertEqual(axes, (1,))
+        self.assertIsNone(
+            np.testing.assert_allclose(
+                np.ravel(phase_tensor), np.array([1, -1])))
+
+    def test_merged_run_is_split_at_max_merged_qubits(self,):
+        circ = StateVectorCircuit(12)
+        circ.add_gate(
+            {"name": "t", "target_qubit": list(range(12)),
+             "control_qubit": [], "control_value": [], "parameter": []})
+
+        merged_gates = list(circ._merge_gates(circ.gates))
+
+        self.assertEqual([kind for kind, _ in merged_gates],
+                         ["phase", "phase"])
+        self.assertEqual(merged_gates[0][1][1], tuple(range(10)))
+        self.assertEqual(merged_gates[1][1][1], (10, 11))
+        self.assertEqual(merged_gates[0][1][0].shape, (2,)*10)
+
+    def test_single_controlled_diagonal_gate_acts_on_control_slice(self,):
+        circ = StateVectorCircuit(3)
+        circ.add_gate(
+            {"name": "h", "target_qubit": [0, 1, 2], "control_qubit": [],
+             "control_value": [], "parameter": []})
+        circ.add_gate(
+            {"name": "p", "target_qubit": [2], "control_qubit": [0, 1],
+             "control_value": [1, 0], "parameter": [np.pi/4]})
+        plan = circ.compile()
+
+        kind, phase_tensor, control_index, axes = plan.operations[-1]
+        self.assertEqual(kind, "phase")
+        self.assertEqual(control_index[:2], (1, 0))
+        self.assertEqual(axes, (0,))
+        self.assertIsNone(
+            np.testing.assert_allclose(
+                phase_tensor, np.array([1, np.exp(1j*np.pi/4)])))
+
+        expected_vec = np.array(
+            [1, 1, 1, 1, 1, np.exp(1j*np.pi/4), 1, 1]) / np.sqrt(8.)
+        self.assertIsNone(
+            np.testing.assert_allclose(plan.get_state_vector(), expected_vec))
+
+    def test_controlled_phase_state_vector(self,):
+        circ = StateVectorCircuit(3)
+        init_vec = np.ones(8) / np.sqrt(8.)
+        circ.set_initial_state_vector(init_vec)
+        circ.add_gate(
+            {"name": "p", "target_qubit": [2], "control_qubit": [0, 1],
+             "control_value": [1, 0], "parameter": [np.pi/4]})
+        circ.add_gate(
+            {"name": "z", "target_qubit": [0], "control_qubit": [],
+             "control_value": [], "parameter": []})
+        actual_vec = circ._get_state_vector()
+
+        expected_vec = np.array(
+            [1, 1, 1, 1, -1, -np.exp(1j*np.pi/4), -1, -1]) / np.sqrt(8.)
+
+        self.assertIsNone(
+            np.testing.assert_allclose(actual_vec, expected_vec))
+
+    def test_scalar_whole_gates(self,):
+        circ = StateVectorCircuit(2)
+        circ.add_gate(
+            {"name": "scalar", "target_qubit": [0], "control_qubit": [],
+             "control_value": [], "parameter": [np.pi/3]})
+        actual_gate = circ._get_whole_gates()
+
+        expected_gate = np.eye(4) * np.exp(1j*np.pi/3)
+
+        self.assertIsNone(
+            np.testing.assert_allclose(actual_gate, expected_gate))
+
+    def test_rz_row_scaling_qiskit_qubit_order(self,):
+        circ = StateVectorCircuit(2)
+        circ._from_right_to_left_for_qubit_ids = True
+        circ.add_gate({"name": "x", "target_qubit": [0], "control_qubit": [],
+                       "control_value": [], "parameter": []})
+        circ.add_gate(
+            {"name": "rz", "target_qubit": [0], "control_qubit": [],
+             "control_value": [], "parameter": [np.pi/2]})
+        actual_gate = circ._get_whole_gates()
+
+        e_m = np.exp(-1j*np.pi/4)
+        e_p = np.exp(1j*np.pi/4)
+        expected_gate = np.array([[0, e_m, 0, 0],
+                                  [e_p, 0, 0, 0],
+                                  [0, 0, 0, e_m],
+                                  [0, 0, e_p, 0]])
+
+        self.assertIsNone(
+            np.testing.assert_allclose(actual_gate, expected_gate))
@@ -0,0 +1,152 @@
+import unittest
+
+import numpy as np
+
+from quantestpy import StateVectorCircuit
+
+
+class TestStateVectorCircuitGateFusion(unittest.TestCase):
+    """
+    How to execute this test:
+    $ pwd
+    {Your directory where you git-cloned quantestpy}/quantestpy
+    $ python -m unittest test.simulator.state_vector_circuit.test_gate_fusion
+    .......
+    ----------------------------------------------------------------------
+    Ran 7 tests in 0.004s
+
+    OK
+    $
+    """
+
+    def test_fuse_consecutive_gates_on_same_qubit(self,):
+        circ = StateVectorCircuit(2)
+        circ.add_gate({"name": "h", "target_qubit": [0], "control_qubit": [],
+                       "control_value": [], "parameter": []})
+        circ.add_gate({"name": "h", "target_qubit": [1], "control_qubit": [],
+                       "control_value": [], "parameter": []})
+        circ.add_gate(
+            {"name": "rz", "target_qubit": [0], "control_qubit": [],
+             "control_value": [], "parameter": [0.3]})
+        circ.add_gate({"name": "h", "target_qubit": [0], "control_qubit": [],
+                       "control_value": [], "parameter": []})
+
+        fused_gates = circ._fuse_gates_on_single_qubit(circ.gates)
+
+        self.assertEqual(len(fused_gates), 2)
+        self.assertEqual(fused_gates[0]["name"], "fused")
+        self.assertEqual(fused_gates[0]["target_qubit"], [0])
+        self.assertEqual(fused_gates[1]["name"], "h")
+
+    def test_not_fuse_over_gate_on_same_qubit(self,):
+        circ = StateVectorCircuit(2)
+        circ.add_gate({"name": "h", "target_qubit": [0], "control_qubit": [],
+                       "control_value": [], "parameter": []})
+        circ.add_gate(
+            {"name": "x", "target_qubit": [1], "control_qubit": [0],
+             "control_value": [1], "parameter": []})
+        circ.add_gate({"name": "h", "target_qubit": [0], "control_qubit": [],
+                       "control_value": [], "parameter": []})
+        circ.add_gate(
+            {"name": "y", "target_qubit": [1], "control_qubit": [0],
+             "control_value": [0], "parameter": []})
+
+        fused_gates = circ._fuse_gates_on_single_qubit(circ.gates)
+
+        self.assertEqual([gate["name"] for gate in fused_gates],
+                         ["h", "x", "h", "y"])
+
+    def test_fusion_report(self,):
+        circ = StateVectorCircuit(3)
+        circ.add_gate(
+            {"name": "x", "target_qubit": [0, 1, 2], "control_qubit": [],
+             "control_value": [], "parameter": []})
+        circ.add_gate(
+            {"name": "ry", "target_qubit": [2], "control_qubit": [],
+             "control_value": [], "parameter": [0.5]})
+        circ._get_state_vector()
+
+        self.assertEqual(circ._fusion_report,
+                         {"num_gates_before": 2, "num_gates_after": 3})
+
+    def test_fused_and_not_fused_are_equal(self,):
+        circ = StateVectorCircuit(2)
+        circ.add_gate(
+            {"name": "u", "target_qubit": [1], "control_qubit": [0],
+             "control_value": [0], "parameter": [0.1, 0.2, 0.3, 0.4]})
+        circ.add_gate(
+            {"name": "rx", "target_qubit": [1], "control_qubit": [0],
+             "control_value": [0], "parameter": [0.5]})
+        circ.add_gate({"name": "t", "target_qubit": [1], "control_qubit": [],
+                       "control_value": [], "parameter": []})
+        circ.add_gate({"name": "h", "target_qubit": [1], "control_qubit": [],
+                       "control_value": [], "parameter": []})
+        fused_gate = circ._get_whole_gates()
+        self.assertEqual(circ._fusion_report["num_gates_after"], 2)
+
+        circ._fuse_single_qubit_gates = False
+        not_fused_gate = circ._get_whole_gates()
+
+        self.assertIsNone(
+            np.testing.assert_allclose(fused_gate, not_fused_gate))
+
+    def test_fuse_gates_into_blocks(self,):
+        circ = StateVectorCircuit(4)
+        circ.add_gate({"name": "h", "target_qubit": [0], "control_qubit": [],
+                       "control_value": [], "parameter": []})
+        circ.add_gate(
+            {"name": "x", "target_qubit": [1], "control_qubit": [0],
+             "control_value": [1], "parameter": []})
+        circ.add_gate({"name": "h", "target_qubit": [3], "control_qubit": [],
+                       "control_value": [], "parameter": []})
+        circ.add_gate(
+            {"name": "x", "target_qubit": [2], "control_qubit": [1],
+             "control_value": [1], "parameter": []})
+        circ.add_gate(
+            {"name": "swap", "target_qubit": [2, 3], "control_qubit": [],
+             "control_value": [], "parameter": []})
+
+        fused_gates = circ._fuse_gates_into_blocks(
+            circ.gates, max_block_qubits=3)
+
+        self.assertEqual([gate["name"] for gate in fused_gates],
+                         ["block", "block"])
+        self.assertEqual(fused_gates[0]["target_qubit"], [0, 1, 2])
+        self.assertEqual(fused_gates[1]["target_qubit"], [2, 3])
+
+    def test_not_fuse_gate_larger_than_block(self,):
+        circ = StateVectorCircuit(3)
+        circ.add_gate(
+            {"name": "x", "target_qubit": [2], "control_qubit": [0, 1],
+             "control_value": [1, 1], "parameter": []})
+        circ.add_gate({"name": "h", "target_qubit": [2], "control_qubit": [],
+                       "control_value": [], "parameter": []})
+
+        fused_gates = circ._fuse_gates_into_blocks(
+            circ.gates, max_block_qubits=2)
+
+        self.assertEqual(fused_gates, circ.gates)
+
+    def test_block_fused_and_not_fused_are_equal(self,):
+        circ = StateVectorCircuit(4)
+        circ._from_right_to_left_for_qubit_ids = True
+        circ.add_gate(
+            {"name": "h", "target_qubit": [0, 1, 2, 3], "control_qubit": [],
+             "control_value": [], "parameter": []})
+        circ.add_gate(
+            {"name": "p", "target_qubit": [0], "control_qubit": [3],
+             "control_value": [1], "parameter": [0.3]})
+        circ.add_gate(
+            {"name": "iswap", "target_qubit": [2, 1], "control_qubit": [],
+             "control_value": [], "parameter": []})
+        circ.add_gate(
+            {"name": "ry", "target_qubit": [1], "control_qubit": [0],
+             "control_value": [0], "parameter": [0.7]})
+        not_fused_vec = circ._get_state_vector()
+
+        circ._max_block_fusion_qubits = 3
+        fused_vec = circ._get_state_vector()
+
+        self.assertEqual(circ._fusion_report["num_gates_after"], 2)
+        self.assertIsNone(
+            np.testing.assert_allclose(fused_vec, not_fused_vec))
@@ -0,0 +1,111 @@
+import unittest
+
+import numpy as np
+
+from quantestpy import StateVectorCircuit
+from quantestpy.simulator.exceptions import StateVectorCircuitError
+from quantestpy.simulator.state_vector_circuit import (_GATE_REGISTRY,
+                                                       _get_gate_matrix,
+                                                       _register_gate)
+
+
+def _rzz(parameter: list) -> np.ndarray:
+    theta = parameter[0]
+    return np.diag(np.exp(-1j*theta/2*np.array([1, -1, -1, 1])))
+
+
+class TestStateVectorCircuitGateRegistry(unittest.TestCase):
+    """
+    How to execute this test:
+    $ pwd
+    {Your directory where you git-cloned quantestpy}/quantestpy
+    $ python -m unittest \
+        test.simulator.state_vector_circuit.test_gate_registry
+    ......
+    ----------------------------------------------------------------------
+    Ran 6 tests in 0.004s
+
+    OK
+    $
+    """
+
+    def tearDown(self,):
+        for name in ("rzz", "cnot_10"):
+            _GATE_REGISTRY.pop(name, None)
+
+    def test_parametric_gate_matrix_is_memoised(self,):
+        matrix_0 = _get_gate_matrix("rx", [0.3])
+        matrix_1 = _get_gate_matrix("rx", [0.3])
+
+        self.assertIs(matrix_0, matrix_1)
+        self.assertFalse(matrix_0.flags.writeable)
+
+    def test_register_diagonal_two_qubit_gate(self,):
+        _register_gate("rzz", builder=_rzz, num_param=1, num_target=2,
+                       is_diagonal=True)
+        circ = StateVectorCircuit(3)
+        circ.add_gate(
+            {"name": "rzz", "target_qubit": [2, 0], "control_qubit": [],
+             "control_value": [], "parameter": [0.4]})
+
+        self.assertEqual(circ._get_gate_kind(circ.gates[0]), "phase")
+
+        actual_gate = circ._get_whole_gates()
+
+        # parity of qubits 0 and 2
+        parity = np.array([1, -1, 1, -1, -1, 1, -1, 1])
+        expected_gate = np.diag(np.exp(-1j*0.2*parity))
+
+        self.assertIsNone(
+            np.testing.assert_allclose(actual_gate, expected_gate))
+
+    def test_register_controlled_two_qubit_gate(self,):
+        # cnot whose control is the second target qubit
+        _register_gate("cnot_10", [[1, 0, 0, 0],
+                                   [0, 0, 0, 1],
+                                   [0, 0, 1, 0],
+                                   [0, 1, 0, 0]], num_target=2)
+        circ = StateVectorCircuit(3)
+        circ.add_gate(
+            {"name": "cnot_10", "target_qubit": [1, 2], "control_qubit": [0],
+             "control_value": [1], "parameter": []})
+        actual_gate = circ._get_whole_gates()
+
+        expected_gate = np.eye(8)[[0, 1, 2, 3, 4, 7, 6, 5]]
+
+        self.assertIsNone(
+            np.testing.assert_allclose(actual_gate, expected_gate))
+
+    def test_sweep_of_registered_gate(self,):
+        _register_gate("rzz", builder=_rzz, num_param=1, num_target=2,
+                       is_diagonal=True)
+        circ = StateVectorCircuit(2)
+        circ.add_gate(
+            {"name": "rzz", "target_qubit": [0, 1], "control_qubit": [],
+             "control_value": [], "parameter": ["theta"]})
+        thetas = np.array([0.1, 0.2, 0.3])
+        actual_gates = circ.compile() \
+            .bind_parameters({"theta": thetas}).get_whole_gates()
+
+        expected_gates = np.array([_rzz([theta]) for theta in thetas])
+
+        self.assertIsNone(
+            np.testing.assert_allclose(actual_gates, expected_gates))
+
+    def test_not_registered_gate(self,):
+        circ = StateVectorCircuit(1)
+
+        with self.assertRaises(StateVectorCircuitError):
+            circ.add_gate(
+                {"name": "rzz", "target_qubit": [0], "control_qubit": [],
+                 "control_value": [], "parameter": [0.4]})
+
+    def test_number_of_target_qubits(self,):
+        _register_gate("rzz", builder=_rzz, num_param=1, num_target=2,
+                       is_diagonal=True)
+        circ = StateVectorCircuit(3)
+
+        with self.assertRaises(StateVectorCircuitError):
+            circ.add_gate(
+                {"name": "rzz", "target_qubit": [0, 1, 2],
+                 "control_qubit": [], "control_value": [], "parameter": [0.4]})
@@ -14,7 +14,7 @@ class TestStateVectorCircuitGetWholeGates(unittest.TestCase):
         unittest test.simulator.state_vector_circuit.test_get_whole_gates
     ............................
     ----------------------------------------------------------------------
-    Ran 28 tests in 0.012s
+    Ran 31 tests in 0.012s
 
     OK
     $
@@ -552,3 +552,34 @@ class TestStateVectorCircuitGetWholeGates(unittest.TestCase):
         self.assertIsNone(
             np.testing.assert_allclose(actual_gate, expected_gate,
                                        atol=1e-16))
+
+    def test_get_whole_gates_equal_to_product_of_all_qubit_gates(self,):
+        circ = StateVectorCircuit(3)
+        circ._from_right_to_left_for_qubit_ids = True
+        gates = [
+            {"name": "h", "target_qubit": [0], "control_qubit": [],
+             "control_value": [], "parameter": []},
+            {"name": "ry", "target_qubit": [2], "control_qubit": [0],
+             "control_value": [1], "parameter": [0.4]},
+            {"name": "u", "target_qubit": [1], "control_qubit": [2, 0],
+             "control_value": [0, 1], "parameter": [0.1, 0.2, 0.3, 0.4]},
+            {"name": "y", "target_qubit": [0, 2], "control_qubit": [],
+             "control_value": [], "parameter": []}
+        ]
+        expected_gate = np.eye(8)
+        for gate in gates:
+            circ.add_gate(gate)
+            all_qubit_gate = \
+                circ._create_all_qubit_gate_from_original_qubit_gate(
+                    circ._get_original_qubit_gate(gate),
+                    gate["control_qubit"],
+                    gate["target_qubit"],
+                    gate["control_value"]
+                )
+            expected_gate = np.matmul(all_qubit_gate, expected_gate)
+
+        actual_gate = circ._get_whole_gates()
+
+        self.assertIsNone(
+            np.testing.assert_allclose(actual_gate, expected_gate,
+                                       atol=1e-12))
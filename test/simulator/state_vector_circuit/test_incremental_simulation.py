@@ -0,0 +1,165 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from quantestpy import StateVectorCircuit
+
+
+class TestIncrementalSimulation(unittest.TestCase):
+    """
+    How to execute this test:
+    $ pwd
+    {Your directory where you git-cloned quantestpy}/quantestpy
+    $ python -m unittest \
+        test.simulator.state_vector_circuit.test_incremental_simulation
+    .......
+    ----------------------------------------------------------------------
+    Ran 7 tests in 0.010s
+
+    OK
+    """
+
+    def _add_gates(self, circ: StateVectorCircuit) -> None:
+        circ.add_gate({"name": "h", "target_qubit": [0],
+                       "control_qubit": [], "control_value": [],
+                       "parameter": []})
+        circ.add_gate({"name": "x", "target_qubit": [1],
+                       "control_qubit": [0], "control_value": [1],
+                       "parameter": []})
+        circ.add_gate({"name": "rz", "target_qubit": [2],
+                       "control_qubit": [1], "control_value": [1],
+                       "parameter": [0.3]})
+
+    def _get_fresh_circuit(self, circ: StateVectorCircuit) \
+            -> StateVectorCircuit:
+        fresh_circ = StateVectorCircuit(circ.num_qubit)
+        fresh_circ._from_right_to_left_for_qubit_ids = \
+            circ._from_right_to_left_for_qubit_ids
+        for gate in circ.gates:
+            fresh_circ.add_gate(dict(gate))
+        if circ._initial_state_vector is not None:
+            fresh_circ.set_initial_state_vector(circ._initial_state_vector)
+        return fresh_circ
+
+    def test_only_appended_gates_are_applied(self,):
+        circ = StateVectorCircuit(3)
+        self._add_gates(circ)
+        circ._get_state_vector()
+        circ._get_whole_gates()
+
+        circ.add_gate({"name": "y", "target_qubit": [2],
+                       "control_qubit": [], "control_value": [],
+                       "parameter": []})
+
+        with mock.patch.object(
+                StateVectorCircuit, "compile", autospec=True,
+                side_effect=StateVectorCircuit.compile) as compile_:
+            state_vec = circ._get_state_vector()
+            whole_gates = circ._get_whole_gates()
+
+        self.assertEqual(
+            [len(call.args[0].gates) for call in compile_.call_args_list],
+            [1, 1])
+
+        fresh_circ = self._get_fresh_circuit(circ)
+        np.testing.assert_allclose(
+            state_vec, fresh_circ._get_state_vector(), atol=1e-12)
+        np.testing.assert_allclose(
+            whole_gates, fresh_circ._get_whole_gates(), atol=1e-12)
+
+    def test_mutation_of_earlier_gate_invalidates_cache(self,):
+        circ = StateVectorCircuit(3)
+        self._add_gates(circ)
+        circ._get_state_vector()
+        circ._get_whole_gates()
+
+        circ.gates[1]["control_value"] = [0]
+        fresh_circ = self._get_fresh_circuit(circ)
+
+        np.testing.assert_allclose(
+            circ._get_state_vector(), fresh_circ._get_state_vector(),
+            atol=1e-12)
+        np.testing.assert_allclose(
+            circ._get_whole_gates(), fresh_circ._get_whole_gates(),
+            atol=1e-12)
+
+        del circ.gates[0]
+        fresh_circ = self._get_fresh_circuit(circ)
+
+        np.testing.assert_allclose(
+            circ._get_state_vector(), fresh_circ._get_state_vector(),
+            atol=1e-12)
+
+    def test_mutation_of_parameter_in_place_invalidates_cache(self,):
+        circ = StateVectorCircuit(3)
+        self._add_gates(circ)
+        circ._get_state_vector()
+        circ._get_whole_gates()
+
+        circ.gates[2]["parameter"][0] = 1.2
+        fresh_circ = self._get_fresh_circuit(circ)
+
+        np.testing.assert_allclose(
+            circ._get_state_vector(), fresh_circ._get_state_vector(),
+            atol=1e-12)
+        np.testing.assert_allclose(
+            circ._get_whole_gates(), fresh_circ._get_whole_gates(),
+            atol=1e-12)
+
+    def test_operator_beyond_chunk_is_not_cached(self,):
+        circ = StateVectorCircuit(3)
+        self._add_gates(circ)
+        circ._get_whole_gates()
+        self.assertIsNotNone(circ._whole_gates_cache)
+
+        with mock.patch(
+                "quantestpy.simulator.state_vector_circuit."
+                "_MEMMAP_CHUNK_SIZE", 2**5):
+            whole_gates = circ._get_whole_gates()
+
+        self.assertIsNone(circ._whole_gates_cache)
+        np.testing.assert_allclose(
+            whole_gates, self._get_fresh_circuit(circ)._get_whole_gates(),
+            atol=1e-12)
+
+    def test_initial_state_vector_invalidates_cache(self,):
+        circ = StateVectorCircuit(3)
+        self._add_gates(circ)
+        initial_state_vector = np.eye(8, dtype=complex)[3]
+        circ.set_initial_state_vector(initial_state_vector)
+        circ._get_state_vector()
+
+        # modified in place
+        initial_state_vector[:] = np.eye(8)[5]
+        fresh_circ = self._get_fresh_circuit(circ)
+
+        np.testing.assert_allclose(
+            circ._get_state_vector(), fresh_circ._get_state_vector(),
+            atol=1e-12)
+
+    def test_settings_invalidate_cache(self,):
+        circ = StateVectorCircuit(3)
+        self._add_gates(circ)
+        circ._get_state_vector()
+        circ._get_whole_gates()
+
+        circ._from_right_to_left_for_qubit_ids = True
+        fresh_circ = self._get_fresh_circuit(circ)
+
+        np.testing.assert_allclose(
+            circ._get_state_vector(), fresh_circ._get_state_vector(),
+            atol=1e-12)
+        np.testing.assert_allclose(
+            circ._get_whole_gates(), fresh_circ._get_whole_gates(),
+            atol=1e-12)
+
+    def test_returned_state_vector_does_not_change_cache(self,):
+        circ = StateVectorCircuit(3)
+        self._add_gates(circ)
+        state_vec = circ._get_state_vector()
+        expected = state_vec.copy()
+
+        state_vec[:] = 0.
+
+        np.testing.assert_allclose(circ._get_state_vector(), expected)
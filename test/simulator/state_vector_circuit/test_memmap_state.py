@@ -0,0 +1,168 @@
+import gc
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from quantestpy import StateVectorCircuit
+from quantestpy.simulator.state_vector_circuit import StateVectorCircuitPlan
+
+
+class TestMemmapState(unittest.TestCase):
+    """
+    How to execute this test:
+    $ pwd
+    {Your directory where you git-cloned quantestpy}/quantestpy
+    $ python -m unittest \
+        test.simulator.state_vector_circuit.test_memmap_state
+    ......
+    ----------------------------------------------------------------------
+    Ran 6 tests in 0.012s
+
+    OK
+    """
+
+    def setUp(self) -> None:
+        self.circ = StateVectorCircuit(4)
+        self.circ.add_gate(
+            {"name": "h", "target_qubit": [0, 1, 3], "control_qubit": [],
+             "control_value": [], "parameter": []})
+        self.circ.add_gate(
+            {"name": "x", "target_qubit": [2], "control_qubit": [0, 3],
+             "control_value": [1, 0], "parameter": []})
+        self.circ.add_gate(
+            {"name": "t", "target_qubit": [1], "control_qubit": [2],
+             "control_value": [1], "parameter": []})
+        self.circ.add_gate(
+            {"name": "iswap", "target_qubit": [3, 0], "control_qubit": [1],
+             "control_value": [1], "parameter": []})
+        self.circ.add_gate(
+            {"name": "u", "target_qubit": [2], "control_qubit": [],
+             "control_value": [], "parameter": ["theta", 0.2, 0.3, 0.4]})
+        self.circ.add_gate(
+            {"name": "rx", "target_qubit": [3], "control_qubit": [0],
+             "control_value": [1], "parameter": [0.7]})
+
+    def _get_mapped_files(self, memmap_dir: str) -> list:
+        # the temporary files are unlinked at once, but stay mapped
+        with open("/proc/self/maps") as maps:
+            return [line for line in maps if memmap_dir in line]
+
+    def test_state_vector_matches_ram(self,):
+        for from_right_to_left in [False, True]:
+            self.circ._from_right_to_left_for_qubit_ids = from_right_to_left
+            self.circ._memmap_dir = None
+            expected = self.circ.compile() \
+                .bind_parameters({"theta": 0.5}).get_state_vector()
+
+            with tempfile.TemporaryDirectory() as memmap_dir:
+                self.circ._memmap_dir = memmap_dir
+                self.circ._memmap_chunk_size = 2
+                plan = self.circ.compile().bind_parameters({"theta": 0.5})
+                actual = plan.get_state_vector()
+
+                self.assertEqual(plan.memmap_dir, memmap_dir)
+                np.testing.assert_allclose(actual, expected, atol=1e-12)
+
+    def test_state_tensor_is_memmap(self,):
+        with tempfile.TemporaryDirectory() as memmap_dir:
+            self.circ._memmap_dir = memmap_dir
+            self.circ._memmap_chunk_size = 4
+            state_tensor = self.circ.compile() \
+                .bind_parameters({"theta": 0.5})._get_state_tensor()
+
+            self.assertIsInstance(state_tensor, np.memmap)
+            del state_tensor
+            self.assertEqual(os.listdir(memmap_dir), [])
+
+    @unittest.skipUnless(
+        os.path.exists("/proc/self/maps"), "requires /proc/self/maps")
+    def test_files_on_disk_are_released(self,):
+        with tempfile.TemporaryDirectory() as memmap_dir:
+            self.circ._memmap_dir = memmap_dir
+            self.circ._memmap_chunk_size = 4
+            plan = self.circ.compile().bind_parameters({"theta": 0.5})
+
+            # the returned state vector is a view of the file in memmap_dir
+            state_vec = plan.get_state_vector()
+            self.assertEqual(len(self._get_mapped_files(memmap_dir)), 1)
+            del state_vec
+            gc.collect()
+            self.assertEqual(self._get_mapped_files(memmap_dir), [])
+
+            # the file is released when the evolution fails as well
+            with mock.patch.object(
+                    StateVectorCircuitPlan, "_apply_operation_to_chunks",
+                    side_effect=MemoryError):
+                with self.assertRaises(MemoryError):
+                    plan.get_state_vector(np.eye(16)[:, :2])
+            gc.collect()
+            self.assertEqual(self._get_mapped_files(memmap_dir), [])
+
+    def test_batch_and_sweep_match_ram(self,):
+        self.circ._from_right_to_left_for_qubit_ids = True
+        thetas = np.linspace(0., 1., 3)
+        initial_state_vector = np.eye(16)[:5]
+        expected = self.circ.compile().bind_parameters({"theta": thetas}) \
+            .get_state_vector(initial_state_vector)
+
+        with tempfile.TemporaryDirectory() as memmap_dir:
+            self.circ._memmap_dir = memmap_dir
+            self.circ._memmap_chunk_size = 8
+            plan = self.circ.compile().bind_parameters({"theta": thetas})
+            actual = plan.get_state_vector(initial_state_vector)
+
+        self.assertEqual(actual.shape, (3, 5, 16))
+        np.testing.assert_allclose(actual, expected, atol=1e-12)
+
+    def test_complex64(self,):
+        self.circ._precision = "complex64"
+        expected = self.circ.compile().bind_parameters({"theta": 0.5}) \
+            .get_state_vector()
+
+        with tempfile.TemporaryDirectory() as memmap_dir:
+            self.circ._memmap_dir = memmap_dir
+            self.circ._memmap_chunk_size = 2
+            actual = self.circ.compile().bind_parameters({"theta": 0.5}) \
+                .get_state_vector()
+
+        self.assertEqual(actual.dtype, np.complex64)
+        np.testing.assert_allclose(actual, expected, atol=1e-6)
+
+    def test_no_block_fusion_and_small_merged_runs(self,):
+        circ = StateVectorCircuit(4)
+        circ._fuse_single_qubit_gates = False
+        circ._max_block_fusion_qubits = 3
+        circ.add_gate({"name": "h", "target_qubit": [0, 1, 2],
+                       "control_qubit": [], "control_value": [],
+                       "parameter": []})
+        circ.add_gate({"name": "x", "target_qubit": [1],
+                       "control_qubit": [0], "control_value": [1],
+                       "parameter": []})
+        circ.add_gate({"name": "h", "target_qubit": [3],
+                       "control_qubit": [], "control_value": [],
+                       "parameter": []})
+        circ.add_gate({"name": "t", "target_qubit": [0, 1, 2, 3],
+                       "control_qubit": [], "control_value": [],
+                       "parameter": []})
+        self.assertIn(
+            "matrix",
+            [operation[0] for operation in circ.compile().operations])
+        expected = circ.compile().get_state_vector()
+
+        with tempfile.TemporaryDirectory() as memmap_dir:
+            circ._memmap_dir = memmap_dir
+            circ._memmap_chunk_size = 4
+            plan = circ.compile()
+            actual = plan.get_state_vector()
+
+            self.assertNotIn(
+                "matrix", [operation[0] for operation in plan.operations])
+            # the merged t gates fit in a chunk of 2 qubits
+            self.assertEqual(
+                [operation[3] for operation in plan.operations
+                 if operation[0] == "phase"],
+                [(0, 1), (2, 3)])
+            np.testing.assert_allclose(actual, expected, atol=1e-12)
@@ -0,0 +1,110 @@
+import tempfile
+import unittest
+
+import numpy as np
+
+from quantestpy import StateVectorCircuit
+from quantestpy.simulator.exceptions import StateVectorCircuitError
+
+
+class TestNumWorkers(unittest.TestCase):
+    """
+    How to execute this test:
+    $ pwd
+    {Your directory where you git-cloned quantestpy}/quantestpy
+    $ python -m unittest \
+        test.simulator.state_vector_circuit.test_num_workers
+    .....
+    ----------------------------------------------------------------------
+    Ran 5 tests in 0.300s
+
+    OK
+    """
+
+    def setUp(self) -> None:
+        # large enough to be split into chunks for the worker threads
+        self.circ = StateVectorCircuit(16)
+        self.circ.add_gate(
+            {"name": "h", "target_qubit": list(range(16)),
+             "control_qubit": [], "control_value": [], "parameter": []})
+        self.circ.add_gate(
+            {"name": "t", "target_qubit": [0, 5], "control_qubit": [],
+             "control_value": [], "parameter": []})
+        self.circ.add_gate(
+            {"name": "x", "target_qubit": [1], "control_qubit": [0, 15],
+             "control_value": [1, 0], "parameter": []})
+        self.circ.add_gate(
+            {"name": "iswap", "target_qubit": [2, 14], "control_qubit": [3],
+             "control_value": [1], "parameter": []})
+        self.circ.add_gate(
+            {"name": "u", "target_qubit": [0], "control_qubit": [],
+             "control_value": [], "parameter": ["theta", 0.2, 0.3, 0.4]})
+        self.circ.add_gate(
+            {"name": "ry", "target_qubit": [13], "control_qubit": [0],
+             "control_value": [0], "parameter": [0.7]})
+
+    def test_state_vector_matches_single_thread(self,):
+        expected = self.circ.compile() \
+            .bind_parameters({"theta": 0.5}).get_state_vector()
+
+        self.circ._num_workers = 4
+        for max_block_fusion_qubits in [None, 2]:
+            self.circ._max_block_fusion_qubits = max_block_fusion_qubits
+            plan = self.circ.compile().bind_parameters({"theta": 0.5})
+
+            self.assertEqual(plan.num_workers, 4)
+            self.assertGreater(
+                plan._get_num_chunk_axes(np.zeros((2,)*16)), 0)
+            np.testing.assert_allclose(
+                plan.get_state_vector(), expected, atol=1e-12)
+
+    def test_num_workers_not_dividing_chunks(self,):
+        expected = self.circ.compile() \
+            .bind_parameters({"theta": 0.5}).get_state_vector()
+
+        self.circ._num_workers = 3
+        plan = self.circ.compile().bind_parameters({"theta": 0.5})
+        # 4 chunks for 3 workers, one of which applies 2 chunks
+        self.assertEqual(plan._get_num_chunk_axes(np.zeros((2,)*16)), 2)
+        np.testing.assert_allclose(
+            plan.get_state_vector(), expected, atol=1e-12)
+
+        with tempfile.TemporaryDirectory() as memmap_dir:
+            self.circ._memmap_dir = memmap_dir
+            self.circ._memmap_chunk_size = 2**13
+            plan = self.circ.compile().bind_parameters({"theta": 0.5})
+            actual = plan.get_state_vector()
+
+            # 8 chunks of the file for 3 workers
+            self.assertEqual(plan._get_num_chunk_axes(actual), 3)
+            np.testing.assert_allclose(actual, expected, atol=1e-12)
+            del actual
+
+    def test_batch_and_sweep_match_single_thread(self,):
+        thetas = np.linspace(0., 1., 3)
+        initial_state_vector = np.eye(2**16, 2)
+        expected = self.circ.compile() \
+            .bind_parameters({"theta": thetas}) \
+            .get_state_vector(initial_state_vector)
+
+        self.circ._num_workers = 3
+        actual = self.circ.compile() \
+            .bind_parameters({"theta": thetas}) \
+            .get_state_vector(initial_state_vector)
+
+        np.testing.assert_allclose(actual, expected, atol=1e-12)
+
+    def test_small_state_is_not_split(self,):
+        circ = StateVectorCircuit(2)
+        circ._num_workers = 8
+        plan = circ.compile()
+
+        self.assertEqual(plan._get_num_chunk_axes(np.zeros((2, 2))), 0)
+        np.testing.assert_allclose(
+            plan.get_state_vector(), np.array([1, 0, 0, 0]))
+
+    def test_invalid_num_workers(self,):
+        self.circ._num_workers = 0
+
+        with self.assertRaises(StateVectorCircuitError):
+            self.circ.compile()
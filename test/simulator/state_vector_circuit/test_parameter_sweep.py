@@ -0,0 +1,166 @@
+import unittest
+
+import numpy as np
+
+from quantestpy import StateVectorCircuit, operator, state_vector
+from quantestpy.simulator.exceptions import StateVectorCircuitError
+from quantestpy.simulator.state_vector_circuit import (
+    _GATE_REGISTRY, _get_gate_matrix, _get_swept_gate_matrices)
+
+
+class TestParameterSweep(unittest.TestCase):
+    """
+    How to execute this test:
+    $ pwd
+    {Your directory where you git-cloned quantestpy}/quantestpy
+    $ python -m unittest \
+        test.simulator.state_vector_circuit.test_parameter_sweep
+    ........
+    ----------------------------------------------------------------------
+    Ran 8 tests in 0.012s
+
+    OK
+    """
+
+    def setUp(self) -> None:
+        self.thetas = np.linspace(0., 2.*np.pi, 6)
+        self.phis = np.linspace(1., -1., 6)
+        self.gates = [
+            {"name": "h", "target_qubit": [0, 1, 2], "control_qubit": [],
+             "control_value": [], "parameter": []},
+            {"name": "rx", "target_qubit": [0], "control_qubit": [],
+             "control_value": [], "parameter": ["theta"]},
+            {"name": "ry", "target_qubit": [1], "control_qubit": [0],
+             "control_value": [1], "parameter": ["phi"]},
+            {"name": "rz", "target_qubit": [2], "control_qubit": [],
+             "control_value": [], "parameter": ["theta"]},
+            {"name": "u", "target_qubit": [2], "control_qubit": [1],
+             "control_value": [0], "parameter": ["theta", 0.3, "phi", 0.1]},
+            {"name": "p", "target_qubit": [0, 1], "control_qubit": [],
+             "control_value": [], "parameter": [0.4]}]
+        circ = StateVectorCircuit(3)
+        for gate in self.gates:
+            circ.add_gate(gate)
+        self.plan = circ.compile()
+
+    def test_parameter_names(self,):
+        self.assertEqual(self.plan.parameter_names, ["phi", "theta"])
+        self.assertIsNone(self.plan.sweep_size)
+
+        plan = self.plan.bind_parameters({"theta": self.thetas})
+        self.assertEqual(plan.parameter_names, ["phi"])
+        self.assertEqual(plan.sweep_size, 6)
+
+    def test_sweep_of_state_vectors(self,):
+        plan = self.plan.bind_parameters(
+            {"theta": self.thetas, "phi": self.phis})
+        actual_state_vecs = plan.get_state_vector()
+
+        expected_state_vecs = []
+        for theta, phi in zip(self.thetas, self.phis):
+            circ = StateVectorCircuit(3)
+            for gate in self.gates:
+                values = {"theta": theta, "phi": phi}
+                circ.add_gate(dict(gate, parameter=[
+                    values.get(parameter, parameter)
+                    for parameter in gate["parameter"]]))
+            expected_state_vecs.append(circ._get_state_vector())
+
+        self.assertEqual(actual_state_vecs.shape, (6, 8))
+        self.assertIsNone(
+            state_vector.assert_equal(
+                actual_state_vecs, np.array(expected_state_vecs),
+                atol=1e-12))
+
+    def test_sweep_of_operators(self,):
+        plan = self.plan.bind_parameters(
+            {"theta": self.thetas, "phi": 0.5})
+        actual_operators = plan.get_whole_gates()
+
+        expected_operators = np.array([
+            self.plan.bind_parameters(
+                {"theta": theta, "phi": 0.5}).get_whole_gates()
+            for theta in self.thetas])
+
+        self.assertEqual(actual_operators.shape, (6, 8, 8))
+        self.assertIsNone(
+            operator.assert_equal(
+                actual_operators, expected_operators, atol=1e-12))
+
+    def test_bind_parameters_one_by_one(self,):
+        plan = self.plan.bind_parameters({"phi": self.phis}) \
+            .bind_parameters({"theta": 1.2})
+
+        expected_operators = np.array([
+            self.plan.bind_parameters(
+                {"theta": 1.2, "phi": phi}).get_whole_gates()
+            for phi in self.phis])
+
+        self.assertIsNone(
+            operator.assert_equal(
+                plan.get_whole_gates(), expected_operators, atol=1e-12))
+
+    def test_unbound_parameters(self,):
+        with self.assertRaises(StateVectorCircuitError):
+            self.plan.get_state_vector()
+
+        with self.assertRaises(StateVectorCircuitError):
+            self.plan.bind_parameters({"theta": 1.}).get_whole_gates()
+
+    def test_invalid_parameter_values(self,):
+        with self.assertRaises(StateVectorCircuitError):
+            self.plan.bind_parameters({"lambda": 1.})
+
+        with self.assertRaises(StateVectorCircuitError):
+            self.plan.bind_parameters(
+                {"theta": self.thetas, "phi": self.phis[:3]})
+
+        with self.assertRaises(StateVectorCircuitError):
+            self.plan.bind_parameters({"theta": np.ones((2, 2))})
+
+    def test_named_parameters_are_not_fused(self,):
+        circ = StateVectorCircuit(3)
+        for gate in self.gates:
+            circ.add_gate(gate)
+        circ._max_block_fusion_qubits = 3
+        plan = circ.compile()
+
+        self.assertEqual(
+            [operation[0] for operation in plan.operations
+             if operation[0] == "parametric"],
+            ["parametric"] * 4)
+
+        plan = plan.bind_parameters({"theta": self.thetas, "phi": self.phis})
+        expected_state_vecs = np.array([
+            self.plan.bind_parameters(
+                {"theta": theta, "phi": phi}).get_state_vector()
+            for theta, phi in zip(self.thetas, self.phis)])
+
+        self.assertIsNone(
+            state_vector.assert_equal(
+                plan.get_state_vector(), expected_state_vecs, atol=1e-12))
+
+    def test_swept_matrices_are_built_at_once(self,):
+        thetas = np.linspace(0., 2.*np.pi, 1000)
+        for name, parameter in [("rx", [thetas]),
+                                ("ry", [thetas]),
+                                ("rz", [thetas]),
+                                ("p", [thetas]),
+                                ("scalar", [thetas]),
+                                ("u", [0.3, thetas, 0.2, thetas])]:
+            cache_info = _GATE_REGISTRY[name]["builder"].cache_info()
+            matrices = _get_swept_gate_matrices(name, parameter, 1000)
+
+            # the LRU cache of the matrices is bypassed
+            self.assertEqual(
+                _GATE_REGISTRY[name]["builder"].cache_info(), cache_info)
+            self.assertEqual(matrices.shape, (1000, 2, 2))
+            for i in (0, 123, 999):
+                self.assertIsNone(
+                    np.testing.assert_allclose(
+                        matrices[i],
+                        _get_gate_matrix(
+                            name,
+                            [param[i] if isinstance(param, np.ndarray)
+                             else param for param in parameter]),
+                        atol=1e-15))
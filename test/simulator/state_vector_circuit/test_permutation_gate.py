@@ -0,0 +1,69 @@
+import unittest
+
+import numpy as np
+
+from quantestpy import StateVectorCircuit
+
+
+class TestStateVectorCircuitPermutationGate(unittest.TestCase):
+    """
+    How to execute this test:
+    $ pwd
+    {Your directory where you git-cloned quantestpy}/quantestpy
+    $ python -m unittest \
+        test.simulator.state_vector_circuit.test_permutation_gate
+    ...
+    ----------------------------------------------------------------------
+    Ran 3 tests in 0.003s
+
+    OK
+    $
+    """
+
+    def test_merge_consecutive_permutation_gates(self,):
+        circ = StateVectorCircuit(3)
+        circ.add_gate({"name": "x", "target_qubit": [0], "control_qubit": [],
+                       "control_value": [], "parameter": []})
+        circ.add_gate(
+            {"name": "x", "target_qubit": [2], "control_qubit": [0, 1],
+             "control_value": [1, 0], "parameter": []})
+        circ.add_gate(
+            {"name": "swap", "target_qubit": [1, 2], "control_qubit": [],
+             "control_value": [], "parameter": []})
+
+        merged_gates = list(circ._merge_gates(circ.gates))
+
+        # |000> -> |100> -> |101> -> |110>, i.e. the element of index 6 of
+        # the new state is that of index 0 of the old state.
+        self.assertEqual(len(merged_gates), 1)
+        self.assertEqual(merged_gates[0][0], "permutation")
+        index_tensor, axes = merged_gates[0][1]
+        self.assertEqual(axes, (0, 1, 2))
+        self.assertEqual(np.ravel(index_tensor)[6], 0)
+
+    def test_x_control_value_is_zero_state_vector(self,):
+        circ = StateVectorCircuit(3)
+        init_vec = np.array([0, 1, 2, 3, 4, 5, 6, 7]) / np.sqrt(140.)
+        circ.set_initial_state_vector(init_vec)
+        circ.add_gate(
+            {"name": "x", "target_qubit": [1, 2], "control_qubit": [0],
+             "control_value": [0], "parameter": []})
+        actual_vec = circ._get_state_vector()
+
+        expected_vec = np.array([3, 2, 1, 0, 4, 5, 6, 7]) / np.sqrt(140.)
+
+        self.assertIsNone(
+            np.testing.assert_allclose(actual_vec, expected_vec))
+
+    def test_ccx_row_permutation_qiskit_qubit_order(self,):
+        circ = StateVectorCircuit(3)
+        circ._from_right_to_left_for_qubit_ids = True
+        circ.add_gate(
+            {"name": "x", "target_qubit": [2], "control_qubit": [0, 1],
+             "control_value": [1, 1], "parameter": []})
+        actual_gate = circ._get_whole_gates()
+
+        expected_gate = np.eye(8)[[0, 1, 2, 7, 4, 5, 6, 3]]
+
+        self.assertIsNone(
+            np.testing.assert_allclose(actual_gate, expected_gate))
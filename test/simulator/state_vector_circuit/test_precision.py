@@ -0,0 +1,97 @@
+import unittest
+
+import numpy as np
+
+from quantestpy import StateVectorCircuit
+from quantestpy.simulator.exceptions import StateVectorCircuitError
+
+
+class TestPrecision(unittest.TestCase):
+    """
+    How to execute this test:
+    $ pwd
+    {Your directory where you git-cloned quantestpy}/quantestpy
+    $ python -m unittest \
+        test.simulator.state_vector_circuit.test_precision
+    .....
+    ----------------------------------------------------------------------
+    Ran 5 tests in 0.005s
+
+    OK
+    """
+
+    def setUp(self) -> None:
+        self.circ = StateVectorCircuit(3)
+        self.circ.add_gate(
+            {"name": "h", "target_qubit": [0, 1], "control_qubit": [],
+             "control_value": [], "parameter": []})
+        self.circ.add_gate(
+            {"name": "t", "target_qubit": [2], "control_qubit": [0],
+             "control_value": [1], "parameter": []})
+        self.circ.add_gate(
+            {"name": "x", "target_qubit": [2], "control_qubit": [1],
+             "control_value": [1], "parameter": []})
+        self.circ.add_gate(
+            {"name": "iswap", "target_qubit": [0, 2], "control_qubit": [],
+             "control_value": [], "parameter": []})
+        self.circ.add_gate(
+            {"name": "u", "target_qubit": [1], "control_qubit": [2],
+             "control_value": [0], "parameter": ["theta", 0.2, 0.3, 0.4]})
+
+    def test_default_precision(self,):
+        plan = StateVectorCircuit(2).compile()
+
+        self.assertEqual(plan.precision, "complex128")
+        self.assertEqual(plan.get_state_vector().dtype, np.complex128)
+
+    def test_dtype_is_kept_through_gates(self,):
+        self.circ._precision = "complex64"
+        self.circ._max_block_fusion_qubits = 2
+        plan = self.circ.compile().bind_parameters({"theta": 0.5})
+
+        self.assertEqual(plan.get_state_vector().dtype, np.complex64)
+        self.assertEqual(plan.get_whole_gates().dtype, np.complex64)
+        self.assertEqual(
+            plan.get_state_vector(np.eye(8)[:, :3]).dtype, np.complex64)
+
+        plan = self.circ.compile().bind_parameters(
+            {"theta": np.linspace(0., 1., 5)})
+        self.assertEqual(plan.get_whole_gates().dtype, np.complex64)
+
+    def test_complex64_is_close_to_complex128(self,):
+        thetas = np.linspace(0., 1., 5)
+        plan_128 = self.circ.compile().bind_parameters({"theta": thetas})
+        self.circ._precision = "complex64"
+        plan_64 = self.circ.compile().bind_parameters({"theta": thetas})
+
+        np.testing.assert_allclose(
+            plan_64.get_whole_gates(), plan_128.get_whole_gates(), atol=1e-6)
+
+    def test_complex64_error_accumulates_over_deep_circuit(self,):
+        circ_64 = StateVectorCircuit(4)
+        circ_64._precision = "complex64"
+        circ_128 = StateVectorCircuit(4)
+        for i in range(250):
+            gates = [
+                {"name": "rx", "target_qubit": [i % 4], "control_qubit": [],
+                 "control_value": [], "parameter": [0.1*(i % 7) + 0.05]},
+                {"name": "x", "target_qubit": [(i + 1) % 4],
+                 "control_qubit": [i % 4], "control_value": [1],
+                 "parameter": []}]
+            for gate in gates:
+                circ_64.add_gate(gate)
+                circ_128.add_gate(gate)
+
+        error = np.max(np.abs(
+            circ_64.compile().get_state_vector()
+            - circ_128.compile().get_state_vector()))
+
+        # beyond the default atol of complex128, within that of complex64
+        self.assertGreater(error, 1e-8)
+        self.assertLess(error, 1e-5)
+
+    def test_invalid_precision(self,):
+        self.circ._precision = "complex32"
+
+        with self.assertRaises(StateVectorCircuitError):
+            self.circ.compile()
@@ -0,0 +1,140 @@
+import os
+import signal
+import unittest
+
+import numpy as np
+
+from quantestpy import StateVectorCircuit
+from quantestpy.simulator.exceptions import StateVectorCircuitError
+from quantestpy.simulator.state_vector_circuit import _get_process_pool
+
+
+class TestProcessBackend(unittest.TestCase):
+    """
+    How to execute this test:
+    $ pwd
+    {Your directory where you git-cloned quantestpy}/quantestpy
+    $ python -m unittest \
+        test.simulator.state_vector_circuit.test_process_backend
+    .......
+    ----------------------------------------------------------------------
+    Ran 7 tests in 0.600s
+
+    OK
+    """
+
+    def setUp(self) -> None:
+        # large enough to be split into chunks for the workers
+        self.circ = StateVectorCircuit(16)
+        self.circ.add_gate(
+            {"name": "h", "target_qubit": list(range(16)),
+             "control_qubit": [], "control_value": [], "parameter": []})
+        self.circ.add_gate(
+            {"name": "s", "target_qubit": [0, 7], "control_qubit": [],
+             "control_value": [], "parameter": []})
+        self.circ.add_gate(
+            {"name": "x", "target_qubit": [1], "control_qubit": [0, 15],
+             "control_value": [1, 0], "parameter": []})
+        self.circ.add_gate(
+            {"name": "swap", "target_qubit": [2, 14], "control_qubit": [],
+             "control_value": [], "parameter": []})
+        self.circ.add_gate(
+            {"name": "u", "target_qubit": [0], "control_qubit": [],
+             "control_value": [], "parameter": ["theta", 0.2, 0.3, 0.4]})
+        self.circ.add_gate(
+            {"name": "ry", "target_qubit": [13], "control_qubit": [0],
+             "control_value": [0], "parameter": [0.7]})
+
+    def _get_process_plan(self, num_workers: int = 2):
+        self.circ._num_workers = num_workers
+        self.circ._backend = "process"
+        return self.circ.compile().bind_parameters({"theta": 0.5})
+
+    def test_state_vector_matches_thread_backend(self,):
+        for max_block_fusion_qubits in [None, 2]:
+            self.circ._max_block_fusion_qubits = max_block_fusion_qubits
+            self.circ._backend = "thread"
+            self.circ._num_workers = 1
+            expected = self.circ.compile() \
+                .bind_parameters({"theta": 0.5}).get_state_vector()
+
+            plan = self._get_process_plan()
+
+            self.assertEqual(plan.backend, "process")
+            np.testing.assert_array_equal(plan.get_state_vector(), expected)
+
+    def test_batch_and_sweep_match_thread_backend(self,):
+        thetas = np.linspace(0., 1., 3)
+        initial_state_vector = np.eye(2, 2**16)
+        expected = self.circ.compile() \
+            .bind_parameters({"theta": thetas}) \
+            .get_state_vector(initial_state_vector)
+
+        self.circ._num_workers = 2
+        self.circ._backend = "process"
+        actual = self.circ.compile() \
+            .bind_parameters({"theta": thetas}) \
+            .get_state_vector(initial_state_vector)
+
+        np.testing.assert_allclose(actual, expected, atol=1e-12)
+
+    def test_num_workers_not_dividing_chunks(self,):
+        expected = self.circ.compile() \
+            .bind_parameters({"theta": 0.5}).get_state_vector()
+
+        plan = self._get_process_plan(3)
+        # 4 chunks for 3 workers, one of which applies 2 chunks
+        self.assertEqual(plan._get_num_chunk_axes(np.zeros((2,)*16)), 2)
+        np.testing.assert_allclose(
+            plan.get_state_vector(), expected, atol=1e-12)
+
+    def test_pool_is_persistent(self,):
+        plan = self._get_process_plan()
+        plan.get_state_vector()
+        pids = [process.pid for process in _get_process_pool(2)._processes]
+        plan.get_state_vector()
+
+        self.assertEqual(
+            [process.pid for process in _get_process_pool(2)._processes],
+            pids)
+        self.assertNotIn(os.getpid(), pids)
+
+    def test_plan_is_sent_once(self,):
+        plan = self._get_process_plan()
+        expected = plan.get_state_vector()
+        tokens = list(_get_process_pool(2)._tokens)
+
+        self.assertIn(plan._token, tokens)
+        np.testing.assert_array_equal(plan.get_state_vector(), expected)
+        self.assertEqual(_get_process_pool(2)._tokens, tokens)
+
+    def test_dead_worker_raises(self,):
+        plan = self._get_process_plan()
+        expected = plan.get_state_vector()
+        pool = _get_process_pool(2)
+        os.kill(pool._processes[1].pid, signal.SIGKILL)
+        pool._processes[1].join()
+
+        with self.assertRaises(StateVectorCircuitError) as cm:
+            plan.get_state_vector()
+        self.assertEqual(
+            cm.exception.args[0],
+            "a worker process of the process backend exited with code "
+            f"{-signal.SIGKILL}."
+        )
+        self.assertFalse(
+            any(process.is_alive() for process in pool._processes))
+
+        # a new pool is started at the next call
+        np.testing.assert_array_equal(plan.get_state_vector(), expected)
+        self.assertIsNot(_get_process_pool(2), pool)
+
+    def test_invalid_backend(self,):
+        self.circ._backend = "gpu"
+        with self.assertRaises(StateVectorCircuitError):
+            self.circ.compile()
+
+        self.circ._backend = "process"
+        self.circ._memmap_dir = "."
+        with self.assertRaises(StateVectorCircuitError):
+            self.circ.compile()
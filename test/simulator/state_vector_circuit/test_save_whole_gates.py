@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from quantestpy import StateVectorCircuit
+from quantestpy.simulator.exceptions import StateVectorCircuitError
+
+
+class TestSaveWholeGates(unittest.TestCase):
+    """
+    How to execute this test:
+    $ pwd
+    {Your directory where you git-cloned quantestpy}/quantestpy
+    $ python -m unittest \
+        test.simulator.state_vector_circuit.test_save_whole_gates
+    ...
+    ----------------------------------------------------------------------
+    Ran 3 tests in 0.010s
+
+    OK
+    """
+
+    def setUp(self) -> None:
+        self.circ = StateVectorCircuit(3)
+        self.circ.add_gate(
+            {"name": "h", "target_qubit": [0, 2], "control_qubit": [],
+             "control_value": [], "parameter": []})
+        self.circ.add_gate(
+            {"name": "x", "target_qubit": [1], "control_qubit": [0],
+             "control_value": [1], "parameter": []})
+        self.circ.add_gate(
+            {"name": "iswap", "target_qubit": [1, 2], "control_qubit": [],
+             "control_value": [], "parameter": []})
+        self.circ.add_gate(
+            {"name": "rx", "target_qubit": [0], "control_qubit": [2],
+             "control_value": [0], "parameter": ["theta"]})
+
+    def test_matches_whole_gates(self,):
+        plan = self.circ.compile().bind_parameters({"theta": 0.5})
+        expected = plan.get_whole_gates()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for block_size in [1, 3, 8, None]:
+                file = os.path.join(temp_dir, f"unitary_{block_size}.npy")
+                actual = plan.save_whole_gates(file, block_size)
+
+                self.assertIsInstance(actual, np.memmap)
+                np.testing.assert_allclose(actual, expected, atol=1e-12)
+                # the file on disk holds the blocks of columns contiguously
+                saved = np.load(file, mmap_mode="r")
+                self.assertTrue(saved.flags.f_contiguous)
+                np.testing.assert_allclose(saved, expected, atol=1e-12)
+                del actual, saved
+
+    def test_sweep(self,):
+        plan = self.circ.compile() \
+            .bind_parameters({"theta": np.linspace(0., 1., 4)})
+        expected = plan.get_whole_gates()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file = os.path.join(temp_dir, "unitary.npy")
+            actual = plan.save_whole_gates(file, 3)
+
+            self.assertEqual(actual.shape, (4, 8, 8))
+            np.testing.assert_allclose(actual, expected, atol=1e-12)
+            del actual
+
+    def test_invalid_block_size(self,):
+        plan = self.circ.compile().bind_parameters({"theta": 0.5})
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with self.assertRaises(StateVectorCircuitError):
+                plan.save_whole_gates(
+                    os.path.join(temp_dir, "unitary.npy"), 0)
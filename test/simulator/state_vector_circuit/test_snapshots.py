@@ -0,0 +1,141 @@
+import unittest
+
+import numpy as np
+
+from quantestpy import StateVectorCircuit
+from quantestpy.simulator.exceptions import StateVectorCircuitError
+
+
+class TestSnapshots(unittest.TestCase):
+    """
+    How to execute this test:
+    $ pwd
+    {Your directory where you git-cloned quantestpy}/quantestpy
+    $ python -m unittest \
+        test.simulator.state_vector_circuit.test_snapshots
+    ......
+    ----------------------------------------------------------------------
+    Ran 6 tests in 0.010s
+
+    OK
+    """
+
+    def setUp(self) -> None:
+        self.circ = StateVectorCircuit(3)
+        self.circ.add_gate(
+            {"name": "h", "target_qubit": [0], "control_qubit": [],
+             "control_value": [], "parameter": []})
+        self.circ.add_gate(
+            {"name": "x", "target_qubit": [1], "control_qubit": [0],
+             "control_value": [1], "parameter": []})
+        self.circ.add_gate(
+            {"name": "t", "target_qubit": [1], "control_qubit": [],
+             "control_value": [], "parameter": []})
+        self.circ.add_gate(
+            {"name": "x", "target_qubit": [1], "control_qubit": [0],
+             "control_value": [1], "parameter": []})
+        self.circ.add_gate(
+            {"name": "h", "target_qubit": [0], "control_qubit": [],
+             "control_value": [], "parameter": []})
+
+    def _get_truncated_circuit(self, circ: StateVectorCircuit,
+                               gate_index: int) -> StateVectorCircuit:
+        truncated_circ = StateVectorCircuit(circ.num_qubit)
+        for gate in circ.gates[:gate_index]:
+            truncated_circ.add_gate(gate)
+        if circ._initial_state_vector is not None:
+            truncated_circ.set_initial_state_vector(
+                circ._initial_state_vector)
+        return truncated_circ
+
+    def test_snapshots_match_truncated_circuits(self,):
+        self.circ._max_block_fusion_qubits = 2
+        snapshots = self.circ.get_snapshots([4, 0, 2, 5])
+
+        self.assertEqual(snapshots.gate_indices, [0, 2, 4, 5])
+        for gate_index in snapshots.gate_indices:
+            np.testing.assert_allclose(
+                snapshots[gate_index],
+                self._get_truncated_circuit(
+                    self.circ, gate_index)._get_state_vector(),
+                atol=1e-12)
+
+    def test_snapshots_across_merged_runs(self,):
+        gates = [
+            {"name": "h", "target_qubit": [0, 1, 2], "control_qubit": [],
+             "control_value": [], "parameter": []},
+            {"name": "t", "target_qubit": [0], "control_qubit": [],
+             "control_value": [], "parameter": []},
+            {"name": "z", "target_qubit": [1], "control_qubit": [0],
+             "control_value": [1], "parameter": []},
+            {"name": "s", "target_qubit": [2], "control_qubit": [],
+             "control_value": [], "parameter": []},
+            {"name": "rz", "target_qubit": [1], "control_qubit": [],
+             "control_value": [], "parameter": [0.3]},
+            {"name": "x", "target_qubit": [2], "control_qubit": [0],
+             "control_value": [1], "parameter": []},
+            {"name": "swap", "target_qubit": [0, 1], "control_qubit": [],
+             "control_value": [], "parameter": []},
+            {"name": "x", "target_qubit": [0], "control_qubit": [1, 2],
+             "control_value": [1, 0], "parameter": []}]
+        circ = StateVectorCircuit(3)
+        for gate in gates:
+            circ.add_gate(gate)
+
+        # without snapshots, the phases and the permutations are merged
+        self.assertEqual(
+            [operation[0] for operation in circ.compile().operations],
+            ["single"] * 3 + ["phase", "permutation"])
+
+        gate_indices = [2, 3, 5, 6, 7]
+        snapshots = circ.get_snapshots(gate_indices)
+        for gate_index in gate_indices:
+            np.testing.assert_allclose(
+                snapshots[gate_index],
+                self._get_truncated_circuit(
+                    circ, gate_index)._get_state_vector(),
+                atol=1e-12)
+
+    def test_batch_of_initial_state_vectors(self,):
+        self.circ.set_initial_state_vector(np.eye(4, 8))
+        snapshots = self.circ.get_snapshots([1, 3])
+
+        for gate_index in [1, 3]:
+            self.assertEqual(snapshots[gate_index].shape, (4, 8))
+            np.testing.assert_allclose(
+                snapshots[gate_index],
+                self._get_truncated_circuit(
+                    self.circ, gate_index)._get_state_vector(),
+                atol=1e-12)
+
+    def test_compressed_storage(self,):
+        dense_snapshots = self.circ.get_snapshots([2, 3])
+        snapshots = self.circ.get_snapshots(
+            [2, 3], storage_precision="complex64", threshold=1e-6)
+
+        self.assertEqual(snapshots.precision, "complex64")
+        self.assertLess(snapshots.nbytes, dense_snapshots.nbytes)
+        for gate_index in [2, 3]:
+            self.assertEqual(snapshots[gate_index].dtype, np.complex64)
+            np.testing.assert_allclose(
+                snapshots[gate_index], dense_snapshots[gate_index],
+                atol=1e-6)
+
+    def test_snapshot_is_not_changed(self,):
+        snapshots = self.circ.get_snapshots([2])
+        expected = snapshots[2].copy()
+
+        snapshots[2][:] = 0.
+
+        np.testing.assert_allclose(snapshots[2], expected)
+
+    def test_invalid_gate_indices(self,):
+
+        with self.assertRaises(StateVectorCircuitError):
+            self.circ.get_snapshots([6])
+
+        with self.assertRaises(StateVectorCircuitError):
+            self.circ.get_snapshots(2)
+
+        with self.assertRaises(StateVectorCircuitError):
+            self.circ.get_snapshots([1])[2]
@@ -14,7 +14,7 @@ class TestStateVectorCircuit(unittest.TestCase):
         unittest test.simulator.state_vector_circuit.test_state_vector_circuit
     ......
     ----------------------------------------------------------------------
-    Ran 6 tests in 0.006s
+    Ran 8 tests in 0.006s
 
     OK
     $
@@ -99,3 +99,43 @@ class TestStateVectorCircuit(unittest.TestCase):
 
         self.assertIsNone(
             np.testing.assert_allclose(actual_vec, expected_vec))
+
+    def test__get_state_vector_qiskit_qubit_order(self,):
+        circ = StateVectorCircuit(3)
+        circ._from_right_to_left_for_qubit_ids = True
+        circ.add_gate({"name": "x", "target_qubit": [0], "control_qubit": [],
+                       "control_value": [], "parameter": []})
+        circ.add_gate(
+            {"name": "x", "control_qubit": [0], "target_qubit": [2],
+             "control_value": [1], "parameter": []})
+        actual_vec = circ._get_state_vector()
+
+        expected_vec = np.zeros(8)
+        expected_vec[5] = 1.
+
+        self.assertIsNone(
+            np.testing.assert_allclose(actual_vec, expected_vec))
+
+    def test__get_state_vector_equal_to_whole_gates(self,):
+        circ = StateVectorCircuit(4)
+        circ.add_gate({"name": "h", "target_qubit": [0, 3],
+                       "control_qubit": [], "control_value": [],
+                       "parameter": []})
+        circ.add_gate(
+            {"name": "u", "control_qubit": [0, 3], "target_qubit": [1],
+             "control_value": [1, 0], "parameter": [0.1, 0.2, 0.3, 0.4]})
+        circ.add_gate(
+            {"name": "iswap", "control_qubit": [1], "target_qubit": [3, 2],
+             "control_value": [1], "parameter": []})
+        circ.add_gate(
+            {"name": "swap", "control_qubit": [], "target_qubit": [0, 2],
+             "control_value": [], "parameter": []})
+        init_vec = np.arange(16) / np.linalg.norm(np.arange(16))
+        circ.set_initial_state_vector(init_vec)
+        actual_vec = circ._get_state_vector()
+
+        expected_vec = np.matmul(circ._get_whole_gates(), init_vec)
+
+        self.assertIsNone(
+            np.testing.assert_allclose(
+                actual_vec, expected_vec, atol=1e-12))
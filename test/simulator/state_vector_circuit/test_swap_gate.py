@@ -0,0 +1,81 @@
+import unittest
+
+import numpy as np
+
+from quantestpy import StateVectorCircuit
+
+
+class TestStateVectorCircuitSwapGate(unittest.TestCase):
+    """
+    How to execute this test:
+    $ pwd
+    {Your directory where you git-cloned quantestpy}/quantestpy
+    $ python -m unittest test.simulator.state_vector_circuit.test_swap_gate
+    ....
+    ----------------------------------------------------------------------
+    Ran 4 tests in 0.003s
+
+    OK
+    $
+    """
+
+    def test_swap_state_vector(self,):
+        circ = StateVectorCircuit(3)
+        circ.add_gate({"name": "x", "target_qubit": [0], "control_qubit": [],
+                       "control_value": [], "parameter": []})
+        circ.add_gate(
+            {"name": "swap", "target_qubit": [0, 2], "control_qubit": [],
+             "control_value": [], "parameter": []})
+        actual_vec = circ._get_state_vector()
+
+        # |100> -> |001>
+        expected_vec = np.zeros(8)
+        expected_vec[1] = 1.
+
+        self.assertIsNone(
+            np.testing.assert_allclose(actual_vec, expected_vec))
+
+    def test_cswap_control_value_is_zero_state_vector(self,):
+        circ = StateVectorCircuit(3)
+        init_vec = np.array([0, 1, 2, 3, 4, 5, 6, 7]) / np.sqrt(140.)
+        circ.set_initial_state_vector(init_vec)
+        circ.add_gate(
+            {"name": "swap", "target_qubit": [1, 2], "control_qubit": [0],
+             "control_value": [0], "parameter": []})
+        actual_vec = circ._get_state_vector()
+
+        # |001> <-> |010> only
+        expected_vec = np.array([0, 2, 1, 3, 4, 5, 6, 7]) / np.sqrt(140.)
+
+        self.assertIsNone(
+            np.testing.assert_allclose(actual_vec, expected_vec))
+
+    def test_iswap_state_vector(self,):
+        circ = StateVectorCircuit(2)
+        init_vec = np.array([1, 2, 3, 4]) / np.sqrt(30.)
+        circ.set_initial_state_vector(init_vec)
+        circ.add_gate(
+            {"name": "iswap", "target_qubit": [0, 1], "control_qubit": [],
+             "control_value": [], "parameter": []})
+        actual_vec = circ._get_state_vector()
+
+        expected_vec = np.array([1, 3j, 2j, 4]) / np.sqrt(30.)
+
+        self.assertIsNone(
+            np.testing.assert_allclose(actual_vec, expected_vec))
+
+    def test_ciswap_qiskit_qubit_order_state_vector(self,):
+        circ = StateVectorCircuit(3)
+        circ._from_right_to_left_for_qubit_ids = True
+        init_vec = np.array([0, 1, 2, 3, 4, 5, 6, 7]) / np.sqrt(140.)
+        circ.set_initial_state_vector(init_vec)
+        circ.add_gate(
+            {"name": "iswap", "target_qubit": [1, 2], "control_qubit": [0],
+             "control_value": [1], "parameter": []})
+        actual_vec = circ._get_state_vector()
+
+        # |011> <-> |101> with phase 1j (qubit 0 is the rightmost)
+        expected_vec = np.array([0, 1, 2, 5j, 4, 3j, 6, 7]) / np.sqrt(140.)
+
+        self.assertIsNone(
+            np.testing.assert_allclose(actual_vec, expected_vec))
@@ -3,6 +3,8 @@ import unittest
 
 from quantestpy import QuantestPyCircuit, circuit
 from quantestpy.exceptions import QuantestPyAssertionError
+from quantestpy.simulator.state_vector_circuit import \
+    cvt_quantestpy_circuit_to_state_vector_circuit
 
 
 class TestCircuitAssertAncillaIsZero(unittest.TestCase):
@@ -11,9 +13,9 @@ class TestCircuitAssertAncillaIsZero(unittest.TestCase):
     $ pwd
     {Your directory where you git-cloned quantestpy}/quantestpy
     $ python -m unittest test.test_circuit_assert_ancilla_is_zero
-    ..
+    ...
     ----------------------------------------------------------------------
-    Ran 2 tests in 0.135s
+    Ran 3 tests in 0.135s
 
     OK
     """
@@ -98,3 +100,53 @@ class TestCircuitAssertAncillaIsZero(unittest.TestCase):
             actual_error_msg = traceback.format_exception_only(type(e), e)[0]
 
             self.assertEqual(expected_error_msg, actual_error_msg)
+
+    def test_compiled_circuit(self,):
+        test_circuit = QuantestPyCircuit(4)
+        # V
+        test_circuit.add_gate(
+            {"name": "x", "control_qubit": [0], "target_qubit": [1],
+             "control_value": [1], "parameter": []}
+        )
+        test_circuit.add_gate(
+            {"name": "x", "control_qubit": [1], "target_qubit": [2],
+             "control_value": [1], "parameter": []}
+        )
+
+        # uncomputation
+        test_circuit.add_gate(
+            {"name": "x", "control_qubit": [1], "target_qubit": [3],
+             "control_value": [1], "parameter": []}
+        )
+
+        # V^{-1}: Wrong order!!
+        test_circuit.add_gate(
+            {"name": "x", "control_qubit": [0], "target_qubit": [1],
+             "control_value": [1], "parameter": []}
+        )
+        test_circuit.add_gate(
+            {"name": "x", "control_qubit": [1], "target_qubit": [2],
+             "control_value": [1], "parameter": []}
+        )
+
+        plan = cvt_quantestpy_circuit_to_state_vector_circuit(
+            test_circuit).compile()
+
+        # the same plan is used by several assertions
+        self.assertIsNone(
+            circuit.assert_ancilla_is_zero(
+                circuit=plan,
+                ancilla_qubits=[1]
+            )
+        )
+        with self.assertRaises(QuantestPyAssertionError):
+            circuit.assert_ancilla_is_zero(
+                circuit=plan,
+                ancilla_qubits=[1, 2]
+            )
+        self.assertIsNone(
+            circuit.assert_is_zero(
+                circuit=plan,
+                qubits=[1, 2]
+            )
+        )
@@ -1,9 +1,13 @@
+import os
+import tempfile
 import unittest
 
 import numpy as np
 
 from quantestpy import QuantestPyCircuit, circuit
-from quantestpy.exceptions import QuantestPyAssertionError
+from quantestpy.exceptions import QuantestPyAssertionError, QuantestPyError
+from quantestpy.simulator.state_vector_circuit import \
+    cvt_quantestpy_circuit_to_state_vector_circuit
 
 
 class TestCircuitAssertEqualToOperator(unittest.TestCase):
@@ -12,9 +16,9 @@ class TestCircuitAssertEqualToOperator(unittest.TestCase):
     $ pwd
     {Your directory where you git-cloned quantestpy}/quantestpy
     $ python -m unittest test.test_circuit_assert_equal_to_operator
-    ....
+    ..........
     ----------------------------------------------------------------------
-    Ran 4 tests in 0.003s
+    Ran 10 tests in 0.003s
 
     OK
     $
@@ -96,3 +100,130 @@ class TestCircuitAssertEqualToOperator(unittest.TestCase):
                 operator_=expected_operator,
                 circuit=self.test_circ
             )
+
+    def test_compiled_circuit(self,):
+        state_vector_circuit = \
+            cvt_quantestpy_circuit_to_state_vector_circuit(self.test_circ)
+        state_vector_circuit._from_right_to_left_for_qubit_ids = True
+        plan = state_vector_circuit.compile()
+
+        expected_operator = np.array(
+            [[1, 1, 0, 0],
+             [0, 0, 1, -1],
+             [0, 0, 1, 1],
+             [1, -1, 0, 0]]
+        )/np.sqrt(2.)  # Qiskit convention
+
+        self.assertIsNone(
+            circuit.assert_equal_to_operator(
+                operator_=expected_operator,
+                circuit=plan,
+                from_right_to_left_for_qubit_ids=True
+            )
+        )
+
+    def test_compiled_circuit_with_different_order_of_qubit_ids(self,):
+        plan = cvt_quantestpy_circuit_to_state_vector_circuit(
+            self.test_circ).compile()
+
+        with self.assertRaises(QuantestPyError):
+            circuit.assert_equal_to_operator(
+                operator_=np.eye(4),
+                circuit=plan,
+                from_right_to_left_for_qubit_ids=True
+            )
+
+    def test_unitary_file(self,):
+        expected_operator = np.array(
+            [[1, 0, 1, 0],
+             [0, 1, 0, 1],
+             [0, 1, 0, -1],
+             [1, 0, -1, 0]]) / np.sqrt(2.)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            unitary_file = os.path.join(temp_dir, "unitary.npy")
+
+            self.assertIsNone(
+                circuit.assert_equal_to_operator(
+                    circuit=self.test_circ,
+                    operator_=expected_operator,
+                    block_size=1,
+                    unitary_file=unitary_file
+                )
+            )
+            np.testing.assert_allclose(
+                np.load(unitary_file), expected_operator, atol=1e-12)
+
+    def test_reference_operator_file(self,):
+        expected_operator = np.array(
+            [[1, 0, 1, 0],
+             [0, 1, 0, 1],
+             [0, 1, 0, -1],
+             [1, 0, -1, 0]]) / np.sqrt(2.)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            operator_file = os.path.join(temp_dir, "operator.npy")
+            np.save(operator_file, expected_operator * 1j)
+
+            self.assertIsNone(
+                circuit.assert_equal_to_operator(
+                    circuit=self.test_circ,
+                    operator_=operator_file,
+                    up_to_global_phase=True,
+                    block_size=3
+                )
+            )
+
+            with self.assertRaises(QuantestPyAssertionError):
+                circuit.assert_equal_to_operator(
+                    circuit=self.test_circ,
+                    operator_=operator_file,
+                    block_size=3
+                )
+
+    def test_decision_diagram(self,):
+        expected_operator = np.array(
+            [[1, 0, 1, 0],
+             [0, 1, 0, 1],
+             [0, 1, 0, -1],
+             [1, 0, -1, 0]]) / np.sqrt(2.)
+
+        self.assertIsNone(
+            circuit.assert_equal_to_operator(
+                operator_=expected_operator * 1j,
+                circuit=self.test_circ,
+                up_to_global_phase=True,
+                method="decision_diagram"
+            )
+        )
+
+        with self.assertRaises(QuantestPyAssertionError):
+            circuit.assert_equal_to_operator(
+                operator_=expected_operator,
+                circuit=self.test_circ,
+                from_right_to_left_for_qubit_ids=True,
+                method="decision_diagram"
+            )
+
+    def test_invalid_method(self,):
+        with self.assertRaises(QuantestPyError):
+            circuit.assert_equal_to_operator(
+                operator_=np.eye(4),
+                circuit=self.test_circ,
+                method="xyz"
+            )
+
+        with self.assertRaises(QuantestPyError):
+            circuit.assert_equal_to_operator(
+                operator_=np.eye(4),
+                circuit=self.test_circ,
+                method="miter"
+            )
+
+        with self.assertRaises(QuantestPyError):
+            circuit.assert_equal_to_operator(
+                operator_=np.eye(4),
+                circuit=self.test_circ,
+                matrix_norm_type="operator_norm",
+                method="decision_diagram"
+            )
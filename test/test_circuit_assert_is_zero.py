@@ -1,7 +1,12 @@
+import tempfile
 import unittest
 
+import numpy as np
+
 from quantestpy import QuantestPyCircuit, circuit
-from quantestpy.exceptions import QuantestPyAssertionError
+from quantestpy.exceptions import QuantestPyAssertionError, QuantestPyError
+from quantestpy.simulator.state_vector_circuit import \
+    cvt_quantestpy_circuit_to_state_vector_circuit
 
 
 class TestCircuitAssertIsZero(unittest.TestCase):
@@ -10,9 +15,9 @@ class TestCircuitAssertIsZero(unittest.TestCase):
     $ pwd
     {Your directory where you git-cloned quantestpy}/quantestpy
     $ python -m unittest test.test_circuit_assert_is_zero
-    ....
+    ............
     ----------------------------------------------------------------------
-    Ran 4 tests in 0.008s
+    Ran 12 tests in 0.040s
 
     OK
     """
@@ -96,3 +101,220 @@ class TestCircuitAssertIsZero(unittest.TestCase):
                 circuit=test_circuit,
                 atol=0.7
             )
+
+    def test_batch_of_initial_state_vectors(self,):
+        """An oracle which flips qubit 2 iff qubits 0 and 1 are both 1,
+        checked on all the basis inputs with qubit 2 being 0 at once.
+        """
+        test_circuit = QuantestPyCircuit(3)
+        test_circuit.add_gate(
+            {"name": "x", "target_qubit": [2], "control_qubit": [0, 1],
+             "control_value": [1, 1], "parameter": []}
+        )
+        basis_inputs = np.eye(8)[:, [0b000, 0b010, 0b100, 0b110]]
+
+        # no error without the input where qubits 0 and 1 are 1
+        self.assertIsNone(
+            circuit.assert_is_zero(
+                circuit=test_circuit,
+                qubits=[2],
+                initial_state_vector=basis_inputs[:, :3]
+            )
+        )
+
+        # error, given as a batch of rows
+        with self.assertRaises(QuantestPyAssertionError):
+            circuit.assert_is_zero(
+                circuit=test_circuit,
+                qubits=[2],
+                initial_state_vector=basis_inputs.T
+            )
+
+    def test_single_initial_state_vector(self,):
+        test_circuit = QuantestPyCircuit(2)
+        test_circuit.add_gate(
+            {"name": "x", "target_qubit": [1], "control_qubit": [0],
+             "control_value": [1], "parameter": []}
+        )
+
+        # |10> is changed into |11>
+        with self.assertRaises(QuantestPyAssertionError):
+            circuit.assert_is_zero(
+                circuit=test_circuit,
+                qubits=[1],
+                initial_state_vector=np.array([0, 0, 1, 0])
+            )
+
+    def test_default_atol_depends_on_precision(self,):
+        test_circuit = QuantestPyCircuit(2)
+        test_circuit.add_gate(
+            {"name": "rx", "target_qubit": [0], "control_qubit": [],
+             "control_value": [], "parameter": [2e-6]}
+        )
+
+        # |<1|rx|0>| = 1e-6 is within the default atol of complex64
+        self.assertIsNone(
+            circuit.assert_is_zero(
+                circuit=test_circuit,
+                precision="complex64"
+            )
+        )
+
+        with self.assertRaises(QuantestPyAssertionError):
+            circuit.assert_is_zero(
+                circuit=test_circuit,
+                precision="complex128"
+            )
+
+    def test_invalid_precision(self,):
+        test_circuit = QuantestPyCircuit(2)
+
+        with self.assertRaises(QuantestPyError):
+            circuit.assert_is_zero(
+                circuit=test_circuit,
+                precision="float64"
+            )
+
+        state_vector_circuit = \
+            cvt_quantestpy_circuit_to_state_vector_circuit(test_circuit)
+        state_vector_circuit._precision = "complex64"
+        plan = state_vector_circuit.compile()
+
+        with self.assertRaises(QuantestPyError):
+            circuit.assert_is_zero(
+                circuit=plan,
+                precision="complex128"
+            )
+
+    def test_memmap_dir(self,):
+        test_circuit = QuantestPyCircuit(4)
+        test_circuit.add_gate(
+            {"name": "h", "target_qubit": [0], "control_qubit": [],
+             "control_value": [], "parameter": []}
+        )
+        test_circuit.add_gate(
+            {"name": "x", "target_qubit": [1], "control_qubit": [0],
+             "control_value": [1], "parameter": []}
+        )
+
+        with tempfile.TemporaryDirectory() as memmap_dir:
+            self.assertIsNone(
+                circuit.assert_is_zero(
+                    circuit=test_circuit,
+                    qubits=[2, 3],
+                    memmap_dir=memmap_dir
+                )
+            )
+
+            with self.assertRaises(QuantestPyAssertionError) as cm:
+                circuit.assert_is_zero(
+                    circuit=test_circuit,
+                    memmap_dir=memmap_dir
+                )
+            self.assertEqual(
+                cm.exception.args[0],
+                "qubit(s) [0, 1] are either non-zero or entangled with "
+                "other qubits."
+            )
+
+    def test_max_bond_dimension(self,):
+        # ripple of controlled rotations along a line of 100 qubits
+        test_circuit = QuantestPyCircuit(100)
+        test_circuit.add_gate(
+            {"name": "h", "target_qubit": [0], "control_qubit": [],
+             "control_value": [], "parameter": []}
+        )
+        for qubit in range(1, 99):
+            test_circuit.add_gate(
+                {"name": "ry", "target_qubit": [qubit],
+                 "control_qubit": [qubit - 1], "control_value": [1],
+                 "parameter": [0.5]}
+            )
+
+        self.assertIsNone(
+            circuit.assert_is_zero(
+                circuit=test_circuit,
+                qubits=[99],
+                max_bond_dimension=4
+            )
+        )
+
+        with self.assertRaises(QuantestPyAssertionError) as cm:
+            circuit.assert_is_zero(
+                circuit=test_circuit,
+                qubits=[0, 1, 99],
+                max_bond_dimension=4
+            )
+        self.assertEqual(
+            cm.exception.args[0],
+            "qubit(s) [0, 1] are either non-zero or entangled with "
+            "other qubits."
+        )
+
+        self.assertEqual(
+            circuit.estimate_cost(
+                test_circuit, "assert_is_zero", max_bond_dimension=4)[
+                    "engine"],
+            "mps"
+        )
+
+    def test_max_bond_dimension_tolerance_on_norm(self,):
+        atol = 1e-3
+        for norm, is_error in [(1.5 * atol, True), (0.9 * atol, False)]:
+            # the norm of the component where qubit 0 is 1 is spread over
+            # 4 amplitudes of norm / 2 each by the hadamards
+            test_circuit = QuantestPyCircuit(3)
+            test_circuit.add_gate(
+                {"name": "ry", "target_qubit": [0], "control_qubit": [],
+                 "control_value": [], "parameter": [2 * np.arcsin(norm)]}
+            )
+            test_circuit.add_gate(
+                {"name": "h", "target_qubit": [1, 2], "control_qubit": [],
+                 "control_value": [], "parameter": []}
+            )
+
+            with self.subTest(norm=norm):
+                self.assertIsNone(
+                    circuit.assert_is_zero(
+                        circuit=test_circuit, qubits=[0], atol=atol))
+
+                if is_error:
+                    with self.assertRaises(QuantestPyAssertionError):
+                        circuit.assert_is_zero(
+                            circuit=test_circuit, qubits=[0], atol=atol,
+                            max_bond_dimension=4)
+                else:
+                    self.assertIsNone(
+                        circuit.assert_is_zero(
+                            circuit=test_circuit, qubits=[0], atol=atol,
+                            max_bond_dimension=4))
+
+    def test_max_bond_dimension_truncation_error(self,):
+        test_circuit = QuantestPyCircuit(3)
+        test_circuit.add_gate(
+            {"name": "h", "target_qubit": [0, 1], "control_qubit": [],
+             "control_value": [], "parameter": []}
+        )
+        test_circuit.add_gate(
+            {"name": "x", "target_qubit": [2], "control_qubit": [0],
+             "control_value": [1], "parameter": []}
+        )
+        test_circuit.add_gate(
+            {"name": "x", "target_qubit": [2], "control_qubit": [1],
+             "control_value": [1], "parameter": []}
+        )
+
+        # the Schmidt rank 2 between the qubits 0 and 1, 2 is truncated
+        with self.assertRaises(QuantestPyError) as cm:
+            circuit.assert_is_zero(
+                circuit=test_circuit,
+                max_bond_dimension=1
+            )
+        self.assertIn("truncation error", cm.exception.args[0])
+
+        with self.assertRaises(QuantestPyError):
+            circuit.assert_is_zero(
+                circuit=test_circuit,
+                initial_state_vector=np.eye(8)[0],
+                max_bond_dimension=1
+            )
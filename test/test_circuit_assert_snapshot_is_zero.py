@@ -0,0 +1,72 @@
+import unittest
+
+import numpy as np
+
+from quantestpy import StateVectorCircuit, circuit
+from quantestpy.exceptions import QuantestPyAssertionError, QuantestPyError
+
+
+class TestCircuitAssertSnapshotIsZero(unittest.TestCase):
+    """
+    How to execute this test:
+    $ pwd
+    {Your directory where you git-cloned quantestpy}/quantestpy
+    $ python -m unittest test.test_circuit_assert_snapshot_is_zero
+    ....
+    ----------------------------------------------------------------------
+    Ran 4 tests in 0.004s
+
+    OK
+    $
+    """
+
+    def setUp(self) -> None:
+        """Compute and uncompute the parity of qubits 0 and 1 on qubit 2"""
+        self.test_circ = StateVectorCircuit(3)
+        self.test_circ.add_gate(
+            {"name": "h", "target_qubit": [0, 1], "control_qubit": [],
+             "control_value": [], "parameter": []})
+        for _ in range(2):
+            self.test_circ.add_gate(
+                {"name": "x", "target_qubit": [2], "control_qubit": [0],
+                 "control_value": [1], "parameter": []})
+            self.test_circ.add_gate(
+                {"name": "x", "target_qubit": [2], "control_qubit": [1],
+                 "control_value": [1], "parameter": []})
+
+    def tearDown(self) -> None:
+        del self.test_circ
+
+    def test_regular(self,):
+        snapshots = self.test_circ.get_snapshots([0, 1, 5])
+
+        self.assertIsNone(
+            circuit.assert_snapshot_is_zero(snapshots, qubits=[2]))
+
+        self.assertIsNone(
+            circuit.assert_snapshot_is_zero(
+                snapshots, gate_indices=[0]))
+
+    def test_error_msg(self,):
+        snapshots = self.test_circ.get_snapshots([1, 3, 5])
+
+        with self.assertRaises(QuantestPyAssertionError) as cm:
+            circuit.assert_snapshot_is_zero(snapshots, qubits=[2])
+
+        self.assertEqual(
+            cm.exception.args[0],
+            "qubit(s) [2] are either non-zero or entangled with other "
+            "qubits in the snapshot at gate index 3."
+        )
+
+    def test_compressed_snapshots(self,):
+        self.test_circ.set_initial_state_vector(np.eye(8)[:, [0, 4]])
+        snapshots = self.test_circ.get_snapshots(
+            [5], storage_precision="complex64", threshold=1e-3)
+
+        self.assertIsNone(
+            circuit.assert_snapshot_is_zero(snapshots, qubits=[2]))
+
+    def test_invalid_snapshots(self,):
+        with self.assertRaises(QuantestPyError):
+            circuit.assert_snapshot_is_zero(self.test_circ)
@@ -0,0 +1,145 @@
+import unittest
+
+from quantestpy import QuantestPyCircuit, circuit
+from quantestpy.exceptions import QuantestPyAssertionError, QuantestPyError
+
+
+class TestCircuitDecisionDiagramEngine(unittest.TestCase):
+    """
+    How to execute this test:
+    $ pwd
+    {Your directory where you git-cloned quantestpy}/quantestpy
+    $ python -m unittest test.test_circuit_decision_diagram_engine
+    ......
+    ----------------------------------------------------------------------
+    Ran 6 tests in 0.900s
+
+    OK
+    $
+    """
+
+    def _get_adder(
+            self,
+            num_bit: int,
+            reorder: bool = False) -> QuantestPyCircuit:
+        """Ripple-carry part of an adder on 2*num_bit+2 qubits. With
+        reorder, the two commuting cx gates of each bit are swapped.
+        """
+        test_circuit = QuantestPyCircuit(2 * num_bit + 2)
+        for i in range(num_bit):
+            carry, a, b = 2 * i, 2 * i + 1, 2 * i + 2
+            cx_gates = [
+                {"name": "x", "target_qubit": [b], "control_qubit": [a],
+                 "control_value": [1], "parameter": []},
+                {"name": "x", "target_qubit": [carry], "control_qubit": [a],
+                 "control_value": [1], "parameter": []}]
+            if reorder:
+                cx_gates.reverse()
+            for gate in cx_gates:
+                test_circuit.add_gate(gate)
+            test_circuit.add_gate(
+                {"name": "x", "target_qubit": [a],
+                 "control_qubit": [carry, b], "control_value": [1, 1],
+                 "parameter": []})
+        return test_circuit
+
+    def test_assert_equal(self,):
+        # 42 qubits are far beyond the state vector engine
+        self.assertIsNone(
+            circuit.assert_equal(
+                self._get_adder(20),
+                self._get_adder(20, reorder=True),
+                method="decision_diagram"
+            )
+        )
+
+    def test_assert_equal_fails(self,):
+        test_circuit = self._get_adder(20, reorder=True)
+        test_circuit.add_gate(
+            {"name": "rz", "target_qubit": [41], "control_qubit": [],
+             "control_value": [], "parameter": [0.1]})
+
+        with self.assertRaises(QuantestPyAssertionError):
+            circuit.assert_equal(
+                self._get_adder(20),
+                test_circuit,
+                method="decision_diagram"
+            )
+
+    def test_assert_equal_up_to_global_phase(self,):
+        circuit_a = self._get_adder(20)
+        circuit_b = self._get_adder(20, reorder=True)
+        for test_circuit in [circuit_a, circuit_b]:
+            test_circuit.add_gate(
+                {"name": "rz", "target_qubit": [41], "control_qubit": [],
+                 "control_value": [], "parameter": [0.1]})
+        circuit_b.add_gate(
+            {"name": "scalar", "target_qubit": [0], "control_qubit": [],
+             "control_value": [], "parameter": [0.5]})
+
+        self.assertIsNone(
+            circuit.assert_equal(
+                circuit_a,
+                circuit_b,
+                up_to_global_phase=True,
+                method="decision_diagram"
+            )
+        )
+
+        with self.assertRaises(QuantestPyAssertionError):
+            circuit.assert_equal(
+                circuit_a,
+                circuit_b,
+                method="decision_diagram"
+            )
+
+    def test_different_num_qubit(self,):
+        with self.assertRaises(QuantestPyError):
+            circuit.assert_equal(
+                self._get_adder(2),
+                self._get_adder(3),
+                method="decision_diagram"
+            )
+
+    def test_miter(self,):
+        self.assertIsNone(
+            circuit.assert_equal(
+                self._get_adder(20),
+                self._get_adder(20, reorder=True),
+                method="miter"
+            )
+        )
+
+        test_circuit = self._get_adder(20, reorder=True)
+        test_circuit.add_gate(
+            {"name": "x", "target_qubit": [41], "control_qubit": [0],
+             "control_value": [1], "parameter": []})
+        with self.assertRaises(QuantestPyAssertionError):
+            circuit.assert_equal(
+                self._get_adder(20),
+                test_circuit,
+                method="miter"
+            )
+
+    def test_miter_up_to_global_phase(self,):
+        circuit_a = self._get_adder(20)
+        circuit_b = self._get_adder(20, reorder=True)
+        circuit_b.add_gate(
+            {"name": "scalar", "target_qubit": [0], "control_qubit": [],
+             "control_value": [], "parameter": [0.5]})
+
+        self.assertIsNone(
+            circuit.assert_equal(
+                circuit_a,
+                circuit_b,
+                up_to_global_phase=True,
+                method="miter"
+            )
+        )
+
+        with self.assertRaises(QuantestPyAssertionError):
+            circuit.assert_equal(
+                circuit_a,
+                circuit_b,
+                method="miter"
+            )
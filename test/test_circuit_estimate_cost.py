@@ -0,0 +1,162 @@
+import tracemalloc
+import unittest
+
+import numpy as np
+
+from quantestpy import QuantestPyCircuit, StateVectorCircuit, circuit
+from quantestpy.exceptions import QuantestPyAssertionError, QuantestPyError
+
+
+class TestCircuitEstimateCost(unittest.TestCase):
+    """
+    How to execute this test:
+    $ pwd
+    {Your directory where you git-cloned quantestpy}/quantestpy
+    $ python -m unittest test.test_circuit_estimate_cost
+    .......
+    ----------------------------------------------------------------------
+    Ran 7 tests in 0.030s
+
+    OK
+    $
+    """
+
+    def setUp(self) -> None:
+        # layers of h, t and a ring of cx gates, where the t gates keep the
+        # circuits from the stabilizer engine
+        self.circuits = {}
+        for num_qubit in [4, 6, 8, 20]:
+            test_circuit = QuantestPyCircuit(num_qubit)
+            for qubit in range(num_qubit):
+                test_circuit.add_gate(
+                    {"name": "h", "target_qubit": [qubit],
+                     "control_qubit": [], "control_value": [],
+                     "parameter": []})
+                test_circuit.add_gate(
+                    {"name": "t", "target_qubit": [qubit],
+                     "control_qubit": [], "control_value": [],
+                     "parameter": []})
+                test_circuit.add_gate(
+                    {"name": "x", "target_qubit": [(qubit + 1) % num_qubit],
+                     "control_qubit": [qubit], "control_value": [1],
+                     "parameter": []})
+            self.circuits[num_qubit] = test_circuit
+
+    def test_plan_estimate_cost(self,):
+        circ = StateVectorCircuit(3)
+        circ.add_gate({"name": "h", "target_qubit": [0, 1],
+                       "control_qubit": [], "control_value": [],
+                       "parameter": []})
+        circ.add_gate({"name": "x", "target_qubit": [2],
+                       "control_qubit": [0], "control_value": [1],
+                       "parameter": []})
+        circ._max_block_fusion_qubits = 0
+        plan = circ.compile()
+
+        cost = plan.estimate_cost()
+        # 2 targets of the hadamard of 16 flops for each of 8 amplitudes
+        self.assertEqual(cost["flops"], 2 * 16 * 8)
+        # the state, the copy of the slice of the hadamard, the buffers of
+        # the ufuncs and the matrices held by the plan
+        self.assertEqual(
+            cost["peak_bytes"], 2 * 8 * 16 + 4 * 8 * 16 + plan.nbytes)
+        self.assertEqual(plan.estimate_cost(8)["flops"], 8 * cost["flops"])
+
+    def test_estimate_bounds_measured_peak(self,):
+        test_circuit = self.circuits[8]
+        for gate in [
+                {"name": "ry", "target_qubit": [0], "control_qubit": [1],
+                 "control_value": [1], "parameter": [0.3]},
+                {"name": "iswap", "target_qubit": [1, 2],
+                 "control_qubit": [], "control_value": [],
+                 "parameter": []},
+                {"name": "p", "target_qubit": [3], "control_qubit": [0, 1],
+                 "control_value": [1, 1], "parameter": [0.2]}]:
+            test_circuit.add_gate(gate)
+
+        for assertion, kwargs, assert_function in [
+                ("assert_is_zero", {}, lambda: circuit.assert_is_zero(
+                    test_circuit)),
+                ("assert_equal", {"circuit_b": test_circuit},
+                 lambda: circuit.assert_equal(test_circuit, test_circuit)),
+                ("assert_ancilla_is_zero", {"ancilla_qubits": [0, 1]},
+                 lambda: circuit.assert_ancilla_is_zero(
+                     test_circuit, ancilla_qubits=[0, 1]))]:
+            with self.subTest(assertion=assertion):
+                peak_bytes = circuit.estimate_cost(
+                    test_circuit, assertion, **kwargs)["peak_bytes"]
+
+                # the first run fills the caches of the gate matrices
+                for is_measured in [False, True]:
+                    if is_measured:
+                        tracemalloc.start()
+                    try:
+                        assert_function()
+                    except QuantestPyAssertionError:
+                        pass
+                measured_peak_bytes = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+                self.assertLessEqual(measured_peak_bytes, peak_bytes)
+                self.assertLessEqual(peak_bytes, 3 * measured_peak_bytes)
+
+    def test_engines(self,):
+        test_circuit = self.circuits[20]
+
+        cost = circuit.estimate_cost(
+            test_circuit, "assert_equal", circuit_b=test_circuit)
+        self.assertEqual(cost["engine"], "state_vector")
+        self.assertGreater(cost["peak_bytes"], 2**20 * 2**20 * 16)
+
+        cost = circuit.estimate_cost(
+            test_circuit, "assert_equal", circuit_b=test_circuit,
+            block_size=4)
+        self.assertEqual(cost["engine"], "block_wise")
+        self.assertLess(cost["peak_bytes"], 2**20 * 16 * 4 * 10)
+        self.assertEqual(cost["disk_bytes"], 2 * 2**20 * 2**20 * 16)
+
+        cost = circuit.estimate_cost(
+            test_circuit, "assert_is_zero", memmap_dir=".")
+        self.assertEqual(cost["engine"], "memmap")
+
+    def test_assert_equal_falls_back_to_block_wise(self,):
+        test_circuit = self.circuits[6]
+        peak_bytes = circuit.estimate_cost(
+            test_circuit, "assert_equal", circuit_b=test_circuit)[
+                "peak_bytes"]
+
+        self.assertIsNone(
+            circuit.assert_equal(
+                test_circuit, test_circuit, max_memory=peak_bytes // 4))
+
+        with self.assertRaises(QuantestPyAssertionError):
+            circuit.assert_equal(
+                test_circuit, QuantestPyCircuit(6),
+                max_memory=peak_bytes // 4)
+
+    def test_assert_is_zero_falls_back_to_memmap(self,):
+        test_circuit = self.circuits[8]
+
+        with self.assertRaises(QuantestPyAssertionError) as cm:
+            circuit.assert_is_zero(test_circuit, max_memory=3000)
+        self.assertEqual(
+            cm.exception.args[0],
+            "qubit(s) [0, 1, 2, 3, 4, 5, 6, 7] are either non-zero or "
+            "entangled with other qubits."
+        )
+
+    def test_max_memory_too_small(self,):
+        test_circuit = self.circuits[4]
+
+        with self.assertRaises(QuantestPyError) as cm:
+            circuit.assert_equal_to_operator(
+                test_circuit, np.eye(16), max_memory=10)
+        self.assertIn("exceeds max_memory of 10 bytes", cm.exception.args[0])
+
+        with self.assertRaises(QuantestPyError):
+            circuit.assert_equal(
+                test_circuit, test_circuit, max_memory=-1)
+
+    def test_invalid_assertion(self,):
+        with self.assertRaises(QuantestPyError):
+            circuit.estimate_cost(QuantestPyCircuit(2), "assert_unitary")
@@ -0,0 +1,149 @@
+import unittest
+
+from quantestpy import QuantestPyCircuit, circuit
+from quantestpy.exceptions import QuantestPyAssertionError, QuantestPyError
+
+
+class TestCircuitRandomStatesEngine(unittest.TestCase):
+    """
+    How to execute this test:
+    $ pwd
+    {Your directory where you git-cloned quantestpy}/quantestpy
+    $ python -m unittest test.test_circuit_random_states_engine
+    .....
+    ----------------------------------------------------------------------
+    Ran 5 tests in 0.100s
+
+    OK
+    $
+    """
+
+    def setUp(self) -> None:
+        # layers of h, controlled rz on disjoint pairs and t gates, whose
+        # commuting controlled rz gates are added in reverse to circuit_b
+        self.circuits = {}
+        for num_qubit in [10, 14]:
+            gates = [
+                {"name": "rz", "target_qubit": [qubit + 1],
+                 "control_qubit": [qubit], "control_value": [1],
+                 "parameter": [0.3]}
+                for qubit in range(0, num_qubit - 1, 2)]
+            circuit_a = QuantestPyCircuit(num_qubit)
+            circuit_b = QuantestPyCircuit(num_qubit)
+            for test_circuit, layer in [(circuit_a, gates),
+                                        (circuit_b, gates[::-1])]:
+                test_circuit.add_gate(
+                    {"name": "h", "target_qubit": list(range(num_qubit)),
+                     "control_qubit": [], "control_value": [],
+                     "parameter": []})
+                for gate in layer:
+                    test_circuit.add_gate(gate)
+                test_circuit.add_gate(
+                    {"name": "t", "target_qubit": list(range(num_qubit)),
+                     "control_qubit": [], "control_value": [],
+                     "parameter": []})
+            self.circuits[num_qubit] = (circuit_a, circuit_b)
+
+    def test_assert_equal(self,):
+        circuit_a, circuit_b = self.circuits[10]
+
+        self.assertIsNone(
+            circuit.assert_equal(
+                circuit_a,
+                circuit_b,
+                method="random_states",
+                seed=0
+            )
+        )
+
+    def test_assert_equal_fails(self,):
+        circuit_a, circuit_b = self.circuits[10]
+        circuit_b.add_gate(
+            {"name": "rz", "target_qubit": [9], "control_qubit": [],
+             "control_value": [], "parameter": [1e-4]})
+
+        for block_size in [None, 3]:
+            with self.assertRaises(QuantestPyAssertionError):
+                circuit.assert_equal(
+                    circuit_a,
+                    circuit_b,
+                    method="random_states",
+                    num_states=4,
+                    seed=0,
+                    block_size=block_size
+                )
+
+    def test_assert_equal_up_to_global_phase(self,):
+        circuit_a, circuit_b = self.circuits[10]
+        circuit_b.add_gate(
+            {"name": "scalar", "target_qubit": [0], "control_qubit": [],
+             "control_value": [], "parameter": [0.5]})
+
+        self.assertIsNone(
+            circuit.assert_equal(
+                circuit_a,
+                circuit_b,
+                up_to_global_phase=True,
+                method="random_states"
+            )
+        )
+
+        with self.assertRaises(QuantestPyAssertionError):
+            circuit.assert_equal(
+                circuit_a,
+                circuit_b,
+                method="random_states"
+            )
+
+    def test_estimate_cost(self,):
+        # 8 random states of 25 qubits instead of the operators
+        test_circuit = QuantestPyCircuit(25)
+        test_circuit.add_gate(
+            {"name": "ry", "target_qubit": list(range(25)),
+             "control_qubit": [], "control_value": [], "parameter": [0.3]})
+        cost = circuit.estimate_cost(
+            test_circuit, "assert_equal", circuit_b=test_circuit,
+            method="random_states")
+        self.assertEqual(cost["engine"], "random_states")
+        self.assertLess(cost["peak_bytes"], 2**36)
+
+        circuit_a, circuit_b = self.circuits[14]
+        max_memory = 2**22
+        cost = circuit.estimate_cost(
+            circuit_a, "assert_equal", circuit_b=circuit_b,
+            method="random_states")
+        self.assertGreater(cost["peak_bytes"], max_memory)
+        self.assertIsNone(
+            circuit.assert_equal(
+                circuit_a,
+                circuit_b,
+                method="random_states",
+                max_memory=max_memory
+            )
+        )
+
+    def test_invalid_argument(self,):
+        test_circuit = QuantestPyCircuit(2)
+        test_circuit.add_gate(
+            {"name": "t", "target_qubit": [0, 1], "control_qubit": [],
+             "control_value": [], "parameter": []})
+
+        with self.assertRaises(QuantestPyError):
+            circuit.assert_equal(
+                test_circuit,
+                test_circuit,
+                method="random_states",
+                num_states=0
+            )
+
+        with self.assertRaises(QuantestPyError):
+            circuit.assert_equal(
+                test_circuit,
+                test_circuit,
+                matrix_norm_type="operator_norm_2",
+                method="random_states"
+            )
+
+        with self.assertRaises(QuantestPyError):
+            circuit.estimate_cost(
+                test_circuit, "assert_is_zero", method="random_states")
@@ -0,0 +1,142 @@
+import unittest
+
+from quantestpy import QuantestPyCircuit, circuit
+from quantestpy.exceptions import QuantestPyAssertionError
+
+
+class TestCircuitStabilizerEngine(unittest.TestCase):
+    """
+    How to execute this test:
+    $ pwd
+    {Your directory where you git-cloned quantestpy}/quantestpy
+    $ python -m unittest test.test_circuit_stabilizer_engine
+    .....
+    ----------------------------------------------------------------------
+    Ran 5 tests in 0.060s
+
+    OK
+    $
+    """
+
+    def _get_encoder(self, num_data_qubit: int) -> QuantestPyCircuit:
+        """Encodes each data qubit into the 3-qubit repetition code, whose
+        other qubits are num_data_qubit and 2*num_data_qubit apart.
+        """
+        test_circuit = QuantestPyCircuit(3 * num_data_qubit)
+        for qubit in range(num_data_qubit):
+            for code_qubit in [qubit + num_data_qubit,
+                               qubit + 2 * num_data_qubit]:
+                test_circuit.add_gate(
+                    {"name": "x", "target_qubit": [code_qubit],
+                     "control_qubit": [qubit], "control_value": [1],
+                     "parameter": []})
+        return test_circuit
+
+    def _get_encoder_and_decoder(
+            self,
+            num_data_qubit: int) -> QuantestPyCircuit:
+        test_circuit = self._get_encoder(num_data_qubit)
+        for gate in list(test_circuit.gates):
+            test_circuit.add_gate(gate)
+        return test_circuit
+
+    def test_assert_is_zero(self,):
+        test_circuit = self._get_encoder(100)
+        test_circuit.add_gate(
+            {"name": "h", "target_qubit": [0, 1], "control_qubit": [],
+             "control_value": [], "parameter": []})
+
+        self.assertIsNone(
+            circuit.assert_is_zero(test_circuit, qubits=list(range(2, 300))))
+
+        with self.assertRaises(QuantestPyAssertionError) as cm:
+            circuit.assert_is_zero(test_circuit)
+        self.assertEqual(
+            cm.exception.args[0],
+            "qubit(s) [0, 1] are either non-zero or entangled with other "
+            "qubits."
+        )
+
+    def test_assert_ancilla_is_zero(self,):
+        test_circuit = self._get_encoder_and_decoder(100)
+        self.assertIsNone(
+            circuit.assert_ancilla_is_zero(
+                test_circuit, list(range(100, 300))))
+
+        # the code qubits of the data qubit 3 are not uncomputed
+        test_circuit = self._get_encoder(100)
+        for gate in test_circuit.gates[8:]:
+            test_circuit.add_gate(gate)
+
+        with self.assertRaises(QuantestPyAssertionError) as cm:
+            circuit.assert_ancilla_is_zero(
+                test_circuit, list(range(100, 300)))
+        self.assertEqual(
+            cm.exception.args[0],
+            "qubit(s) [100, 101, 102, 103, 200, 201, 202, 203] are either "
+            "non-zero or entangled with other qubits."
+        )
+
+    def test_assert_equal_up_to_global_phase(self,):
+        test_circuit_a = self._get_encoder_and_decoder(100)
+        test_circuit_b = QuantestPyCircuit(300)
+        test_circuit_b.add_gate(
+            {"name": "y", "target_qubit": [7], "control_qubit": [],
+             "control_value": [], "parameter": []})
+        test_circuit_b.add_gate(
+            {"name": "z", "target_qubit": [7], "control_qubit": [],
+             "control_value": [], "parameter": []})
+        test_circuit_b.add_gate(
+            {"name": "x", "target_qubit": [7], "control_qubit": [],
+             "control_value": [], "parameter": []})
+
+        # Y = iXZ, so XZY is the identity up to global phase
+        self.assertIsNone(
+            circuit.assert_equal(
+                test_circuit_a, test_circuit_b, up_to_global_phase=True))
+
+        test_circuit_b.add_gate(
+            {"name": "z", "target_qubit": [250], "control_qubit": [9],
+             "control_value": [0], "parameter": []})
+        with self.assertRaises(QuantestPyAssertionError) as cm:
+            circuit.assert_equal(
+                test_circuit_a, test_circuit_b, up_to_global_phase=True)
+        self.assertEqual(
+            cm.exception.args[0],
+            "circuit_a and circuit_b are not equal up to global phase: they "
+            "transform X or Z of qubit(s) [9, 250] differently."
+        )
+
+    def test_estimate_cost(self,):
+        test_circuit = self._get_encoder_and_decoder(100)
+
+        for assertion, kwargs in [
+                ("assert_is_zero", {}),
+                ("assert_ancilla_is_zero",
+                 {"ancilla_qubits": list(range(100, 300))}),
+                ("assert_equal",
+                 {"circuit_b": test_circuit, "up_to_global_phase": True})]:
+            cost = circuit.estimate_cost(test_circuit, assertion, **kwargs)
+            self.assertEqual(cost["engine"], "stabilizer")
+            self.assertLess(cost["peak_bytes"], 2**20)
+            self.assertEqual(cost["disk_bytes"], 0)
+
+    def test_state_vector_engine_with_atol(self,):
+        """The tolerance is used by the state vector engine."""
+        test_circuit = QuantestPyCircuit(2)
+        test_circuit.add_gate(
+            {"name": "h", "target_qubit": [0], "control_qubit": [],
+             "control_value": [], "parameter": []})
+        test_circuit.add_gate(
+            {"name": "x", "target_qubit": [1], "control_qubit": [0],
+             "control_value": [1], "parameter": []})
+
+        with self.assertRaises(QuantestPyAssertionError):
+            circuit.assert_is_zero(test_circuit)
+
+        self.assertIsNone(circuit.assert_is_zero(test_circuit, atol=0.8))
+        self.assertEqual(
+            circuit.estimate_cost(
+                test_circuit, "assert_equal", circuit_b=test_circuit)[
+                    "engine"],
+            "state_vector")
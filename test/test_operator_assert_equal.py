@@ -3,7 +3,7 @@ import unittest
 
 import numpy as np
 
-from quantestpy.exceptions import QuantestPyAssertionError
+from quantestpy.exceptions import QuantestPyAssertionError, QuantestPyError
 from quantestpy.operator import assert_equal
 
 
@@ -13,9 +13,9 @@ class TestOperatorAssertEqual(unittest.TestCase):
     $ pwd
     {Your directory where you git-cloned quantestpy}/quantestpy
     $ python -m unittest test.test_operator_assert_equal
-    ...
+    .......
     ----------------------------------------------------------------------
-    Ran 3 tests in 0.012s
+    Ran 7 tests in 0.012s
 
     OK
     $
@@ -124,3 +124,90 @@ class TestOperatorAssertEqual(unittest.TestCase):
                     traceback.format_exception_only(type(e), e)[0].rstrip("\n")
 
                 self.assertEqual(expected_error_msg, actual_error_msg)
+
+    def test_stacked_operators_up_to_global_phase(self,):
+        op_a = np.array([[1., 1.], [1., -1.]]) / np.sqrt(2.)
+        stacked_op_a = np.stack([op_a * np.exp(1j*phase)
+                                 for phase in np.linspace(0., 3., 4)])
+        stacked_op_b = np.stack([op_a] * 4)
+
+        # each operator has its own global phase
+        self.assertIsNone(
+            assert_equal(
+                stacked_op_a,
+                stacked_op_b,
+                up_to_global_phase=True
+            )
+        )
+        self.assertIsNone(
+            assert_equal(
+                stacked_op_a,
+                stacked_op_b,
+                up_to_global_phase=True,
+                matrix_norm_type="operator_norm_2"
+            )
+        )
+
+    def test_stacked_operators_error_msg(self,):
+        op_a = np.array([[1., 1.], [1., -1.]]) / np.sqrt(2.)
+        stacked_op_a = np.stack([op_a] * 4)
+        stacked_op_b = stacked_op_a.copy()
+        stacked_op_b[1] = np.array([[1., -1.], [1., 1.]]) / np.sqrt(2.)
+        stacked_op_b[3] = np.eye(2)
+
+        try:
+            self.assertIsNotNone(
+                assert_equal(
+                    stacked_op_a,
+                    stacked_op_b,
+                    matrix_norm_type="max_norm"
+                )
+            )
+
+        except QuantestPyAssertionError as e:
+            expected_error_msg = \
+                "quantestpy.exceptions.QuantestPyAssertionError: " \
+                + "matrix norm ||A-B|| is larger than (atol + rtol*||B||) " \
+                + "for the operator(s) at [1, 3].\n"
+
+            actual_error_msg = \
+                traceback.format_exception_only(type(e), e)[0]
+
+            self.assertEqual(expected_error_msg, actual_error_msg)
+
+    def test_block_wise(self,):
+        op_a = np.kron(np.array([[1., 1.], [1., -1.]]) / np.sqrt(2.),
+                       np.diag([1., 1j, -1., -1j]))
+        op_b = op_a * np.exp(0.3j)
+
+        for block_size in [1, 3, 8]:
+            for matrix_norm_type in [None, "operator_norm_1",
+                                     "operator_norm_inf", "Frobenius_norm",
+                                     "max_norm"]:
+                self.assertIsNone(
+                    assert_equal(
+                        op_a,
+                        op_b,
+                        up_to_global_phase=True,
+                        matrix_norm_type=matrix_norm_type,
+                        block_size=block_size
+                    )
+                )
+
+                with self.assertRaises(QuantestPyAssertionError):
+                    assert_equal(
+                        op_a,
+                        op_b,
+                        matrix_norm_type=matrix_norm_type,
+                        block_size=block_size
+                    )
+
+    def test_block_wise_invalid_args(self,):
+        op_a = np.eye(4)
+
+        with self.assertRaises(QuantestPyError):
+            assert_equal(op_a, op_a, block_size=0)
+
+        with self.assertRaises(QuantestPyError):
+            assert_equal(op_a, op_a, matrix_norm_type="operator_norm_2",
+                         block_size=2)
@@ -13,9 +13,9 @@ class TestStateVectorAssertEqual(unittest.TestCase):
     $ pwd
     {Your directory where you git-cloned quantestpy}/quantestpy
     $ python -m unittest test.test_state_vector_assert_equal
-    .....
+    .......
     ----------------------------------------------------------------------
-    Ran 5 tests in 0.009s
+    Ran 7 tests in 0.009s
 
     OK
     $
@@ -107,3 +107,42 @@ class TestStateVectorAssertEqual(unittest.TestCase):
                 traceback.format_exception_only(type(e), e)[0]
 
             self.assertEqual(expected_error_msg, actual_error_msg)
+
+    def test_stacked_state_vectors_up_to_global_phase(self,):
+        a = np.array([1., 0., 0., 1.]) / np.sqrt(2.)
+        stacked_a = np.stack([a * np.exp(1j*phase)
+                              for phase in np.linspace(0., 3., 5)])
+        stacked_b = np.stack([a] * 5)
+
+        # each state vector has its own global phase
+        self.assertIsNone(
+            state_vector.assert_equal(
+                stacked_a, stacked_b, up_to_global_phase=True)
+        )
+
+        with self.assertRaises(QuantestPyAssertionError):
+            state_vector.assert_equal(stacked_a, stacked_b)
+
+    def test_column_batch_up_to_global_phase(self,):
+        batch_b = np.array([[1., 1., 0.],
+                            [0., 1., 1.],
+                            [0., 1j, 1.],
+                            [1., 1., 0.]]) / np.array([[np.sqrt(2.), 2.,
+                                                        np.sqrt(2.)]])
+        # each column has its own global phase
+        batch_a = batch_b * np.exp(1j*np.array([[0.3, -1.2, 2.5]]))
+
+        self.assertIsNone(
+            state_vector.assert_equal(
+                batch_a, batch_b, up_to_global_phase=True, vector_axis=0)
+        )
+
+        # the rows are not state vectors related by global phases
+        with self.assertRaises(QuantestPyAssertionError):
+            state_vector.assert_equal(
+                batch_a, batch_b, up_to_global_phase=True)
+
+        with self.assertRaises(QuantestPyAssertionError):
+            state_vector.assert_equal(
+                batch_a[:, [1, 0, 2]], batch_b, up_to_global_phase=True,
+                vector_axis=0)